@@ -1,4 +1,6 @@
 import streamlit as st
+from src.utils.styles import HOME_PAGE_CSS
+from src.utils.style_injection import inject_styles
 
 st.set_page_config(
     page_title="Travel Gene",
@@ -7,44 +9,7 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# CSS 스타일링 추가
-st.markdown("""
-<style>
-    .stButton > button {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border: none;
-        border-radius: 15px;
-        padding: 30px;
-        width: 100%;
-        height: auto;
-        min-height: 200px;
-        font-size: 16px;
-        font-weight: 600;
-        cursor: pointer;
-        transition: transform 0.3s ease, box-shadow 0.3s ease;
-        text-align: left;
-        white-space: pre-line;
-    }
-    .stButton > button:hover {
-        transform: translateY(-5px);
-        box-shadow: 0 10px 25px rgba(0,0,0,0.2);
-        background: linear-gradient(135deg, #5a6fd8 0%, #6a4c93 100%);
-    }
-    .stButton > button:focus {
-        outline: none;
-        box-shadow: 0 10px 25px rgba(0,0,0,0.2);
-    }
-    .stButton > button:active {
-        transform: translateY(-2px);
-    }
-    /* 버튼 내부 텍스트 스타일링 */
-    .stButton > button p {
-        margin: 0;
-        color: white;
-    }
-</style>
-""", unsafe_allow_html=True)
+inject_styles(HOME_PAGE_CSS)
 
 st.title("🗺️ Travel Gene")
 st.subheader("AI와 함께하는 똑똑한 여행 계획")
@@ -0,0 +1,154 @@
+"""
+단일 순회 파서 도입 전의 일정 파싱 구현 (plan_parser_bench의 동등성 검사 기준으로 고정된 사본)
+"""
+
+
+def parse_itinerary_from_content(content):
+    """단일 순회 파서 도입 전의 일정 파싱 (수정하지 말 것)"""
+    itinerary = []
+    
+    itinerary_section = ""
+    lines = content.split('\n')
+    
+    in_itinerary_section = False
+    
+    for line in lines:
+        line = line.strip()
+        
+        if '일자별' in line and '일정' in line:
+            in_itinerary_section = True
+            continue
+        
+        elif in_itinerary_section and (
+            line.startswith('3.') or 
+            line.startswith('4.') or 
+            '준비사항' in line or 
+            '대체 옵션' in line or
+            '주의사항' in line
+        ):
+            break
+        
+        elif in_itinerary_section:
+            itinerary_section += line + '\n'
+    
+    if not itinerary_section.strip():
+        return []
+    
+    lines = itinerary_section.split('\n')
+    current_day = None
+    current_activities = []
+    
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        
+        if line.startswith('#'):
+            continue
+            
+        if ('월' in line and '일' in line and ('(' in line or '년' in line)):
+            if current_day and current_activities:
+                itinerary.append({
+                    'date': current_day,
+                    'activities': current_activities
+                })
+            
+            current_day = line.replace('-', '').replace('#', '').strip()
+            current_activities = []
+        
+        elif ':' in line and current_day:
+            try:
+                time = ''
+                title = ''
+                
+                if line.startswith('-') and ': ' in line:
+                    line_clean = line.lstrip('-').strip()
+                    if ':' in line_clean:
+                        parts = line_clean.split(': ', 1)
+                        if len(parts) == 2:
+                            potential_time = parts[0].strip()
+                            potential_title = parts[1].strip()
+                            if any(char.isdigit() for char in potential_time) or potential_time in ['오전', '오후', '아침', '점심', '저녁']:
+                                time = potential_time
+                                title = potential_title
+                            else:
+                                time = ''
+                                title = line_clean
+                        else:
+                            time = ''
+                            title = line_clean
+                    else:
+                        time = ''
+                        title = line_clean
+                elif line.startswith('-') and ' - ' in line:
+                    line_clean = line.lstrip('-').strip()
+                    if ' - ' in line_clean:
+                        time_part, activity_part = line_clean.split(' - ', 1)
+                        time = time_part.strip()
+                        title = activity_part.strip()
+                    else:
+                        time = ''
+                        title = line_clean
+                elif ' - ' in line and ':' in line:
+                    time_part, activity_part = line.split(' - ', 1)
+                    time = time_part.strip()
+                    title = activity_part.strip()
+                elif ':' in line and not ' - ' in line and not line.startswith('-'):
+                    time_part, activity_part = line.split(':', 1)
+                    time = time_part.strip()
+                    title = activity_part.strip()
+                else:
+                    time = ''
+                    title = line.strip()
+                
+                activity = {
+                    'time': time,
+                    'title': title,
+                    'location': '',
+                    'description': ''
+                }
+                
+                current_activities.append(activity)
+                
+            except:
+                if current_day:
+                    activity = {
+                        'time': '',
+                        'title': line,
+                        'location': '',
+                        'description': ''
+                    }
+                    current_activities.append(activity)
+        
+        elif (line.startswith('○') or line.startswith('o') or line.startswith('•') or 
+              line.startswith('-') and not ('월' in line and '일' in line)) and current_day:
+            detail = line.replace('○', '').replace('o', '').replace('•', '').replace('-', '').strip()
+            if detail:
+                if ':' in detail and ' - ' in detail:
+                    try:
+                        time_part, activity_part = detail.split(' - ', 1)
+                        activity = {
+                            'time': time_part.strip(),
+                            'title': activity_part.strip(),
+                            'location': '',
+                            'description': ''
+                        }
+                        current_activities.append(activity)
+                    except:
+                        pass
+                else:
+                    activity = {
+                        'time': '',
+                        'title': detail,
+                        'location': '',
+                        'description': ''
+                    }
+                    current_activities.append(activity)
+    
+    if current_day and current_activities:
+        itinerary.append({
+            'date': current_day,
+            'activities': current_activities
+        })
+    
+    return itinerary
@@ -0,0 +1,46 @@
+"""
+계획 카드 한 번 렌더링에 보내는 바이트/요소 수 측정
+"""
+import sys
+from src.share.plan_card import plan_card_markdown
+from src.utils.styles import PLAN_CARD_CSS
+from src.utils.style_injection import minify_css
+
+
+def generate_sample_plan(days, activities_per_day):
+    """측정용 JSON 계획 생성"""
+    activity = {
+        "time": "09:00", "title": "성산일출봉", "location": "성산일출봉", "address": "제주 서귀포시 성산읍",
+        "description": "일출을 보며 오름 산책", "category": "관광"
+    }
+    return {
+        "travel_overview": {"destination": "제주", "start_date": "2025-07-01", "end_date": "2025-07-03", "duration_days": days, "summary": "바다와 오름"},
+        "itinerary": [
+            {"date": "2025-07-01", "day_of_week": "화", "activities": [dict(activity) for _ in range(activities_per_day)]}
+            for _ in range(days)
+        ],
+        "preparation": {"essential_items": ["선크림", "모자"]}
+    }
+
+
+def measure_card_payload(sizes, cards=1):
+    """(일수, 하루 활동 수) 별로 카드 cards개를 그리는 한 번의 실행에서 st.markdown으로 보내는 바이트/요소 수"""
+    stylesheet = minify_css(PLAN_CARD_CSS).encode("utf-8")
+    results = []
+    for days, activities_per_day in sizes:
+        card = plan_card_markdown(generate_sample_plan(days, activities_per_day)).encode("utf-8")
+        results.append({
+            "days": days,
+            "activities_per_day": activities_per_day,
+            "cards": cards,
+            "bytes": len(stylesheet) + len(card) * cards,
+            "elements": 1 + cards
+        })
+    return results
+
+
+if __name__ == "__main__":
+    # 사용법 (apps/client에서): python -m bench.plan_card_bench [카드 수]
+    cards = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    for result in measure_card_payload([(3, 5), (5, 6), (14, 8)], cards):
+        print(f"{result['days']}일 x {result['activities_per_day']}개, 카드 {result['cards']}개: {result['bytes']}바이트 / 요소 {result['elements']}개")
@@ -0,0 +1,90 @@
+"""
+일정 파서 벤치마크와 이전 파서와의 동등성 검사
+"""
+import random
+import sys
+import time
+from src.share.plan_parser import parse_itinerary_from_content
+from .legacy_itinerary_parser import parse_itinerary_from_content as legacy_parse
+
+
+def generate_sample_content(days, activities_per_day):
+    """벤치마크용 LLM 계획 본문 생성 (일자별 세부 일정 섹션 포함)"""
+    lines = ['1. 여행 개요', '부산 맛집 여행', '', '2. 일자별 세부 일정']
+    for day in range(days):
+        lines.append(f"### 2025년 {day // 28 % 12 + 1}월 {day % 28 + 1}일 (토)")
+        for index in range(activities_per_day):
+            hour = 8 + index % 14
+            lines.append(f"- {hour:02d}:00: 해운대 산책 {index}")
+            lines.append(f"  ○ 광안리 카페 {index}")
+            lines.append(f"{hour:02d}:30 - 돼지국밥 점심 {index}")
+    lines.extend(['', '3. 준비사항', '- 우산'])
+    return '\n'.join(lines)
+
+
+def benchmark_itinerary_parser(sizes, repeat=20):
+    """(일수, 하루 활동 수) 별 캐시를 거치지 않은 일정 파싱 평균 시간(ms)"""
+    parse = parse_itinerary_from_content.__wrapped__
+    results = []
+    for days, activities_per_day in sizes:
+        content = generate_sample_content(days, activities_per_day)
+        started = time.perf_counter()
+        for _ in range(repeat):
+            parse(content)
+        results.append({
+            "days": days,
+            "activities_per_day": activities_per_day,
+            "content_length": len(content),
+            "avg_ms": round((time.perf_counter() - started) / repeat * 1000, 3)
+        })
+    return results
+
+
+FUZZ_FRAGMENTS = ('일자별', '일정', '월', '일', '(', ')', '년', ':', ': ', ' - ', '-', '#', '○', 'o', '•', '3.', '4.',
+                  '준비사항', '대체 옵션', '주의사항', '오전', '점심', '09', '10:30', ' ', 'a', '해운대', 'Food', '  ', '²', '\t')
+FUZZ_TEMPLATES = ('## 2. 일자별 세부 일정', '{m}월 {d}일 ({w})', '### {y}년 {m}월 {d}일', '- {h}:00: {t}', '{h}:30 - {t}',
+                  '- 오전: {t}', '- {t}', '○ {t}', '• {t}', '{h}:00 {t}', '', '- {h}:00 - {t}', 'o{t}', '3. 준비사항',
+                  '- 우산', '일자별 일정 다시')
+FUZZ_TITLES = ('해운대 산책', '점심: 돼지국밥', '숙소 체크인', 'o몽 카페', '이동 - 버스')
+
+
+def generate_fuzz_content(rng):
+    """동등성 검사용 계획 본문 생성 (템플릿 줄과 구분자 조각을 무작위로 섞은 줄)"""
+    lines = []
+    for _ in range(rng.randint(0, 40)):
+        if rng.random() < 0.7:
+            lines.append(rng.choice(FUZZ_TEMPLATES).format(
+                m=rng.randint(1, 12), d=rng.randint(1, 31), w=rng.choice('월화수목금토일'), y=2025,
+                h=rng.randint(6, 22), t=rng.choice(FUZZ_TITLES)
+            ))
+        else:
+            lines.append(''.join(rng.choice(FUZZ_FRAGMENTS) for _ in range(rng.randint(0, 7))))
+    if rng.random() < 0.8:
+        lines.insert(rng.randint(0, len(lines)), '2. 일자별 세부 일정')
+    return '\n'.join(lines)
+
+
+def check_itinerary_parser_equivalence(count=30000, seed=46):
+    """생성한 계획 본문과 벤치마크 본문에서 이전 파서와 결과가 같은지 검사 (다르면 AssertionError)"""
+    parse = parse_itinerary_from_content.__wrapped__
+    rng = random.Random(seed)
+    samples = [generate_fuzz_content(rng) for _ in range(count)]
+    samples.extend(generate_sample_content(days, 8) for days in (7, 60, 365))
+    for content in samples:
+        expected, actual = legacy_parse(content), parse(content)
+        assert expected == actual, f"일정 파싱 결과 불일치:\n{content}\n이전: {expected}\n현재: {actual}"
+    return len(samples)
+
+
+if __name__ == "__main__":
+    # 사용법 (apps/client에서): python -m bench.plan_parser_bench [반복 횟수] [동등성 검사 본문 수]
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    fuzz_count = int(sys.argv[2]) if len(sys.argv) > 2 else 30000
+    print(f"이전 파서와 동등성 확인: {check_itinerary_parser_equivalence(fuzz_count)}개 본문")
+    for result in benchmark_itinerary_parser([(3, 6), (30, 12), (365, 30)], repeat):
+        content = generate_sample_content(result['days'], result['activities_per_day'])
+        started = time.perf_counter()
+        for _ in range(repeat):
+            legacy_parse(content)
+        legacy_ms = round((time.perf_counter() - started) / repeat * 1000, 3)
+        print(f"{result['days']}일 x {result['activities_per_day']}개 ({result['content_length']}자): {result['avg_ms']}ms (이전 파서 {legacy_ms}ms)")
@@ -0,0 +1,32 @@
+"""
+공유 링크 인코딩 길이 비교
+"""
+import base64
+import json
+import sys
+from src.share.share_codec import encode_plan
+
+
+def benchmark_plans(plans):
+    """계획별 이전 방식(base64 JSON)과 압축 인코딩의 길이 비교"""
+    results = []
+    for plan in plans:
+        legacy = base64.urlsafe_b64encode(json.dumps(plan, ensure_ascii=False).encode("utf-8"))
+        compact = encode_plan(plan)
+        results.append({
+            "legacy_length": len(legacy),
+            "compact_length": len(compact),
+            "ratio": round(len(compact) / len(legacy), 3) if legacy else 0.0
+        })
+    return results
+
+
+if __name__ == "__main__":
+    # 사용법 (apps/client에서): python -m bench.share_codec_bench plan1.json plan2.json ...
+    plans = []
+    for path in sys.argv[1:]:
+        with open(path, encoding="utf-8") as f:
+            plans.append(json.load(f))
+
+    for path, result in zip(sys.argv[1:], benchmark_plans(plans)):
+        print(f"{path}: {result['legacy_length']} → {result['compact_length']} ({result['ratio']:.1%})")
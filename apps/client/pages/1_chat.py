@@ -1,8 +1,19 @@
 import streamlit as st
 import requests
 import json
+import uuid
 from datetime import datetime, timezone, timedelta
-import base64
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.json_stream import JSONStreamParser
+from src.share.share_utils import generate_share_url, generate_export_urls, generate_calendar_feed_url
+from src.share.plan_parser import normalize_plan, PLAN_FORMAT_JSON
+from src.share.plan_card import render_json_plan_card
+from src.utils.styles import PLAN_CARD_CSS
+from src.utils.style_injection import inject_styles
 
 if "chat_history" not in st.session_state:
     st.session_state.chat_history = []
@@ -10,6 +21,8 @@ if "current_thread_id" not in st.session_state:
     st.session_state.current_thread_id = None
 if "threads" not in st.session_state:
     st.session_state.threads = []
+if "session_key" not in st.session_state:
+    st.session_state.session_key = uuid.uuid4().hex
 if "current_plan" not in st.session_state:
     st.session_state.current_plan = None
 if "user_preferences" not in st.session_state:
@@ -23,15 +36,22 @@ if "model_config" not in st.session_state:
 if "show_settings" not in st.session_state:
     st.session_state.show_settings = False
 
+MODEL_LIST_CACHE_TTL = 300
+
+@st.cache_data(ttl=MODEL_LIST_CACHE_TTL, show_spinner=False)
+def fetch_available_models():
+    """서버 모델 목록 조회 (성공한 응답만 캐시)"""
+    response = requests.get("http://localhost:8000/travel/models", timeout=5)
+    response.raise_for_status()
+    return response.json()
+
 def get_available_models():
     """서버에서 사용 가능한 모델 목록 가져오기"""
     try:
-        response = requests.get("http://localhost:8000/travel/models", timeout=5)
-        if response.status_code == 200:
-            return response.json(), None
-        else:
-            error_msg = f"서버 오류 (상태 코드: {response.status_code})"
-            return None, error_msg
+        return fetch_available_models(), None
+    except requests.exceptions.HTTPError as e:
+        error_msg = f"서버 오류 (상태 코드: {e.response.status_code})"
+        return None, error_msg
     except requests.exceptions.Timeout:
         error_msg = "서버 응답 시간 초과"
         return None, error_msg
@@ -154,187 +174,9 @@ if st.session_state.show_settings:
         
         st.markdown("---")
 
-st.title("Travel Gene Chat 🗺️")
+inject_styles(PLAN_CARD_CSS)
 
-def generate_share_url(plan_data):
-    """여행 계획 데이터를 URL로 인코딩"""   
-    if not plan_data:
-        return None
-    
-    json_str = json.dumps(plan_data, ensure_ascii=False)
-    encoded_data = base64.urlsafe_b64encode(json_str.encode('utf-8')).decode('utf-8')
-    
-    base_url = "http://localhost:8501/share"
-    share_url = f"{base_url}?plan={encoded_data}"
-    
-    return share_url
-
-def render_json_plan_card(plan_data):
-    """JSON 형식 여행 계획을 카드 형태로 렌더링"""
-    if not isinstance(plan_data, dict) or 'plan_data' not in plan_data:
-        return
-    
-    st.markdown("""
-    <style>
-    :root {
-        --card-bg-color: #ffffff;
-        --card-text-color: #000000;
-        --card-border-color: #e0e0e0;
-        --day-card-bg: #f8f9fa;
-        --activity-card-bg: #ffffff;
-        --location-text-color: #666666;
-        --description-text-color: #888888;
-    }
-    
-    @media (prefers-color-scheme: dark) {
-        :root {
-            --card-bg-color: #2d2d2d;
-            --card-text-color: #ffffff;
-            --card-border-color: #4d4d4d;
-            --day-card-bg: #3d3d3d;
-            --activity-card-bg: #2d2d2d;
-            --location-text-color: #cccccc;
-            --description-text-color: #aaaaaa;
-        }
-    }
-    
-    .stApp[data-theme="dark"] {
-        --card-bg-color: #2d2d2d;
-        --card-text-color: #ffffff;
-        --card-border-color: #4d4d4d;
-        --day-card-bg: #3d3d3d;
-        --activity-card-bg: #2d2d2d;
-        --location-text-color: #cccccc;
-        --description-text-color: #aaaaaa;
-    }
-    
-    .stApp[data-theme="light"] {
-        --card-bg-color: #ffffff;
-        --card-text-color: #000000;
-        --card-border-color: #e0e0e0;
-        --day-card-bg: #f8f9fa;
-        --activity-card-bg: #ffffff;
-        --location-text-color: #666666;
-        --description-text-color: #888888;
-    }
-    
-    /* 카드 스타일 개선 */
-    .plan-card {
-        background: var(--activity-card-bg);
-        color: var(--card-text-color);
-        border: 1px solid var(--card-border-color);
-        border-radius: 8px;
-        padding: 12px;
-        margin: 8px 0;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-    }
-    
-    .day-header {
-        background: var(--day-card-bg);
-        color: var(--card-text-color);
-        border: 1px solid var(--card-border-color);
-    }
-    </style>
-    """, unsafe_allow_html=True)
-    
-    json_plan = plan_data['plan_data']
-    
-    if 'travel_overview' in json_plan:
-        overview = json_plan['travel_overview']
-        destination = overview.get('destination', '미정')
-        start_date = overview.get('start_date', '미정')
-        end_date = overview.get('end_date', '미정')
-        duration_days = overview.get('duration_days', 0)
-        summary = overview.get('summary', '')
-        
-        st.markdown(f"""
-        <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 20px; border-radius: 15px; color: white; margin: 10px 0;">
-            <h2>🗺️ {destination} 여행</h2>
-            <div style="margin-top: 20px;">
-                <div style="margin-bottom: 12px; font-size: 16px;">
-                    <strong>📅 여행 기간:</strong> {start_date} ~ {end_date}
-                </div>
-                <div style="margin-bottom: 12px; font-size: 16px;">
-                    <strong>📍 여행 일정:</strong> {duration_days}일
-                </div>
-                <div style="margin-bottom: 8px; font-size: 16px;">
-                    <strong>✨ 여행 컨셉:</strong> {summary if summary else '맞춤형 여행'}
-                </div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    if 'itinerary' in json_plan and json_plan['itinerary']:
-        st.markdown("### 📅 여행 일정")
-        
-        for day_num, day_plan in enumerate(json_plan['itinerary'], 1):
-            date = day_plan.get('date', '')
-            day_of_week = day_plan.get('day_of_week', '')
-            date_display = f"{date} ({day_of_week})" if day_of_week else date
-            
-            st.markdown(f"""
-            <div style="background: var(--day-card-bg); color: var(--card-text-color); padding: 15px; border-radius: 10px; margin: 10px 0; border-left: 4px solid #667eea;">
-                <h4>🌅 {day_num}일차 - {date_display}</h4>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            activities = day_plan.get('activities', [])
-            for activity in activities:
-                time = activity.get('time', '').strip()
-                title = activity.get('title', '').strip()
-                location = activity.get('location', '').strip()
-                address = activity.get('address', '').strip()
-                description = activity.get('description', '').strip()
-                category = activity.get('category', '').strip()
-                
-                icon_map = {
-                    '식사': '🍽️',
-                    '관광': '🎯',
-                    '숙박': '🏨',
-                    '이동': '🚗',
-                    '쇼핑': '🛍️',
-                    '휴식': '😌'
-                }
-                activity_icon = icon_map.get(category, '📍')
-                
-                time_section = f"<div style='margin-bottom: 2px; color: var(--card-text-color);'><strong>⏰ {time}</strong></div>" if time else ""
-                
-                title_section = f"<div style='margin-bottom: 4px; color: var(--card-text-color);'><strong>{activity_icon} {title}</strong></div>"
-                
-                location_section = ""
-                if location and address:
-                    location_section = f"<div style='color: var(--location-text-color); font-size: 14px; margin-bottom: 4px;'>📍 {location} - {address}</div>"
-                elif location:
-                    location_section = f"<div style='color: var(--location-text-color); font-size: 14px; margin-bottom: 4px;'>📍 {location}</div>"
-                elif address:
-                    location_section = f"<div style='color: var(--location-text-color); font-size: 14px; margin-bottom: 4px;'>📍 {address}</div>"
-                
-                description_section = f"<div style='font-size: 13px; color: var(--description-text-color);'>{description}</div>" if description else ""
-                
-                st.markdown(f"""
-                <div style="background: var(--activity-card-bg); color: var(--card-text-color); padding: 12px; border-radius: 8px; margin: 8px 0; border-left: 3px solid #28a745; box-shadow: 0 2px 4px rgba(0,0,0,0.1); border: 1px solid var(--card-border-color);">
-                    {time_section}
-                    {title_section}
-                    {location_section}
-                    {description_section}
-                </div>
-                """, unsafe_allow_html=True)
-    
-    additional_info = []
-    if 'preparation' in json_plan:
-        prep = json_plan['preparation']
-        if prep.get('essential_items'):
-            additional_info.append(f"🎒 **준비물:** {', '.join(prep['essential_items'][:3])}{'...' if len(prep['essential_items']) > 3 else ''}")
-    
-    if 'alternatives' in json_plan:
-        alt = json_plan['alternatives']
-        if alt.get('rainy_day_options'):
-            additional_info.append(f"☔ **우천시:** {', '.join(alt['rainy_day_options'][:2])}{'...' if len(alt['rainy_day_options']) > 2 else ''}")
-    
-    if additional_info:
-        st.markdown("### 📝 추가 정보")
-        for info in additional_info:
-            st.markdown(info)
+st.title("Travel Gene Chat 🗺️")
 
 if not st.session_state.chat_history:
     st.markdown("""
@@ -532,6 +374,25 @@ if st.session_state.current_plan:
             st.code(share_url)
             st.success("🎉 공유 링크가 생성되었습니다! 위 링크를 복사해서 친구들에게 전송하세요.")
     
+    if st.button("📥 파일로 내보내기", key="show_export_links_button"):
+        st.session_state.show_export_links = True
+    
+    if st.session_state.get('show_export_links', False):
+        # 변환은 API 서버에서 하므로 큰 계획도 Streamlit 세션을 막지 않고, 같은 계획은 캐시된 파일을 받음
+        export_urls = generate_export_urls(st.session_state.current_plan)
+        if export_urls:
+            export_cols = st.columns(len(export_urls))
+            for col, (label, url) in zip(export_cols, export_urls):
+                with col:
+                    st.link_button(label, url, use_container_width=True)
+            
+            feed_url = generate_calendar_feed_url(st.session_state.current_plan)
+            if feed_url:
+                st.caption("📅 캘린더 앱(Google, Apple, Outlook)에서 'URL로 구독'에 아래 주소를 넣으면 로그인 없이 일정이 추가됩니다.")
+                st.code(feed_url)
+        else:
+            st.warning("지금은 파일 내보내기를 사용할 수 없습니다. 잠시 후 다시 시도해 주세요.")
+    
     st.info("💡 '계획 공유하기' 버튼을 누르면 예쁜 공유 페이지로 이동합니다!")
     
     with st.expander("🔍 계획 데이터 확인 (상세보기)", expanded=False):
@@ -539,6 +400,13 @@ if st.session_state.current_plan:
     
     st.markdown("---")
 
+def format_day_markdown(index, day):
+    """일자별 일정을 간단한 마크다운으로 변환"""
+    lines = [f"**📅 {index}일차 - {day.get('date', '')} ({day.get('day_of_week', '')})**"]
+    for activity in day.get('activities', []):
+        lines.append(f"- {activity.get('time', '')} {activity.get('title', '')} · {activity.get('location', '')}")
+    return '\n'.join(lines)
+
 def handle_error(error_type: str, details: str = None) -> str:
     error_messages = {
         "server": "죄송합니다. 서버에서 오류가 발생했습니다. 잠시 후 다시 시도해 주세요. 🙇🏻",
@@ -585,7 +453,9 @@ def process_ai_response():
                             } for msg in st.session_state.chat_history
                         ],
                         "user_preferences": st.session_state.user_preferences,
-                        "current_plan": st.session_state.current_plan
+                        "current_plan": st.session_state.current_plan,
+                        "llm_config": st.session_state.model_config,
+                        "conversation_id": f"{st.session_state.session_key}:{st.session_state.current_thread_id}"
                     }
 
                     response = requests.post(
@@ -608,6 +478,11 @@ def process_ai_response():
                     if not has_error:
                         full_response = ""
                         buffer = ""
+                        streamed_days = {}  # itinerary 위치 → 일자 표시 요소
+                        text_placeholder = None
+                        response_kind = None
+                        json_parser = None
+                        parsed_days = 0
                         
                         for line in response.iter_lines():
                             if line:
@@ -621,27 +496,58 @@ def process_ai_response():
                                                 status.write("여행 계획을 생성하고 있습니다...")
                                             elif data['status'] == 'complete':
                                                 break
+                                            elif data['status'] == 'plan_day':
+                                                # 완성된 일자부터 미리 표시 (일차는 서버가 보낸 itinerary 위치 기준, 같은 일자가 다시 오면 그 자리를 갱신)
+                                                if json_container is None:
+                                                    message_placeholder.empty()
+                                                    json_container = message_placeholder.container()
+                                                day_index = data.get('day_index')
+                                                if day_index is None:
+                                                    day_index = len(streamed_days)
+                                                if day_index not in streamed_days:
+                                                    with json_container:
+                                                        streamed_days[day_index] = st.empty()
+                                                status.write(f"{day_index + 1}일차 일정이 완성되었습니다...")
+                                                streamed_days[day_index].markdown(format_day_markdown(day_index + 1, data.get('day', {})))
                                         
                                         if 'response' in data:
-                                            full_response += data['response']
+                                            chunk = data['response']
+                                            full_response += chunk
+                                            new_days = []
                                             
-                                            # JSON 응답 시작 감지 (첫 번째 { 문자)
-                                            if not is_json_response and full_response.strip().startswith('{'):
-                                                is_json_response = True
-                                                status.write("JSON 여행 계획을 생성하고 있습니다...")
+                                            # 첫 번째 유효 문자로 JSON 응답 여부를 한 번만 판별
+                                            if response_kind is None and full_response.strip():
+                                                response_kind = 'json' if full_response.lstrip().startswith('{') else 'text'
                                                 
-                                                # JSON 뷰어 컨테이너 미리 생성
-                                                message_placeholder.empty()
-                                                json_container = message_placeholder.container()
+                                                if response_kind == 'json':
+                                                    is_json_response = True
+                                                    status.write("JSON 여행 계획을 생성하고 있습니다...")
+                                                    
+                                                    # JSON 뷰어 컨테이너 미리 생성 (plan_day로 일자를 이미 그렸으면 그 컨테이너에 이어서 표시)
+                                                    if json_container is None:
+                                                        message_placeholder.empty()
+                                                        json_container = message_placeholder.container()
+                                                    json_parser = JSONStreamParser("itinerary")
+                                                    new_days = json_parser.feed(full_response)
+                                            elif is_json_response:
+                                                new_days = json_parser.feed(chunk)
                                             
                                             if is_json_response:
-                                                # JSON 응답인 경우 - 파싱 시도
-                                                try:
-                                                    # 완전한 JSON인지 확인
-                                                    if full_response.strip().endswith('}'):
-                                                        json_plan_data = json.loads(full_response.strip())
-                                                        
-                                                        # 완전한 JSON이 파싱되면 최종 뷰어 표시
+                                                # 새로 완성된 일자만 추가로 렌더링 (plan_day 이벤트로 이미 그린 일자는 건너뜀)
+                                                for day in new_days:
+                                                    parsed_days += 1
+                                                    if parsed_days - 1 in streamed_days:
+                                                        continue
+                                                    with json_container:
+                                                        st.markdown(format_day_markdown(parsed_days, day))
+                                                
+                                                # 최상위 객체가 닫혔을 때 한 번만 전체 파싱 후 최종 뷰어 표시 (파싱 실패 시 다시 시도하지 않음)
+                                                if json_parser.is_complete and not json_parser.is_parsed:
+                                                    json_plan_data = json_parser.parse()
+                                                    
+                                                    if json_plan_data:
+                                                        message_placeholder.empty()
+                                                        json_container = message_placeholder.container()
                                                         with json_container:
                                                             st.markdown("### 🎉 여행 계획이 완성되었습니다!")
                                                             
@@ -663,34 +569,27 @@ def process_ai_response():
                                                             with tab2:
                                                                 # 기존 카드 형태로 렌더링
                                                                 render_json_plan_card({"plan_data": json_plan_data})
-                                                except json.JSONDecodeError:
-                                                    # JSON 파싱 실패 - 계속 진행 상태 표시
-                                                    if json_container:
+                                            elif response_kind == 'text':
+                                                # 일반 텍스트 응답 (계획 수정 요약처럼 plan_day로 그린 일자가 있으면 그 아래 별도 요소에 표시)
+                                                if json_container is not None:
+                                                    if text_placeholder is None:
                                                         with json_container:
-                                                            st.markdown("### 🎉 여행 계획 생성 중...")
-                                            else:
-                                                # 일반 텍스트 응답
-                                                message_placeholder.markdown(full_response)
+                                                            text_placeholder = st.empty()
+                                                    text_placeholder.markdown(full_response)
+                                                else:
+                                                    message_placeholder.markdown(full_response)
                                             
                                             status.write("응답을 작성하고 있습니다...")
                                         
                                         if 'has_plan' in data and data['has_plan']:
                                             plan_data = data.get('plan', {})
+                                            st.session_state.current_plan = plan_data
                                             
-                                            # JSON 형식 계획 데이터 처리
-                                            if isinstance(plan_data, dict) and 'plan_data' in plan_data:
-                                                # 이미 JSON 구조로 되어있는 경우
-                                                st.session_state.current_plan = plan_data
-                                                if not json_plan_data:
-                                                    json_plan_data = plan_data.get('plan_data', {})
-                                            elif isinstance(plan_data, dict) and 'format' in plan_data and plan_data['format'] == 'json':
-                                                # JSON 형식으로 표시된 경우
-                                                st.session_state.current_plan = plan_data
-                                                if not json_plan_data:
-                                                    json_plan_data = plan_data.get('plan_data', {})
-                                            else:
-                                                # 기존 텍스트 형식 또는 기타 형식
-                                                st.session_state.current_plan = plan_data
+                                            # JSON 형식 계획이면 본문을 카드 렌더링용으로 보관
+                                            if isinstance(plan_data, dict) and not json_plan_data:
+                                                plan_info = normalize_plan(plan_data)
+                                                if plan_info.format == PLAN_FORMAT_JSON:
+                                                    json_plan_data = plan_info.plan_data
                                             
                                             status.update(label="🎉 여행 계획이 완성되었습니다!", state="complete")
                                             plan_completed = True 
@@ -705,7 +604,15 @@ def process_ai_response():
                         
                         if full_response and not has_error:
                             # 최종 응답 처리
-                            if json_plan_data:
+                            if json_plan_data and response_kind == 'text':
+                                # 계획 수정 요약 등 텍스트 응답은 본문을 그대로 보관 (다음 요청에 실제 응답이 전달되도록)
+                                st.session_state.chat_history.append({
+                                    "role": "assistant",
+                                    "content": full_response,
+                                    "plan_data": json_plan_data
+                                })
+                                
+                            elif json_plan_data:
                                 # JSON 계획이 있는 경우
                                 user_friendly_message = "✨ 맞춤형 여행 계획을 생성했습니다! 위의 JSON 데이터에서 자세한 일정을 확인해보세요."
                                 
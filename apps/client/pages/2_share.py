@@ -7,9 +7,10 @@ import os
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from src.utils.styles import SHARE_PAGE_STYLES
+from src.utils.styles import SHARE_PAGE_CSS
+from src.utils.style_injection import inject_styles
 from src.share.share_utils import decode_plan_from_url
-from src.share.plan_parser import parse_plan_info
+from src.share.plan_parser import normalize_plan, PLAN_FORMAT_JSON, PLAN_FORMAT_TEXT
 from src.share.renderers import (
     render_llm_trip_header, render_llm_content,
     render_trip_header, render_itinerary,
@@ -17,7 +18,7 @@ from src.share.renderers import (
 )
 from src.share.share_components import render_share_options
 
-st.markdown(SHARE_PAGE_STYLES, unsafe_allow_html=True)
+inject_styles(SHARE_PAGE_CSS)
 
 st.title("🌐 여행 공유")
 
@@ -38,17 +39,15 @@ if shared_plan_result:
 if shared_plan:
     st.success("🎉 공유된 여행 계획을 불러왔습니다!")
     
-    if 'plan_data' in shared_plan and isinstance(shared_plan['plan_data'], dict):
-        plan_data = shared_plan['plan_data']
-        render_json_trip_header(plan_data)
-        render_json_content(plan_data)
+    plan_info = normalize_plan(shared_plan)
+    
+    if plan_info.format == PLAN_FORMAT_JSON:
+        render_json_trip_header(plan_info.plan_data)
+        render_json_content(plan_info.plan_data)
         
-    elif 'content' in shared_plan and 'collected_info' in shared_plan:
-        plan_info = parse_plan_info(shared_plan)
+    elif plan_info.format == PLAN_FORMAT_TEXT:
         render_llm_trip_header(plan_info)
-        
-        if plan_info['content']:
-            render_llm_content(plan_info['content'])
+        render_llm_content(plan_info.content)
         
     else:
         render_trip_header(shared_plan)
@@ -83,17 +82,15 @@ elif 'current_plan' in st.session_state and st.session_state.current_plan:
     
     st.info("💡 채팅에서 생성한 여행 계획이 있습니다!")
     
-    if 'plan_data' in plan and isinstance(plan['plan_data'], dict):
-        plan_data = plan['plan_data']
-        render_json_trip_header(plan_data)
-        render_json_content(plan_data)
+    plan_info = normalize_plan(plan)
+    
+    if plan_info.format == PLAN_FORMAT_JSON:
+        render_json_trip_header(plan_info.plan_data)
+        render_json_content(plan_info.plan_data)
         
-    elif 'content' in plan and 'collected_info' in plan:
-        plan_info = parse_plan_info(plan)
+    elif plan_info.format == PLAN_FORMAT_TEXT:
         render_llm_trip_header(plan_info)
-        
-        if plan_info['content']:
-            render_llm_content(plan_info['content'])
+        render_llm_content(plan_info.content)
         
     else:
         render_trip_header(plan)
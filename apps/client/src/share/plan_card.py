@@ -0,0 +1,93 @@
+"""
+채팅 페이지 JSON 여행 계획 카드 렌더링
+"""
+import streamlit as st
+
+ACTIVITY_ICONS = {
+    '식사': '🍽️',
+    '관광': '🎯',
+    '숙박': '🏨',
+    '이동': '🚗',
+    '쇼핑': '🛍️',
+    '휴식': '😌'
+}
+
+
+def _inline(text):
+    """HTML 블록이 빈 줄에서 끊기지 않도록 공백/줄바꿈을 한 칸으로 정리 (HTML 표시 결과는 같음)"""
+    return " ".join(str(text).split())
+
+
+def overview_html(overview):
+    """여행 개요 헤더 카드 HTML"""
+    summary = overview.get('summary', '')
+    return (
+        f"<div class='plan-overview'><h2>🗺️ {_inline(overview.get('destination', '미정'))} 여행</h2>"
+        "<div class='plan-overview-rows'>"
+        f"<div><strong>📅 여행 기간:</strong> {overview.get('start_date', '미정')} ~ {overview.get('end_date', '미정')}</div>"
+        f"<div><strong>📍 여행 일정:</strong> {overview.get('duration_days', 0)}일</div>"
+        f"<div><strong>✨ 여행 컨셉:</strong> {_inline(summary) if summary else '맞춤형 여행'}</div>"
+        "</div></div>"
+    )
+
+
+def activity_html(activity):
+    """활동 카드 HTML (스타일은 PLAN_CARD_CSS 클래스로 적용)"""
+    time = activity.get('time', '').strip()
+    title = activity.get('title', '').strip()
+    location = activity.get('location', '').strip()
+    address = activity.get('address', '').strip()
+    description = activity.get('description', '').strip()
+    activity_icon = ACTIVITY_ICONS.get(activity.get('category', '').strip(), '📍')
+
+    parts = []
+    if time:
+        parts.append(f"<div class='plan-activity-time'><strong>⏰ {_inline(time)}</strong></div>")
+    parts.append(f"<div class='plan-activity-title'><strong>{activity_icon} {_inline(title)}</strong></div>")
+    place = " - ".join(part for part in (location, address) if part)
+    if place:
+        parts.append(f"<div class='plan-activity-location'>📍 {_inline(place)}</div>")
+    if description:
+        parts.append(f"<div class='plan-activity-description'>{_inline(description)}</div>")
+    return f"<div class='plan-activity'>{''.join(parts)}</div>"
+
+
+def day_html(day_num, day_plan):
+    """일자 헤더와 그날 활동 카드 HTML"""
+    date = day_plan.get('date', '')
+    day_of_week = day_plan.get('day_of_week', '')
+    date_display = f"{date} ({day_of_week})" if day_of_week else date
+    activities = "".join(activity_html(activity) for activity in day_plan.get('activities', []))
+    return f"<div class='plan-day'><h4>🌅 {day_num}일차 - {date_display}</h4></div>{activities}"
+
+
+def plan_card_markdown(json_plan):
+    """JSON 계획 카드 전체를 마크다운 하나로 구성 (한 줄짜리 HTML 블록을 빈 줄로 구분)"""
+    blocks = []
+    if 'travel_overview' in json_plan:
+        blocks.append(overview_html(json_plan['travel_overview']))
+
+    if json_plan.get('itinerary'):
+        blocks.append("### 📅 여행 일정")
+        blocks.extend(day_html(day_num, day_plan) for day_num, day_plan in enumerate(json_plan['itinerary'], 1))
+
+    additional_info = []
+    prep = json_plan.get('preparation') or {}
+    if prep.get('essential_items'):
+        additional_info.append(f"🎒 **준비물:** {', '.join(prep['essential_items'][:3])}{'...' if len(prep['essential_items']) > 3 else ''}")
+    alt = json_plan.get('alternatives') or {}
+    if alt.get('rainy_day_options'):
+        additional_info.append(f"☔ **우천시:** {', '.join(alt['rainy_day_options'][:2])}{'...' if len(alt['rainy_day_options']) > 2 else ''}")
+    if additional_info:
+        blocks.append("### 📝 추가 정보")
+        blocks.extend(additional_info)
+
+    return "\n\n".join(blocks)
+
+
+def render_json_plan_card(plan_data):
+    """JSON 형식 여행 계획을 카드 형태로 렌더링 (요소 하나로 전송, 스타일은 페이지에서 inject_styles(PLAN_CARD_CSS))"""
+    if not isinstance(plan_data, dict) or 'plan_data' not in plan_data:
+        return
+    st.markdown(plan_card_markdown(plan_data['plan_data']), unsafe_allow_html=True)
+
@@ -1,9 +1,160 @@
 """
 여행 계획 데이터 파싱 관련 함수들
 """
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Tuple, TypedDict
 
+PLAN_CACHE_SIZE = 128
 
-def parse_plan_info(plan):
+# '일자별 세부 일정' 다음 번호 섹션 (준비사항/대체 옵션/주의사항 줄과 함께 섹션 끝으로 판단)
+SECTION_END_PREFIXES = ('3.', '4.')
+TIME_WORDS = ('오전', '오후', '아침', '점심', '저녁')
+BULLET_PREFIXES = ('○', 'o', '•')
+
+PLAN_FORMAT_JSON = 'json'
+PLAN_FORMAT_TEXT = 'text'
+PLAN_FORMAT_LEGACY = 'legacy'
+
+_normalized_plans = OrderedDict()
+_normalized_plans_lock = threading.Lock()
+
+
+class ItineraryActivity(TypedDict):
+    time: str
+    title: str
+    location: str
+    description: str
+
+
+class ItineraryDay(TypedDict):
+    date: str
+    activities: List[ItineraryActivity]
+
+
+class NormalizedPlan(NamedTuple):
+    """형식(json/text/legacy)과 관계없이 한 번만 정규화한 여행 계획 (LLM 서비스 models.plan.NormalizedPlan과 같은 형식 구분)"""
+    format: str
+    destination: str
+    start_date: str
+    end_date: str
+    duration_days: int
+    summary: str
+    budget: int
+    activities: Tuple[str, ...]
+    content: str
+    collected_info: str
+    itinerary: List[ItineraryDay]
+    plan_data: Optional[dict]
+
+
+def detect_plan_format(plan):
+    """계획 딕셔너리의 형식 판별 (JSON 본문 → 텍스트 본문 → 이전 딕셔너리 순)"""
+    if isinstance(plan.get('plan_data'), dict):
+        return PLAN_FORMAT_JSON
+    if plan.get('content'):
+        return PLAN_FORMAT_TEXT
+    return PLAN_FORMAT_LEGACY
+
+
+def plan_digest(plan):
+    """계획 내용의 SHA-256 다이제스트 (같은 내용이면 같은 값, 메모이제이션 키)"""
+    payload = json.dumps(plan, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def normalize_plan(plan) -> NormalizedPlan:
+    """계획 딕셔너리를 NormalizedPlan으로 정규화 (형식 판별과 파싱은 여기서만, 다이제스트 기준 LRU 캐시)
+
+    Streamlit 재실행마다 같은 계획을 다시 파싱하지 않도록 결과를 공유하므로 itinerary/plan_data는 수정하지 말 것.
+    """
+    digest = plan_digest(plan)
+    with _normalized_plans_lock:
+        if digest in _normalized_plans:
+            _normalized_plans.move_to_end(digest)
+            return _normalized_plans[digest]
+    
+    normalized = _normalize_plan(plan)
+    with _normalized_plans_lock:
+        _normalized_plans[digest] = normalized
+        while len(_normalized_plans) > PLAN_CACHE_SIZE:
+            _normalized_plans.popitem(last=False)
+    return normalized
+
+
+def _count_days(start_date, end_date):
+    """'YYYY년 MM월 DD일 (요일)' 형식 기간의 일수 (미정이면 0, 파싱 실패 시 1)"""
+    if start_date == '미정' or end_date == '미정':
+        return 0
+    try:
+        start = datetime.strptime(start_date.split('(')[0].strip(), '%Y년 %m월 %d일')
+        end = datetime.strptime(end_date.split('(')[0].strip(), '%Y년 %m월 %d일')
+        return (end - start).days + 1
+    except:
+        return 1
+
+
+def _normalize_plan(plan):
+    """계획 형식별 파싱 (normalize_plan의 캐시되지 않은 버전)"""
+    plan_format = detect_plan_format(plan)
+    if plan_format == PLAN_FORMAT_LEGACY:
+        return _parse_legacy_plan(plan)
+    
+    info = _parse_llm_plan_info(plan)
+    if plan_format == PLAN_FORMAT_JSON:
+        plan_data = plan['plan_data']
+        overview = plan_data.get('travel_overview', {})
+        duration_days = overview.get('duration_days', 0)
+        summary = overview.get('summary', '')
+        itinerary = plan_data.get('itinerary', [])
+    else:
+        plan_data = None
+        duration_days = _count_days(info['start_date'], info['end_date'])
+        summary = ''
+        itinerary = parse_itinerary_from_content(info['content'])
+    
+    return NormalizedPlan(
+        format=plan_format,
+        destination=info['destination'],
+        start_date=info['start_date'],
+        end_date=info['end_date'],
+        duration_days=duration_days,
+        summary=summary,
+        budget=info['budget'],
+        activities=tuple(info['activities']),
+        content=info['content'],
+        collected_info=plan.get('collected_info') or '',
+        itinerary=itinerary,
+        plan_data=plan_data
+    )
+
+
+def _parse_legacy_plan(plan):
+    """이전 형식(딕셔너리) 계획 파싱 (user_preferences 값으로 보완)"""
+    preferences = plan.get('user_preferences', {})
+    travel_dates = plan.get('travel_dates', preferences.get('travel_dates', {}))
+    itinerary = plan.get('itinerary', [])
+    return NormalizedPlan(
+        format=PLAN_FORMAT_LEGACY,
+        destination=plan.get('destination', preferences.get('destination')) or '여행지 미정',
+        start_date=travel_dates.get('start', '') or '미정',
+        end_date=travel_dates.get('end', '') or '미정',
+        duration_days=len(itinerary),
+        summary='',
+        budget=plan.get('budget', preferences.get('budget')) or 0,
+        activities=(),
+        content='',
+        collected_info='',
+        itinerary=itinerary,
+        plan_data=None
+    )
+
+
+def _parse_llm_plan_info(plan):
     """LLM 계획 데이터에서 정보 파싱"""
     info = {
         'destination': '여행지 미정',
@@ -65,152 +216,74 @@ def parse_plan_info(plan):
     return info
 
 
-def parse_itinerary_from_content(content):
-    """LLM 내용에서 일정 정보 파싱 - '일자별 세부 일정' 섹션만"""
-    itinerary = []
-    
-    itinerary_section = ""
-    lines = content.split('\n')
+def _activity(time_text, title) -> ItineraryActivity:
+    """파싱된 일정 활동 항목 생성"""
+    return {'time': time_text, 'title': title, 'location': '', 'description': ''}
+
+
+def _parse_activity_line(line):
+    """'시간: 활동', '시간 - 활동', '- 시간: 활동' 형식의 줄을 활동 항목으로 파싱 (':'가 포함된 줄)"""
+    if line.startswith('-'):
+        line_clean = line.lstrip('-').strip()
+        if ': ' in line_clean:
+            potential_time, potential_title = line_clean.split(': ', 1)
+            potential_time = potential_time.strip()
+            if any(char.isdigit() for char in potential_time) or potential_time in TIME_WORDS:
+                return _activity(potential_time, potential_title.strip())
+            return _activity('', line_clean)
+        if ' - ' in line:
+            if ' - ' in line_clean:
+                time_part, activity_part = line_clean.split(' - ', 1)
+                return _activity(time_part.strip(), activity_part.strip())
+            return _activity('', line_clean)
+        return _activity('', line)
     
+    separator = ' - ' if ' - ' in line else ':'
+    time_part, activity_part = line.split(separator, 1)
+    return _activity(time_part.strip(), activity_part.strip())
+
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def parse_itinerary_from_content(content) -> List[ItineraryDay]:
+    """LLM 내용에서 일정 정보 파싱 - '일자별 세부 일정' 섹션만 (내용 기준 캐시, 반환값은 수정하지 말 것)
+
+    줄 단위 상태 기계로 한 번만 순회: 섹션 시작 전 → 섹션 안(날짜 줄마다 새 일차 시작) → 섹션 끝에서 중단.
+    """
+    itinerary = []
     in_itinerary_section = False
+    current_day = None
+    current_activities = []
     
-    for line in lines:
+    for line in content.split('\n'):
         line = line.strip()
         
         if '일자별' in line and '일정' in line:
             in_itinerary_section = True
             continue
-        
-        elif in_itinerary_section and (
-            line.startswith('3.') or 
-            line.startswith('4.') or 
-            '준비사항' in line or 
-            '대체 옵션' in line or
-            '주의사항' in line
-        ):
+        if not in_itinerary_section:
+            continue
+        if line.startswith(SECTION_END_PREFIXES) or '준비사항' in line or '대체 옵션' in line or '주의사항' in line:
             break
-        
-        elif in_itinerary_section:
-            itinerary_section += line + '\n'
-    
-    if not itinerary_section.strip():
-        return []
-    
-    lines = itinerary_section.split('\n')
-    current_day = None
-    current_activities = []
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
+        if not line or line.startswith('#'):
             continue
         
-        if line.startswith('#'):
-            continue
-            
-        if ('월' in line and '일' in line and ('(' in line or '년' in line)):
+        # '월', '일'과 함께 요일 괄호나 '년'이 들어간 줄은 날짜 줄
+        if '월' in line and '일' in line and ('(' in line or '년' in line):
             if current_day and current_activities:
-                itinerary.append({
-                    'date': current_day,
-                    'activities': current_activities
-                })
-            
+                itinerary.append({'date': current_day, 'activities': current_activities})
             current_day = line.replace('-', '').replace('#', '').strip()
             current_activities = []
-        
-        elif ':' in line and current_day:
-            try:
-                time = ''
-                title = ''
-                
-                if line.startswith('-') and ': ' in line:
-                    line_clean = line.lstrip('-').strip()
-                    if ':' in line_clean:
-                        parts = line_clean.split(': ', 1)
-                        if len(parts) == 2:
-                            potential_time = parts[0].strip()
-                            potential_title = parts[1].strip()
-                            if any(char.isdigit() for char in potential_time) or potential_time in ['오전', '오후', '아침', '점심', '저녁']:
-                                time = potential_time
-                                title = potential_title
-                            else:
-                                time = ''
-                                title = line_clean
-                        else:
-                            time = ''
-                            title = line_clean
-                    else:
-                        time = ''
-                        title = line_clean
-                elif line.startswith('-') and ' - ' in line:
-                    line_clean = line.lstrip('-').strip()
-                    if ' - ' in line_clean:
-                        time_part, activity_part = line_clean.split(' - ', 1)
-                        time = time_part.strip()
-                        title = activity_part.strip()
-                    else:
-                        time = ''
-                        title = line_clean
-                elif ' - ' in line and ':' in line:
-                    time_part, activity_part = line.split(' - ', 1)
-                    time = time_part.strip()
-                    title = activity_part.strip()
-                elif ':' in line and not ' - ' in line and not line.startswith('-'):
-                    time_part, activity_part = line.split(':', 1)
-                    time = time_part.strip()
-                    title = activity_part.strip()
-                else:
-                    time = ''
-                    title = line.strip()
-                
-                activity = {
-                    'time': time,
-                    'title': title,
-                    'location': '',
-                    'description': ''
-                }
-                
-                current_activities.append(activity)
-                
-            except:
-                if current_day:
-                    activity = {
-                        'time': '',
-                        'title': line,
-                        'location': '',
-                        'description': ''
-                    }
-                    current_activities.append(activity)
-        
-        elif (line.startswith('○') or line.startswith('o') or line.startswith('•') or 
-              line.startswith('-') and not ('월' in line and '일' in line)) and current_day:
+        elif not current_day:
+            continue
+        elif ':' in line:
+            current_activities.append(_parse_activity_line(line))
+        elif line.startswith(BULLET_PREFIXES) or (line.startswith('-') and not ('월' in line and '일' in line)):
             detail = line.replace('○', '').replace('o', '').replace('•', '').replace('-', '').strip()
             if detail:
-                if ':' in detail and ' - ' in detail:
-                    try:
-                        time_part, activity_part = detail.split(' - ', 1)
-                        activity = {
-                            'time': time_part.strip(),
-                            'title': activity_part.strip(),
-                            'location': '',
-                            'description': ''
-                        }
-                        current_activities.append(activity)
-                    except:
-                        pass
-                else:
-                    activity = {
-                        'time': '',
-                        'title': detail,
-                        'location': '',
-                        'description': ''
-                    }
-                    current_activities.append(activity)
+                current_activities.append(_activity('', detail))
     
     if current_day and current_activities:
-        itinerary.append({
-            'date': current_day,
-            'activities': current_activities
-        })
+        itinerary.append({'date': current_day, 'activities': current_activities})
     
-    return itinerary 
\ No newline at end of file
+    return itinerary
+
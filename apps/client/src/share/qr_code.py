@@ -0,0 +1,34 @@
+"""
+공유 링크 QR 코드 생성 (외부 서비스 없이 로컬 생성)
+"""
+import io
+from functools import lru_cache
+import segno
+
+QR_CACHE_SIZE = 128
+QR_ERROR_LEVEL = "m"
+# 모듈 1칸당 픽셀 수 (짧은 공유 URL 기준 약 500px PNG)
+QR_SCALE = 12
+QR_BORDER = 4
+
+
+@lru_cache(maxsize=QR_CACHE_SIZE)
+def _make_qr(share_url):
+    """공유 URL의 QR 코드 객체 (같은 URL은 한 번만 인코딩)"""
+    return segno.make(share_url, error=QR_ERROR_LEVEL)
+
+
+@lru_cache(maxsize=QR_CACHE_SIZE)
+def qr_png(share_url):
+    """공유 URL의 QR 코드 PNG 바이트 (미리보기와 다운로드에 같은 바이트 사용)"""
+    buffer = io.BytesIO()
+    _make_qr(share_url).save(buffer, kind="png", scale=QR_SCALE, border=QR_BORDER)
+    return buffer.getvalue()
+
+
+@lru_cache(maxsize=QR_CACHE_SIZE)
+def qr_svg(share_url):
+    """공유 URL의 QR 코드 SVG 바이트 (인쇄용 벡터 이미지)"""
+    buffer = io.BytesIO()
+    _make_qr(share_url).save(buffer, kind="svg", scale=QR_SCALE, border=QR_BORDER, xmldecl=False)
+    return buffer.getvalue()
@@ -2,31 +2,35 @@
 여행 계획 렌더링 관련 함수들
 """
 import streamlit as st
-from .plan_parser import parse_itinerary_from_content
+from functools import lru_cache
+from .plan_parser import normalize_plan, parse_itinerary_from_content, PLAN_CACHE_SIZE
+
+# JSON 계획의 추가 정보 섹션: (키, 제목, 열별 [(항목 키, 라벨)])
+JSON_ADDITIONAL_SECTIONS = [
+    ('preparation', '🎒 준비사항', [
+        [('essential_items', '🎁 필수 준비물'), ('reservations_needed', '📞 사전 예약 필요')],
+        [('local_tips', '💡 현지 정보'), ('warnings', '⚠️ 주의사항')]
+    ]),
+    ('alternatives', '🌦️ 대체 옵션', [
+        [('rainy_day_options', '☔ 우천시 대체 장소')],
+        [('optional_activities', '✨ 선택적 추가 활동')]
+    ])
+]
 
 
 def render_llm_trip_header(plan_info):
-    """LLM 계획 정보로 헤더 렌더링"""
-    destination = plan_info['destination']
-    start_date = plan_info['start_date']
-    end_date = plan_info['end_date']
-    
-    days_count = 0
-    if start_date != '미정' and end_date != '미정':
-        try:
-            from datetime import datetime
-            start = datetime.strptime(start_date.split('(')[0].strip(), '%Y년 %m월 %d일')
-            end = datetime.strptime(end_date.split('(')[0].strip(), '%Y년 %m월 %d일')
-            days_count = (end - start).days + 1
-        except:
-            days_count = 1
+    """LLM 계획 정보(NormalizedPlan)로 헤더 렌더링"""
+    destination = plan_info.destination
+    start_date = plan_info.start_date
+    end_date = plan_info.end_date
+    days_count = plan_info.duration_days
     
     if start_date != '미정' and end_date != '미정':
         date_display = f"{start_date} ~ {end_date}"
     else:
         date_display = "미정"
     
-    activities_display = '・'.join(plan_info['activities']) if plan_info['activities'] else '일반 여행'
+    activities_display = '・'.join(plan_info.activities) if plan_info.activities else '일반 여행'
     
     st.markdown(f"""
     <div class="trip-card">
@@ -48,34 +52,12 @@ def render_llm_trip_header(plan_info):
 
 def render_trip_header(plan):
     """여행 헤더 렌더링"""
-    destination = None
-    start_date = None
-    end_date = None
-    budget = None
-    
-    if 'destination' in plan:
-        destination = plan['destination']
-    elif 'user_preferences' in plan and 'destination' in plan['user_preferences']:
-        destination = plan['user_preferences']['destination']
-    
-    if 'travel_dates' in plan:
-        start_date = plan['travel_dates'].get('start', '')
-        end_date = plan['travel_dates'].get('end', '')
-    elif 'user_preferences' in plan and 'travel_dates' in plan['user_preferences']:
-        start_date = plan['user_preferences']['travel_dates'].get('start', '')
-        end_date = plan['user_preferences']['travel_dates'].get('end', '')
-    
-    if 'budget' in plan:
-        budget = plan['budget']
-    elif 'user_preferences' in plan and 'budget' in plan['user_preferences']:
-        budget = plan['user_preferences']['budget']
-    
-    destination = destination or '여행지 미정'
-    start_date = start_date or '미정'
-    end_date = end_date or '미정'
-    budget = budget or 0
-    
-    itinerary_count = len(plan.get('itinerary', []))
+    plan_info = normalize_plan(plan)
+    destination = plan_info.destination
+    start_date = plan_info.start_date
+    end_date = plan_info.end_date
+    budget = plan_info.budget
+    itinerary_count = plan_info.duration_days
     
     if start_date != '미정' and end_date != '미정':
         date_display = f"{start_date} ~ {end_date}"
@@ -204,6 +186,34 @@ def render_itinerary(itinerary):
             st.markdown(activity_html, unsafe_allow_html=True)
 
 
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def llm_content_sections(content, has_itinerary):
+    """LLM 생성 내용에서 표시할 (소제목, 본문) 섹션 목록 추출 (소제목이 없는 섹션은 None, 내용 기준 캐시)"""
+    sections = []
+    for section in content.split('\n\n'):
+        if not section.strip():
+            continue
+        
+        lines = section.strip().split('\n')
+        first_line = lines[0].strip()
+        body = '\n'.join(lines[1:])
+        
+        if has_itinerary:
+            if any(keyword in section for keyword in ['일자별', '일정', '6월', '7월', '8월', '9월', '10월', '11월', '12월', '1월', '2월', '3월', '4월', '5월']):
+                continue
+            if any(keyword in first_line for keyword in ['준비사항', '대체 옵션', '주의사항']):
+                sections.append((first_line, body))
+            elif not any(digit in first_line for digit in '0123456789'):
+                sections.append((None, section))
+        else:
+            if any(keyword in first_line for keyword in ['개요', '일정', '준비사항', '대체 옵션']):
+                sections.append((first_line, body))
+            else:
+                sections.append((None, section))
+    
+    return tuple(sections)
+
+
 def render_llm_content(content):
     """LLM 생성 내용 렌더링"""
     st.markdown("## 📋 여행 계획")
@@ -215,36 +225,12 @@ def render_llm_content(content):
         render_itinerary(itinerary)
         
         st.markdown("### 📝 추가 정보")
-        
-        sections = content.split('\n\n')
-        for section in sections:
-            if section.strip():
-                if not any(keyword in section for keyword in ['일자별', '일정', '6월', '7월', '8월', '9월', '10월', '11월', '12월', '1월', '2월', '3월', '4월', '5월']):
-                    lines = section.strip().split('\n')
-                    if lines:
-                        first_line = lines[0].strip()
-                        if any(keyword in first_line for keyword in ['준비사항', '대체 옵션', '주의사항']):
-                            st.subheader(first_line)
-                            if len(lines) > 1:
-                                content_lines = '\n'.join(lines[1:])
-                                st.markdown(content_lines)
-                        elif not any(digit in first_line for digit in '0123456789'):
-                            st.markdown(section)
-    else:
-        sections = content.split('\n\n')
-        
-        for section in sections:
-            if section.strip():
-                lines = section.strip().split('\n')
-                if lines:
-                    first_line = lines[0].strip()
-                    if any(keyword in first_line for keyword in ['개요', '일정', '준비사항', '대체 옵션']):
-                        st.subheader(first_line)
-                        if len(lines) > 1:
-                            content_lines = '\n'.join(lines[1:])
-                            st.markdown(content_lines)
-                    else:
-                        st.markdown(section)
+    
+    for heading, body in llm_content_sections(content, bool(itinerary)):
+        if heading:
+            st.subheader(heading)
+        if body:
+            st.markdown(body)
 
 
 def render_json_itinerary(itinerary_data):
@@ -314,51 +300,20 @@ def render_json_itinerary(itinerary_data):
 
 def render_json_additional_info(plan_data):
     """JSON 형식 추가 정보 렌더링"""
-    if 'preparation' in plan_data:
-        prep = plan_data['preparation']
-        st.markdown("### 🎒 준비사항")
-        
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            if 'essential_items' in prep and prep['essential_items']:
-                st.markdown("**🎁 필수 준비물:**")
-                for item in prep['essential_items']:
-                    st.markdown(f"• {item}")
-            
-            if 'reservations_needed' in prep and prep['reservations_needed']:
-                st.markdown("**📞 사전 예약 필요:**")
-                for reservation in prep['reservations_needed']:
-                    st.markdown(f"• {reservation}")
-        
-        with col2:
-            if 'local_tips' in prep and prep['local_tips']:
-                st.markdown("**💡 현지 정보:**")
-                for tip in prep['local_tips']:
-                    st.markdown(f"• {tip}")
-            
-            if 'warnings' in prep and prep['warnings']:
-                st.markdown("**⚠️ 주의사항:**")
-                for warning in prep['warnings']:
-                    st.markdown(f"• {warning}")
-    
-    if 'alternatives' in plan_data:
-        alt = plan_data['alternatives']
-        st.markdown("### 🌦️ 대체 옵션")
-        
-        col1, col2 = st.columns(2)
+    for key, heading, columns in JSON_ADDITIONAL_SECTIONS:
+        if key not in plan_data:
+            continue
         
-        with col1:
-            if 'rainy_day_options' in alt and alt['rainy_day_options']:
-                st.markdown("**☔ 우천시 대체 장소:**")
-                for option in alt['rainy_day_options']:
-                    st.markdown(f"• {option}")
+        section = plan_data[key]
+        st.markdown(f"### {heading}")
         
-        with col2:
-            if 'optional_activities' in alt and alt['optional_activities']:
-                st.markdown("**✨ 선택적 추가 활동:**")
-                for activity in alt['optional_activities']:
-                    st.markdown(f"• {activity}")
+        for column, groups in zip(st.columns(len(columns)), columns):
+            with column:
+                for group_key, label in groups:
+                    if group_key in section and section[group_key]:
+                        st.markdown(f"**{label}:**")
+                        for item in section[group_key]:
+                            st.markdown(f"• {item}")
 
 
 def render_json_content(plan_data):
@@ -0,0 +1,139 @@
+"""
+공유 링크용 여행 계획 압축 인코딩
+"""
+import base64
+import json
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+SHARE_CODEC_VERSION = "1"
+
+# 공유 페이지 렌더링에 필요 없는 계획 메타데이터 (이전 계획, 수정 patch 등)
+PRUNED_PLAN_KEYS = (
+    "previous_plan", "patch", "generated_at", "format",
+    "kakao_places_used", "places_count", "refinement_enhanced"
+)
+
+# 계획 JSON 키 → 짧은 키 (값을 바꾸면 기존 링크를 읽을 수 없으므로 추가만 가능)
+KEY_ALIASES = {
+    "plan_data": "p",
+    "content": "c",
+    "collected_info": "ci",
+    "travel_overview": "o",
+    "destination": "d",
+    "start_date": "s",
+    "end_date": "e",
+    "duration_days": "n",
+    "summary": "m",
+    "itinerary": "i",
+    "date": "dt",
+    "day_of_week": "w",
+    "activities": "a",
+    "time": "t",
+    "title": "ti",
+    "location": "l",
+    "address": "ad",
+    "description": "de",
+    "category": "ca",
+    "duration_minutes": "dm",
+    "preparation": "pr",
+    "essential_items": "ei",
+    "reservations_needed": "rn",
+    "local_tips": "lt",
+    "warnings": "wa",
+    "alternatives": "al",
+    "rainy_day_options": "ro",
+    "optional_activities": "oa"
+}
+KEY_ORIGINALS = {alias: key for key, alias in KEY_ALIASES.items()}
+ESCAPE_PREFIX = "~"
+
+
+def prune_plan(plan):
+    """공유 페이지가 사용하지 않는 메타데이터와 빈 값(None) 제거"""
+    if isinstance(plan, dict):
+        return {
+            key: prune_plan(value)
+            for key, value in plan.items()
+            if value is not None and key not in PRUNED_PLAN_KEYS
+        }
+    if isinstance(plan, list):
+        return [prune_plan(item) for item in plan]
+    return plan
+
+
+def _shorten_key(key):
+    """계획 키를 짧은 키로 변환"""
+    if key in KEY_ALIASES:
+        return KEY_ALIASES[key]
+    # 별칭과 겹치거나 이스케이프 문자로 시작하는 원래 키는 이스케이프
+    if key in KEY_ORIGINALS or key.startswith(ESCAPE_PREFIX):
+        return ESCAPE_PREFIX + key
+    return key
+
+
+def _restore_key(key):
+    """짧은 키를 원래 키로 복원"""
+    if key.startswith(ESCAPE_PREFIX):
+        return key[len(ESCAPE_PREFIX):]
+    return KEY_ORIGINALS.get(key, key)
+
+
+def _map_keys(value, convert):
+    """중첩된 딕셔너리의 모든 키 변환"""
+    if isinstance(value, dict):
+        return {convert(key): _map_keys(item, convert) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_map_keys(item, convert) for item in value]
+    return value
+
+
+def _b64encode(data):
+    """패딩 없는 URL-safe base64 인코딩"""
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+def _b64decode(text):
+    """패딩 없는 URL-safe base64 디코딩"""
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def encode_plan(plan):
+    """계획을 "<버전><압축방식>.<base64url>" 형식의 공유 문자열로 인코딩 (zlib/brotli 중 짧은 쪽)"""
+    compact = _map_keys(prune_plan(plan), _shorten_key)
+    raw = json.dumps(compact, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    candidates = [("z", zlib.compress(raw, 9))]
+    if brotli is not None:
+        candidates.append(("b", brotli.compress(raw, quality=11)))
+    method, compressed = min(candidates, key=lambda candidate: len(candidate[1]))
+
+    return f"{SHARE_CODEC_VERSION}{method}.{_b64encode(compressed)}"
+
+
+def decode_plan(encoded):
+    """공유 문자열을 계획으로 디코딩 (버전 접두사가 없으면 이전 base64 JSON 형식으로 처리)"""
+    if "." not in encoded:
+        return json.loads(base64.urlsafe_b64decode(encoded.encode("utf-8")).decode("utf-8"))
+
+    header, payload = encoded.split(".", 1)
+    version, method = header[:-1], header[-1:]
+    if version != SHARE_CODEC_VERSION:
+        raise ValueError(f"지원하지 않는 공유 링크 버전입니다: {version}")
+
+    compressed = _b64decode(payload)
+    if method == "z":
+        raw = zlib.decompress(compressed)
+    elif method == "b":
+        if brotli is None:
+            raise ValueError("brotli로 압축된 공유 링크를 읽으려면 brotli 패키지가 필요합니다")
+        raw = brotli.decompress(compressed)
+    else:
+        raise ValueError(f"지원하지 않는 압축 방식입니다: {method}")
+
+    return _map_keys(json.loads(raw.decode("utf-8")), _restore_key)
+
@@ -5,6 +5,7 @@ import streamlit as st
 import streamlit.components.v1 as components
 from urllib.parse import quote
 from .share_utils import generate_share_url, generate_kakao_share_message, generate_email_content
+from .qr_code import qr_png, qr_svg
 
 
 def render_share_options(plan):
@@ -378,14 +379,14 @@ def _render_qr_share(plan):
     """QR 코드 공유 렌더링"""
     share_url = generate_share_url(plan)
     if share_url:
-        qr_url = f"https://api.qrserver.com/v1/create-qr-code/?size=300x300&data={quote(share_url)}"
+        qr_image = qr_png(share_url)
         
         st.markdown("**📱 QR 코드로 공유하기:**")
         st.markdown("")
         
         col1, col2, col3 = st.columns([1, 2, 1])
         with col2:
-            st.image(qr_url, caption="QR 코드를 스캔하세요", width=280)
+            st.image(qr_image, caption="QR 코드를 스캔하세요", width=280)
         
         st.markdown("")
         
@@ -404,11 +405,23 @@ def _render_qr_share(plan):
         st.markdown("**🔗 공유 링크:**")
         st.code(share_url, language=None)
         
-        download_qr_url = f"https://api.qrserver.com/v1/create-qr-code/?size=500x500&format=png&data={quote(share_url)}"
-        
-        col1, col2, col3 = st.columns([1, 1, 1])
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button(
+                "📥 QR 코드 이미지 다운로드 (PNG)",
+                data=qr_image,
+                file_name="travel_plan_qr.png",
+                mime="image/png",
+                key="qr_download_png"
+            )
         with col2:
-            st.markdown(f"[📥 QR 코드 이미지 다운로드]({download_qr_url})")
+            st.download_button(
+                "📥 인쇄용 QR 코드 다운로드 (SVG)",
+                data=qr_svg(share_url),
+                file_name="travel_plan_qr.svg",
+                mime="image/svg+xml",
+                key="qr_download_svg"
+            )
         
         st.info("💡 **QR 코드를 스캔**하면 바로 여행 계획을 확인할 수 있습니다!")
 
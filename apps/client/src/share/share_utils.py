@@ -2,31 +2,96 @@
 공유 기능 관련 유틸리티 함수들
 """
 import json
-import base64
-from urllib.parse import quote
+from functools import lru_cache
+import requests
+from .share_codec import encode_plan, decode_plan, prune_plan
+from .plan_parser import normalize_plan
+
+APP_URL = "http://localhost:8501"
+SHARE_PAGE_URL = f"{APP_URL}/share"
+SHARE_API_URL = "http://localhost:8000/share"
+CALENDAR_FEED_URL = "http://localhost:8000/travel/plans/{plan_id}/calendar.ics"
+SHARE_API_TIMEOUT = 5
+SHARED_PLAN_CACHE_SIZE = 128
+# 서버 내보내기 형식: (확장자, 버튼 라벨)
+EXPORT_FORMATS = [
+    ("md", "📝 Markdown"),
+    ("html", "🌐 HTML"),
+    ("json", "🧾 JSON"),
+    ("docx", "📄 Word"),
+    ("ics", "📅 캘린더(.ics)")
+]
+
+
+@lru_cache(maxsize=SHARED_PLAN_CACHE_SIZE)
+def _register_shared_plan(payload):
+    """정규화된 계획 JSON을 서버에 저장하고 공유 ID 반환 (실패 시 예외, 캐시되지 않음)"""
+    response = requests.post(SHARE_API_URL, json={"plan": json.loads(payload)}, timeout=SHARE_API_TIMEOUT)
+    response.raise_for_status()
+    return response.json()["id"]
+
+
+@lru_cache(maxsize=SHARED_PLAN_CACHE_SIZE)
+def fetch_shared_plan(share_id):
+    """공유 ID로 서버에 저장된 계획 조회 (ID는 내용 해시라 변하지 않으므로 프로세스 내 캐시)"""
+    response = requests.get(f"{SHARE_API_URL}/{share_id}", timeout=SHARE_API_TIMEOUT)
+    response.raise_for_status()
+    return response.json()
+
+
+def _shared_plan_id(plan_data):
+    """여행 계획을 서버에 저장하고 공유 ID 반환 (같은 계획은 캐시된 ID 재사용, 실패 시 예외)"""
+    payload = json.dumps(prune_plan(plan_data), ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return _register_shared_plan(payload)
 
 
 def generate_share_url(plan_data):
-    """여행 계획 데이터를 URL로 인코딩"""
+    """여행 계획을 서버에 저장하고 정적 HTML 공유 URL 생성 (서버 저장 실패 시 압축 인코딩 URL)
+
+    정적 페이지는 API 서버가 저장된 계획으로 직접 렌더링하므로 공유 링크를 열 때마다 Streamlit 세션이 생기지 않음.
+    """
     if not plan_data:
         return None
     
-    json_str = json.dumps(plan_data, ensure_ascii=False)
-    encoded_data = base64.urlsafe_b64encode(json_str.encode('utf-8')).decode('utf-8')
-    
-    base_url = "http://localhost:8501/share"
-    share_url = f"{base_url}?plan={encoded_data}"
-    
-    return share_url
+    try:
+        return f"{SHARE_API_URL}/{_shared_plan_id(plan_data)}.html"
+    except (requests.RequestException, KeyError, ValueError) as e:
+        print(f"공유 계획 저장 실패, URL 인코딩 사용: {e}")
+        return f"{SHARE_PAGE_URL}?plan={encode_plan(plan_data)}"
+
+
+def generate_export_urls(plan_data):
+    """여행 계획 파일 내보내기 URL 목록 [(라벨, URL)] (변환은 API 서버가 스트리밍/캐시, 서버 저장 실패 시 빈 목록)"""
+    if not plan_data:
+        return []
+
+    try:
+        share_id = _shared_plan_id(plan_data)
+    except (requests.RequestException, KeyError, ValueError) as e:
+        print(f"공유 계획 저장 실패, 내보내기 불가: {e}")
+        return []
+    return [(label, f"{SHARE_API_URL}/{share_id}/export.{fmt}") for fmt, label in EXPORT_FORMATS]
+
+
+def generate_calendar_feed_url(plan_data):
+    """캘린더 앱 구독용 iCalendar 피드 URL (Google 로그인 없이 구독, 서버 저장 실패 시 None)"""
+    if not plan_data:
+        return None
+
+    try:
+        return CALENDAR_FEED_URL.format(plan_id=_shared_plan_id(plan_data))
+    except (requests.RequestException, KeyError, ValueError) as e:
+        print(f"공유 계획 저장 실패, 캘린더 구독 불가: {e}")
+        return None
 
 
 def decode_plan_from_url(query_params):
-    """URL 파라미터에서 여행 계획 데이터 디코딩"""
+    """URL 파라미터에서 여행 계획 데이터 로드 (공유 ID, 압축 인코딩, 이전 base64 JSON 링크 지원)"""
     try:
-        if 'plan' in query_params:
-            encoded_data = query_params['plan']
-            json_str = base64.urlsafe_b64decode(encoded_data.encode('utf-8')).decode('utf-8')
-            return json.loads(json_str)
+        if 'id' in query_params:
+            return fetch_shared_plan(query_params['id'])
+        elif 'plan' in query_params:
+            return decode_plan(query_params['plan'])
         else:
             return None
     except Exception as e:
@@ -35,31 +100,11 @@ def decode_plan_from_url(query_params):
 
 def generate_kakao_share_message(plan):
     """카카오톡 공유용 메시지 생성"""
-    if 'plan_data' in plan and isinstance(plan['plan_data'], dict):
-        plan_data = plan['plan_data']
-        if 'travel_overview' in plan_data:
-            overview = plan_data['travel_overview']
-            destination = overview.get('destination', '여행지 미정')
-            start_date = overview.get('start_date', '미정')
-            end_date = overview.get('end_date', '미정')
-            duration_days = overview.get('duration_days', 0)
-        else:
-            destination = '여행지 미정'
-            start_date = '미정'
-            end_date = '미정'
-            duration_days = 0
-    elif 'content' in plan and 'collected_info' in plan:
-        from .plan_parser import parse_plan_info
-        plan_info = parse_plan_info(plan)
-        destination = plan_info['destination']
-        start_date = plan_info['start_date']
-        end_date = plan_info['end_date']
-        duration_days = 1
-    else:
-        destination = plan.get('destination', '여행지 미정')
-        start_date = plan.get('travel_dates', {}).get('start', '미정')
-        end_date = plan.get('travel_dates', {}).get('end', '미정')
-        duration_days = len(plan.get('itinerary', []))
+    plan_info = normalize_plan(plan)
+    destination = plan_info.destination
+    start_date = plan_info.start_date
+    end_date = plan_info.end_date
+    duration_days = plan_info.duration_days
     
     if start_date != '미정' and end_date != '미정':
         date_display = f"{start_date} ~ {end_date}"
@@ -78,35 +123,12 @@ def generate_kakao_share_message(plan):
 
 def generate_email_content(plan):
     """이메일 전송용 내용 생성"""
-    if 'plan_data' in plan and isinstance(plan['plan_data'], dict):
-        plan_data = plan['plan_data']
-        if 'travel_overview' in plan_data:
-            overview = plan_data['travel_overview']
-            destination = overview.get('destination', '여행지 미정')
-            start_date = overview.get('start_date', '미정')
-            end_date = overview.get('end_date', '미정')
-            duration_days = overview.get('duration_days', 0)
-            summary = overview.get('summary', '')
-        else:
-            destination = '여행지 미정'
-            start_date = '미정'
-            end_date = '미정'
-            duration_days = 0
-            summary = ''
-    elif 'content' in plan and 'collected_info' in plan:
-        from .plan_parser import parse_plan_info
-        plan_info = parse_plan_info(plan)
-        destination = plan_info['destination']
-        start_date = plan_info['start_date']
-        end_date = plan_info['end_date']
-        duration_days = 1
-        summary = ''
-    else:
-        destination = plan.get('destination', '여행지 미정')
-        start_date = plan.get('travel_dates', {}).get('start', '미정')
-        end_date = plan.get('travel_dates', {}).get('end', '미정')
-        duration_days = len(plan.get('itinerary', []))
-        summary = ''
+    plan_info = normalize_plan(plan)
+    destination = plan_info.destination
+    start_date = plan_info.start_date
+    end_date = plan_info.end_date
+    duration_days = plan_info.duration_days
+    summary = plan_info.summary
     
     if start_date != '미정' and end_date != '미정':
         date_display = f"{start_date} ~ {end_date}"
@@ -0,0 +1,86 @@
+"""
+스트리밍 JSON 응답 증분 파싱
+"""
+import json
+
+
+class JSONStreamParser:
+    """청크를 한 번씩만 훑으며 최상위 배열(itinerary 등)의 완성된 원소를 반환하는 파서"""
+
+    def __init__(self, array_key="itinerary"):
+        self.array_key = array_key
+        self.text = ""
+        self.is_complete = False
+        self.is_parsed = False
+        self._parsed = None
+
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+        self._last_string = None
+        self._current_key = None
+        self._in_array = False
+        self._item_start = -1
+
+    def feed(self, chunk):
+        """청크를 추가하고 새로 완성된 배열 원소 목록 반환"""
+        self.text += chunk
+        text = self.text
+        completed = []
+
+        for i in range(self._pos, len(text)):
+            char = text[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_string = text[self._string_start + 1:i]
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = i
+            elif char == ":" and self._depth == 1:
+                self._current_key = self._last_string
+            elif char in "{[":
+                if self._in_array and self._depth == 2 and self._item_start < 0:
+                    self._item_start = i
+                if char == "[" and self._depth == 1 and self._current_key == self.array_key:
+                    self._in_array = True
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._in_array and self._depth == 2 and self._item_start >= 0:
+                    try:
+                        completed.append(json.loads(text[self._item_start:i + 1]))
+                    except json.JSONDecodeError:
+                        pass
+                    self._item_start = -1
+                elif self._in_array and self._depth == 1:
+                    self._in_array = False
+                elif self._depth == 0:
+                    self.is_complete = True
+            elif char == "," and self._depth == 1:
+                self._current_key = None
+
+        self._pos = len(text)
+        return completed
+
+    def parse(self):
+        """최상위 객체가 닫힌 뒤 전체 JSON을 한 번만 파싱 (실패 시 None, 이후 청크에서 다시 파싱하지 않음)"""
+        if not self.is_complete:
+            return None
+        if not self.is_parsed:
+            self.is_parsed = True
+            try:
+                self._parsed = json.loads(self.text.strip())
+            except json.JSONDecodeError:
+                self._parsed = None
+        return self._parsed
@@ -0,0 +1,28 @@
+"""
+Streamlit 페이지 스타일 주입
+"""
+import re
+from functools import lru_cache
+import streamlit as st
+
+CSS_COMMENT_REGEX = re.compile(r"/\*.*?\*/", re.DOTALL)
+CSS_SPACE_REGEX = re.compile(r"\s+")
+# 선택자의 후손 결합자(".a :hover")가 바뀌지 않도록 ':'는 뒤쪽 공백만 제거
+CSS_PUNCT_SPACE_REGEX = re.compile(r"\s*([{};,>])\s*|(:)\s+")
+
+
+@lru_cache(maxsize=None)
+def minify_css(stylesheet):
+    """<style> 블록의 주석과 불필요한 공백 제거 (스타일시트 상수별로 한 번만 계산)"""
+    text = CSS_COMMENT_REGEX.sub("", stylesheet)
+    text = CSS_SPACE_REGEX.sub(" ", text)
+    return CSS_PUNCT_SPACE_REGEX.sub(lambda m: m.group(1) or m.group(2), text).strip()
+
+
+def inject_styles(*stylesheets):
+    """여러 스타일시트를 압축된 블록 하나로 페이지에 주입
+
+    Streamlit은 매 실행마다 다시 그려지지 않은 요소를 지우므로 스크립트 실행마다 페이지 상단에서 한 번 호출하고,
+    카드/컴포넌트 렌더러는 스타일을 직접 내보내지 않음.
+    """
+    st.markdown("".join(dict.fromkeys(minify_css(sheet) for sheet in stylesheets)), unsafe_allow_html=True)
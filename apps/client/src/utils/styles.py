@@ -2,7 +2,8 @@
 Streamlit 앱에서 사용하는 CSS 스타일들
 """
 
-SHARE_PAGE_STYLES = """
+# 공유 페이지 CSS
+SHARE_PAGE_CSS = """
 <style>
     .trip-card {
         background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
@@ -96,43 +97,145 @@ SHARE_PAGE_STYLES = """
         background-color: var(--secondary-background-color);
     }
 </style>
+"""
 
-<script>
-function updateTheme() {
-    const stApp = document.querySelector('.stApp');
-    const isDark = window.matchMedia('(prefers-color-scheme: dark)').matches ||
-                   document.body.classList.contains('dark') ||
-                   stApp?.getAttribute('data-theme') === 'dark';
-    
-    const root = document.documentElement;
-    
-    if (isDark) {
-        root.style.setProperty('--background-color', '#2d2d2d');
-        root.style.setProperty('--secondary-background-color', '#3d3d3d');
-        root.style.setProperty('--text-color', '#ffffff');
-        root.style.setProperty('--border-color', '#4d4d4d');
-        root.style.setProperty('--muted-text-color', '#cccccc');
-        root.style.setProperty('--light-text-color', '#aaaaaa');
-    } else {
-        root.style.setProperty('--background-color', '#ffffff');
-        root.style.setProperty('--secondary-background-color', '#f8f9fa');
-        root.style.setProperty('--text-color', '#000000');
-        root.style.setProperty('--border-color', '#e0e0e0');
-        root.style.setProperty('--muted-text-color', '#666666');
-        root.style.setProperty('--light-text-color', '#888888');
-    }
-}
-
-document.addEventListener('DOMContentLoaded', updateTheme);
-window.matchMedia('(prefers-color-scheme: dark)').addEventListener('change', updateTheme);
-
-const observer = new MutationObserver(updateTheme);
-observer.observe(document.body, { 
-    attributes: true, 
-    attributeFilter: ['class', 'data-theme'],
-    subtree: true 
-});
+# 메인 페이지 카드형 버튼
+HOME_PAGE_CSS = """
+<style>
+    .stButton > button {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        color: white;
+        border: none;
+        border-radius: 15px;
+        padding: 30px;
+        width: 100%;
+        height: auto;
+        min-height: 200px;
+        font-size: 16px;
+        font-weight: 600;
+        cursor: pointer;
+        transition: transform 0.3s ease, box-shadow 0.3s ease;
+        text-align: left;
+        white-space: pre-line;
+    }
+    .stButton > button:hover {
+        transform: translateY(-5px);
+        box-shadow: 0 10px 25px rgba(0,0,0,0.2);
+        background: linear-gradient(135deg, #5a6fd8 0%, #6a4c93 100%);
+    }
+    .stButton > button:focus {
+        outline: none;
+        box-shadow: 0 10px 25px rgba(0,0,0,0.2);
+    }
+    .stButton > button:active {
+        transform: translateY(-2px);
+    }
+    /* 버튼 내부 텍스트 스타일링 */
+    .stButton > button p {
+        margin: 0;
+        color: white;
+    }
+</style>
+"""
 
-setTimeout(updateTheme, 100);
-</script>
-""" 
\ No newline at end of file
+# 채팅 페이지 JSON 계획 카드 (카드마다 인라인 스타일 대신 클래스 사용)
+PLAN_CARD_CSS = """
+<style>
+    :root {
+        --card-bg-color: #ffffff;
+        --card-text-color: #000000;
+        --card-border-color: #e0e0e0;
+        --day-card-bg: #f8f9fa;
+        --activity-card-bg: #ffffff;
+        --location-text-color: #666666;
+        --description-text-color: #888888;
+    }
+    
+    @media (prefers-color-scheme: dark) {
+        :root {
+            --card-bg-color: #2d2d2d;
+            --card-text-color: #ffffff;
+            --card-border-color: #4d4d4d;
+            --day-card-bg: #3d3d3d;
+            --activity-card-bg: #2d2d2d;
+            --location-text-color: #cccccc;
+            --description-text-color: #aaaaaa;
+        }
+    }
+    
+    .stApp[data-theme="dark"] {
+        --card-bg-color: #2d2d2d;
+        --card-text-color: #ffffff;
+        --card-border-color: #4d4d4d;
+        --day-card-bg: #3d3d3d;
+        --activity-card-bg: #2d2d2d;
+        --location-text-color: #cccccc;
+        --description-text-color: #aaaaaa;
+    }
+    
+    .stApp[data-theme="light"] {
+        --card-bg-color: #ffffff;
+        --card-text-color: #000000;
+        --card-border-color: #e0e0e0;
+        --day-card-bg: #f8f9fa;
+        --activity-card-bg: #ffffff;
+        --location-text-color: #666666;
+        --description-text-color: #888888;
+    }
+    
+    .plan-overview {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        padding: 20px;
+        border-radius: 15px;
+        color: white;
+        margin: 10px 0;
+    }
+    
+    .plan-overview-rows {
+        margin-top: 20px;
+    }
+    
+    .plan-overview-rows div {
+        margin-bottom: 12px;
+        font-size: 16px;
+    }
+    
+    .plan-day {
+        background: var(--day-card-bg);
+        color: var(--card-text-color);
+        padding: 15px;
+        border-radius: 10px;
+        margin: 10px 0;
+        border-left: 4px solid #667eea;
+    }
+    
+    .plan-activity {
+        background: var(--activity-card-bg);
+        color: var(--card-text-color);
+        padding: 12px;
+        border-radius: 8px;
+        margin: 8px 0;
+        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        border: 1px solid var(--card-border-color);
+    }
+    
+    .plan-activity-time {
+        margin-bottom: 2px;
+    }
+    
+    .plan-activity-title {
+        margin-bottom: 4px;
+    }
+    
+    .plan-activity-location {
+        color: var(--location-text-color);
+        font-size: 14px;
+        margin-bottom: 4px;
+    }
+    
+    .plan-activity-description {
+        font-size: 13px;
+        color: var(--description-text-color);
+    }
+</style>
+"""
@@ -0,0 +1,36 @@
+import sys
+import time
+from typing import Dict
+
+from src.agents.travel.calendar.parser import extract_travel_info
+
+def generate_sample_plan(days: int, with_period: bool = True) -> str:
+    """벤치마크용 텍스트 계획 생성 (시간대별 활동 줄 포함, with_period=False면 '기간:' 줄 없이 날짜 토큰 검색)"""
+    lines = ["# 여행 계획", "목적지: 제주도", "주요 일정 개요: 자연과 맛집 중심"]
+    if with_period:
+        lines.insert(2, f"기간: 2025년 6월 1일(일)부터 2025년 6월 {min(28, days)}일")
+    for day in range(1, days + 1):
+        lines.append(f"## 2025년 6월 {min(day, 28)}일")
+        for hour in range(8, 22):
+            lines.append(f"- {hour}:00 - 관광지 방문 {day}-{hour} 카페 휴식 및 산책 해변 드라이브")
+    return "\n".join(lines)
+
+def benchmark_extract_travel_info(repeat: int = 200) -> Dict[str, float]:
+    """텍스트 계획의 extract_travel_info 평균 시간(ms) - 기간 줄 유무, 계획 표식이 없는 긴 텍스트"""
+    cases = {
+        "60일, 기간 줄 있음": generate_sample_plan(60),
+        "60일, 기간 줄 없음": generate_sample_plan(60, with_period=False),
+        "계획 표식 없는 텍스트": "그냥 텍스트 " * 20000
+    }
+    results = {}
+    for name, content in cases.items():
+        started = time.perf_counter()
+        for _ in range(repeat):
+            extract_travel_info({"content": content})
+        results[f"{name} ({len(content.encode('utf-8')) // 1024}KB)"] = round((time.perf_counter() - started) / repeat * 1000, 3)
+    return results
+
+if __name__ == "__main__":
+    # 사용법 (apps/llm에서): python -m bench.calendar_parser_bench [반복 횟수]
+    for name, avg_ms in benchmark_extract_travel_info(int(sys.argv[1]) if len(sys.argv) > 1 else 200).items():
+        print(f"{name}: {avg_ms}ms")
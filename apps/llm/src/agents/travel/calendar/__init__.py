@@ -10,6 +10,7 @@ from .parser import (
 from .actions import (
     register_travel_calendar,
     create_travel_calendar_events,
+    create_calendar_subscription,
     view_travel_calendar,
     get_travel_events,
     get_upcoming_travel_events,
@@ -27,6 +28,10 @@ from .handlers import (
 
 from .utils import (
     parse_user_event_selection,
+    parse_strict_event_selection,
+    parse_calendar_command,
+    parse_confirmation,
+    parse_modification_request,
     understand_modification_request,
     format_modification_summary
 )
@@ -36,7 +41,10 @@ __all__ = [
     'view_travel_calendar', 
     'handle_calendar_modification',
     'handle_calendar_deletion',
+    'parse_calendar_command',
+    'parse_modification_request',
     'create_travel_calendar_events',
+    'create_calendar_subscription',
     'get_travel_events',
     'get_upcoming_travel_events',
     'search_travel_by_destination',
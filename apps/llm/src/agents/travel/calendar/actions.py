@@ -6,7 +6,12 @@ from ....utils.calendar_service import (
     search_events_by_keyword,
     get_upcoming_events
 )
+from ....config import get_settings
+from ....utils.share_store import get_share_store, prune_plan
 from .parser import extract_travel_info, extract_destination_from_summary, classify_travel_type
+from .utils import CALENDAR_LISTING_MARKER
+
+CALENDAR_FEED_PATH = "/travel/plans/{plan_id}/calendar.ics"
 
 def register_travel_calendar(plan_data: Dict) -> Dict:
     """여행 계획을 Google Calendar에 등록 (state handler용)"""
@@ -55,6 +60,24 @@ def create_travel_calendar_events(plan_data: Dict) -> Dict:
             "events_count": 0
         }
 
+def create_calendar_subscription(plan_data: Dict) -> Dict:
+    """여행 계획 iCalendar 구독 URL 생성 (Google API 호출 없이 계획을 저장하고 피드 URL 반환)"""
+    try:
+        # 공유 링크와 같은 형태로 저장해 같은 계획이 같은 ID를 받도록 함 (이전 계획, patch 등 제외)
+        plan_id = get_share_store().save(prune_plan(plan_data))
+    except Exception as e:
+        print(f"캘린더 구독용 계획 저장 실패: {e}")
+        return {"success": False, "message": f"캘린더 구독 URL 생성 중 오류 발생: {str(e)}"}
+
+    feed_url = get_settings().public_api_url.rstrip("/") + CALENDAR_FEED_PATH.format(plan_id=plan_id)
+    return {
+        "success": True,
+        "plan_id": plan_id,
+        "feed_url": feed_url,
+        # 캘린더 앱이 링크를 열면 바로 구독 화면으로 연결되는 주소
+        "webcal_url": "webcal://" + feed_url.split("://", 1)[-1]
+    }
+
 def view_travel_calendar(messages: List, conversation_state: Dict) -> Dict:
     """Google Calendar에서 여행 일정 조회"""
     try:
@@ -108,7 +131,7 @@ def view_travel_calendar(messages: List, conversation_state: Dict) -> Dict:
                 
                 message = f"""{query_type} 조회 결과입니다:
 
-**총 {total_count}개의 일정을 찾았습니다.**
+**총 {total_count}{CALENDAR_LISTING_MARKER}.**
 
 {events_text}
 
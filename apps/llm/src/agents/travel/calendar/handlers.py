@@ -9,6 +9,7 @@ from ....utils.calendar_service import (
 from .actions import view_travel_calendar
 from .utils import (
     parse_user_event_selection,
+    parse_confirmation,
     understand_modification_request,
     format_modification_summary
 )
@@ -382,15 +383,11 @@ def handle_calendar_deletion(messages: List, conversation_state: Dict, calendar_
     
     elif current_step == "confirm_deletion":
         if selected_event and last_user_message:
-            confirmation_keywords = ["네", "예", "삭제", "확인", "맞습니다", "그래요", "맞아요", "삭제해줘", "지워줘"]
-            cancellation_keywords = ["아니요", "취소", "안 해요", "그만", "아니"]
+            confirmation = parse_confirmation(last_user_message)
             
-            message_lower = last_user_message.lower().strip()
+            print(f"DEBUG: 사용자 메시지 = '{last_user_message}', 확인 여부 = {confirmation}")
             
-            print(f"DEBUG: 사용자 메시지 = '{last_user_message}', 소문자 = '{message_lower}'")
-            print(f"DEBUG: 확인 키워드 체크 = {[keyword for keyword in confirmation_keywords if keyword in message_lower]}")
-            
-            if any(keyword in message_lower for keyword in confirmation_keywords):
+            if confirmation is True:
                 event_id = selected_event.get("id")
                 print(f"DEBUG: 삭제 실행 중... event_id = {event_id}")
                 
@@ -411,7 +408,7 @@ def handle_calendar_deletion(messages: List, conversation_state: Dict, calendar_
                     }
                 }
             
-            elif any(keyword in message_lower for keyword in cancellation_keywords):
+            elif confirmation is False:
                 return {
                     "success": True,
                     "message": "일정 삭제가 취소되었습니다.",
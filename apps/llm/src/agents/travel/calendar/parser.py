@@ -1,74 +1,178 @@
 from datetime import datetime, timedelta
 import re
 from typing import Dict, Optional, Tuple
+from ....models.plan import NormalizedPlan, PLAN_FORMAT_JSON
 
 DEFAULT_TRAVEL_DAYS = 3
 
-DATE_PATTERN = r'(\d{4})년\s*(\d{1,2})월\s*(\d{1,2})일'
 PERIOD_PATTERN = r'기간[:\s]*(\d{4})년\s*(\d{1,2})월\s*(\d{1,2})일.*?부터\s*(\d{4})년\s*(\d{1,2})월\s*(\d{1,2})일'
-DESTINATION_PATTERN = r'목적지[:\s]*([\w\s]+)'
 OVERVIEW_PATTERN = r'주요 일정 개요[:\s]*(.*?)(?=\n|$)'
 
-def parse_travel_dates(plan_content: str) -> Tuple[Optional[datetime], Optional[datetime]]:
-    """여행 계획에서 시작일과 종료일 추출"""
-    start_date = None
-    end_date = None
+# 등록 시마다 재컴파일하지 않도록 미리 컴파일한 패턴
+PERIOD_REGEX = re.compile(PERIOD_PATTERN)
+DESTINATION_REGEX = re.compile(r'목적지[:\s]*([\w \t]+)')
+OVERVIEW_REGEX = re.compile(OVERVIEW_PATTERN)
+
+# 절대 날짜(2024년 6월 1일)와 상대 일수(3일 후)를 숫자 위치에서 한 번에 토큰화.
+# 패턴이 문자 클래스로 시작해야 re 엔진이 후보가 아닌 위치를 빠르게 건너뛴다.
+DATE_TOKEN_REGEX = re.compile(r'([0-9][0-9]{0,3})(?:년\s*([0-9]{1,2})월\s*([0-9]{1,2})일|일\s*[후뒤])')
+RELATIVE_KEYWORD_REGEX = re.compile(r'([오내모글이다])(늘|일|레|피|번|음|다음)(?:\s*주\s*([월화수목금토일])요일)?')
+
+RELATIVE_DAY_OFFSETS = {"오늘": 0, "내일": 1, "모레": 2, "글피": 3}
+RELATIVE_WEEK_OFFSETS = {"이번": 0, "다음": 1, "다다음": 2}
+WEEKDAYS = "월화수목금토일"
+
+TRAVEL_TYPE_KEYWORDS = [
+    ("해외여행", ("해외", "국외", "international", "overseas")),
+    ("국내여행", ("국내", "domestic", "한국")),
+    ("출장", ("출장", "business", "회사")),
+    ("휴가", ("휴가", "vacation", "휴식"))
+]
+
+SUMMARY_DESTINATION_REGEXES = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (r'(.+?)\s*여행', r'(.+?)\s*-\s*', r'(.+?)\s*trip', r'(.+?)\s*투어')
+]
+
+def _to_datetime(parts: Tuple[int, int, int]) -> Optional[datetime]:
+    """(연, 월, 일) 튜플을 datetime으로 변환 (잘못된 날짜는 None)"""
+    try:
+        return datetime(*parts)
+    except ValueError:
+        return None
+
+def _start_of_day(value: datetime) -> datetime:
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+def _resolve_relative_keyword(match: re.Match, base_date: datetime) -> Optional[datetime]:
+    """상대 날짜 표현(내일, 다음 주 토요일 등)을 절대 날짜로 변환 (해당 없으면 None)"""
+    keyword = match.group(1) + match.group(2)
+    weekday = match.group(3)
+    base = _start_of_day(base_date)
+    
+    if keyword in RELATIVE_DAY_OFFSETS and not weekday:
+        return base + timedelta(days=RELATIVE_DAY_OFFSETS[keyword])
+    
+    if keyword in RELATIVE_WEEK_OFFSETS and weekday:
+        week_start = base - timedelta(days=base.weekday())
+        return week_start + timedelta(weeks=RELATIVE_WEEK_OFFSETS[keyword], days=WEEKDAYS.index(weekday))
+    
+    return None
+
+def scan_plan_content(plan_content: str, base_date: Optional[datetime] = None) -> Dict:
+    """여행 계획 텍스트에서 기간, 날짜, 목적지, 개요를 한 번에 추출
+    
+    날짜는 숫자 위치에서만 시작하는 토큰 패턴으로 한 번만 훑으며,
+    유효한 기간 표현이 있으면 날짜 토큰화 자체를 생략합니다.
+    상대 날짜 키워드(내일, 다음 주 토요일 등)는 절대 날짜가 부족할 때만 찾습니다.
     
-    period_match = re.search(PERIOD_PATTERN, plan_content)
+    Returns:
+        Dict: {
+            "period": 기간 표현의 ((연, 월, 일), (연, 월, 일)) 또는 None,
+            "dates": 등장 순서대로의 (연, 월, 일) 목록,
+            "relative_dates": 상대 날짜 표현을 변환한 datetime 목록,
+            "destination": 목적지 또는 None,
+            "overview": 주요 일정 개요 또는 None
+        }
+    """
+    base_date = base_date or datetime.now()
+    
+    destination_match = DESTINATION_REGEX.search(plan_content)
+    overview_match = OVERVIEW_REGEX.search(plan_content)
+    result = {
+        "period": None,
+        "dates": [],
+        "relative_dates": [],
+        "destination": destination_match.group(1).strip() if destination_match else None,
+        "overview": overview_match.group(1).strip() if overview_match else None
+    }
+    
+    period_match = PERIOD_REGEX.search(plan_content)
     if period_match:
-        start_year, start_month, start_day, end_year, end_month, end_day = map(int, period_match.groups())
-        try:
-            start_date = datetime(start_year, start_month, start_day)
-            end_date = datetime(end_year, end_month, end_day)
+        values = tuple(map(int, period_match.groups()))
+        result["period"] = (values[:3], values[3:])
+        if _to_datetime(values[:3]) and _to_datetime(values[3:]):
+            return result
+    
+    relative_dates = []
+    for match in DATE_TOKEN_REGEX.finditer(plan_content):
+        number, month, day = match.groups()
+        if month is not None:
+            if len(number) == 4:
+                result["dates"].append((int(number), int(month), int(day)))
+        elif len(number) <= 3:
+            relative_dates.append((match.start(), _start_of_day(base_date) + timedelta(days=int(number))))
+    
+    if len(result["dates"]) < 2:
+        for match in RELATIVE_KEYWORD_REGEX.finditer(plan_content):
+            if resolved := _resolve_relative_keyword(match, base_date):
+                relative_dates.append((match.start(), resolved))
+        relative_dates.sort(key=lambda item: item[0])
+    
+    result["relative_dates"] = [resolved for _, resolved in relative_dates]
+    return result
+
+def find_travel_dates(scan_result: Dict, include_relative: bool = True) -> Optional[Tuple[datetime, datetime]]:
+    """스캔 결과에서 시작일과 종료일 찾기 (기간 > 절대 날짜 > 상대 날짜 순, 날짜가 없으면 None)"""
+    if period := scan_result.get("period"):
+        start_date, end_date = _to_datetime(period[0]), _to_datetime(period[1])
+        if start_date and end_date:
             return start_date, end_date
-        except ValueError:
-            pass
-    
-    date_matches = re.findall(DATE_PATTERN, plan_content)
-    if date_matches and len(date_matches) >= 2:
-        try:
-            start_year, start_month, start_day = map(int, date_matches[0])
-            end_year, end_month, end_day = map(int, date_matches[-1])
-            start_date = datetime(start_year, start_month, start_day)
-            end_date = datetime(end_year, end_month, end_day)
+    
+    dates = scan_result.get("dates", [])
+    if len(dates) >= 2:
+        start_date, end_date = _to_datetime(dates[0]), _to_datetime(dates[-1])
+        if start_date and end_date:
             return start_date, end_date
-        except ValueError:
-            pass
+    
+    relative_dates = scan_result.get("relative_dates", [])
+    if include_relative and len(relative_dates) >= 2:
+        return relative_dates[0], relative_dates[-1]
+    
+    return None
+
+def resolve_travel_dates(scan_result: Dict) -> Tuple[datetime, datetime]:
+    """스캔 결과에서 시작일과 종료일 결정 (날짜가 없으면 오늘부터 기본 일수)"""
+    if travel_dates := find_travel_dates(scan_result):
+        return travel_dates
     
     start_date = datetime.now()
     end_date = start_date + timedelta(days=DEFAULT_TRAVEL_DAYS)
     return start_date, end_date
 
+def _format_event_summary(destination: str, overview: Optional[str]) -> str:
+    """목적지와 개요로 이벤트 제목 구성"""
+    if overview is not None:
+        return f"{destination} - {overview}"
+    return f"{destination} 여행"
+
+def parse_travel_dates(plan_content: str) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """여행 계획에서 시작일과 종료일 추출"""
+    return resolve_travel_dates(scan_plan_content(plan_content))
+
 def extract_destination(plan_content: str) -> str:
     """여행 계획에서 목적지 추출"""
-    destination = "여행"
-    destination_match = re.search(DESTINATION_PATTERN, plan_content)
-    if destination_match:
-        destination = destination_match.group(1).strip()
-    return destination
+    destination_match = DESTINATION_REGEX.search(plan_content)
+    return destination_match.group(1).strip() if destination_match else "여행"
 
 def create_travel_event_summary(destination: str, plan_content: str) -> str:
     """여행 이벤트 요약 생성"""
-    summary = f"{destination} 여행"
-    overview_match = re.search(OVERVIEW_PATTERN, plan_content)
-    if overview_match:
-        summary = f"{destination} - {overview_match.group(1).strip()}"
-    return summary
+    overview_match = OVERVIEW_REGEX.search(plan_content)
+    return _format_event_summary(destination, overview_match.group(1).strip() if overview_match else None)
 
 def extract_travel_info(plan_data: Dict) -> Dict:
     """여행 계획에서 기본 정보 추출"""
+    plan = NormalizedPlan.from_raw(plan_data)
+    
     # JSON 형식 계획 처리
-    if plan_data.get("plan_data"):
-        json_plan = plan_data["plan_data"]
-        
+    if plan and plan.format == PLAN_FORMAT_JSON:
         # travel_overview에서 기본 정보 추출
-        if "travel_overview" in json_plan:
-            overview = json_plan["travel_overview"]
-            destination = overview.get("destination", "여행")
+        if "travel_overview" in plan.plan_data:
+            destination = plan.destination or "여행"
             
             # 날짜 정보 추출
-            start_date_str = overview.get("start_date")
-            end_date_str = overview.get("end_date")
+            start_date_str = plan.start_date
+            end_date_str = plan.end_date
             
             start_date = None
             end_date = None
@@ -91,7 +195,7 @@ def extract_travel_info(plan_data: Dict) -> Dict:
             if not end_date:
                 end_date = start_date + timedelta(days=DEFAULT_TRAVEL_DAYS)
             
-            summary = overview.get("summary", f"{destination} 여행")
+            summary = plan.summary or f"{destination} 여행"
             
             return {
                 "destination": destination,
@@ -102,11 +206,12 @@ def extract_travel_info(plan_data: Dict) -> Dict:
             }
     
     # 기존 텍스트 형식 계획 처리 (하위 호환성)
-    plan_content = plan_data.get("content", "")
+    plan_content = plan.content if plan else ""
     
-    destination = extract_destination(plan_content)
-    start_date, end_date = parse_travel_dates(plan_content)
-    summary = create_travel_event_summary(destination, plan_content)
+    scan_result = scan_plan_content(plan_content)
+    destination = scan_result["destination"] or "여행"
+    start_date, end_date = resolve_travel_dates(scan_result)
+    summary = _format_event_summary(destination, scan_result["overview"])
     
     return {
         "destination": destination,
@@ -118,15 +223,8 @@ def extract_travel_info(plan_data: Dict) -> Dict:
 
 def extract_destination_from_summary(summary: str) -> str:
     """이벤트 제목에서 목적지 추출"""
-    patterns = [
-        r'(.+?)\s*여행',
-        r'(.+?)\s*-\s*',
-        r'(.+?)\s*trip',
-        r'(.+?)\s*투어'
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, summary, re.IGNORECASE)
+    for pattern in SUMMARY_DESTINATION_REGEXES:
+        match = pattern.search(summary)
         if match:
             return match.group(1).strip()
     
@@ -136,13 +234,8 @@ def classify_travel_type(summary: str, description: str) -> str:
     """여행 유형 분류"""
     content = f"{summary} {description}".lower()
     
-    if any(keyword in content for keyword in ["해외", "국외", "international", "overseas"]):
-        return "해외여행"
-    elif any(keyword in content for keyword in ["국내", "domestic", "한국"]):
-        return "국내여행"
-    elif any(keyword in content for keyword in ["출장", "business", "회사"]):
-        return "출장"
-    elif any(keyword in content for keyword in ["휴가", "vacation", "휴식"]):
-        return "휴가"
-    else:
-        return "일반여행" 
\ No newline at end of file
+    for travel_type, keywords in TRAVEL_TYPE_KEYWORDS:
+        if any(keyword in content for keyword in keywords):
+            return travel_type
+    
+    return "일반여행"
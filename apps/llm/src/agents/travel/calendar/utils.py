@@ -1,8 +1,46 @@
 import re
-from typing import Optional, Dict
-from datetime import datetime
-from langchain_core.messages import SystemMessage
-import json
+from typing import Optional, Dict, Tuple
+from datetime import datetime, timedelta
+from langchain_core.messages import HumanMessage
+from ..prompts import get_prompt
+from ....utils.llm_router import route_llm, TASK_EXTRACT
+from ....utils.prompt_registry import get_prompt_registry
+from ....utils.structured_output import invoke_json_schema
+
+CALENDAR_KEYWORDS = ("캘린더", "달력")
+PLAN_KEYWORDS = ("계획", "일차", "플랜")
+MODIFY_KEYWORDS = ("수정", "변경", "바꿔", "바꾸", "고쳐", "옮겨", "미뤄", "당겨")
+DELETE_KEYWORDS = ("삭제", "지워", "지우", "없애")
+CONFIRMATION_KEYWORDS = ("네", "예", "삭제", "확인", "맞습니다", "그래요", "맞아요", "삭제해줘", "지워줘")
+CANCELLATION_KEYWORDS = ("아니요", "취소", "안 해요", "그만", "아니")
+# 캘린더 조회 응답(view_travel_calendar)의 목록 문구 - 직전 응답이 일정 목록일 때만 "2번"을 캘린더 일정 번호로 해석
+CALENDAR_LISTING_MARKER = "개의 일정을 찾았습니다"
+
+# "2번", "첫번째"는 인식하되 여행 계획의 "2번째 날"은 제외
+STRICT_ORDINAL_REGEX = re.compile(r'(?:([0-9]+)\s*번|(첫|두|세|네|다섯)\s*번\s*(?=째))(?:\s*째)?(?!\s*째?\s*날(?!짜))')
+ORDINAL_WORDS = {"첫": 1, "두": 2, "세": 3, "네": 4, "다섯": 5}
+DATE_RANGE_REGEX = re.compile(
+    r'(?:([0-9]{4})년\s*)?([0-9]{1,2})월\s*([0-9]{1,2})일?\s*(?:부터|~|-|에서)\s*'
+    r'(?:(?:([0-9]{4})년\s*)?([0-9]{1,2})월\s*)?([0-9]{1,2})일'
+)
+SINGLE_DATE_REGEX = re.compile(r'(?:([0-9]{4})년\s*)?([0-9]{1,2})월\s*([0-9]{1,2})일')
+TITLE_EDIT_REGEX = re.compile(r'(?:제목|이름)(?:을|를|은|는)?\s*["\'“]?(.+?)["\'”]?\s*(?:으로|로)\s*(?:바꿔|바꾸|변경|수정)')
+# 규칙 기반으로 확실히 해석할 수 없는 표현 (LLM으로 넘김)
+AMBIGUOUS_EDIT_REGEX = re.compile(
+    r'설명|오늘|내일|모레|주말|(?:이번|다음)\s*(?:주|달)|월\s*[초말]|[0-9]+\s*(?:일\s*(?:후|뒤|간|동안)|박)'
+)
+LOCATION_EDIT_REGEX = re.compile(r'(?:장소|위치|지역)(?:를|을|은|는)?\s*["\'“]?(.+?)["\'”]?\s*(?:으로|로)\s*(?:바꿔|바꾸|변경|수정)')
+
+MODIFICATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": ["string", "null"]},
+        "start_date": {"type": ["string", "null"], "description": "YYYY-MM-DD"},
+        "end_date": {"type": ["string", "null"], "description": "YYYY-MM-DD"},
+        "location": {"type": ["string", "null"]},
+        "description": {"type": ["string", "null"]}
+    }
+}
 
 def parse_user_event_selection(message: str) -> Optional[int]:
     """사용자 메시지에서 이벤트 번호 추출"""
@@ -29,8 +67,147 @@ def parse_user_event_selection(message: str) -> Optional[int]:
     
     return None
 
+def parse_strict_event_selection(message: str) -> Optional[int]:
+    """"2번", "첫번째"처럼 명시적인 서수 표현만 이벤트 번호로 인식"""
+    match = STRICT_ORDINAL_REGEX.search(message)
+    if not match:
+        return None
+    if match.group(1):
+        return int(match.group(1))
+    return ORDINAL_WORDS[match.group(2)]
+
+def parse_calendar_command(message: str, previous_message: Optional[str] = None) -> Optional[str]:
+    """캘린더 수정/삭제 요청을 규칙 기반으로 판별
+    
+    메시지에 캘린더/달력이 있거나, 직전 AI 응답이 캘린더 일정 목록이고 "2번" 같은 서수가 있을 때만
+    수정/삭제 동사와 함께 "modify" 또는 "delete"를 반환합니다. 그 외("2번 장소 바꿔줘" 같은 계획 수정)는 None.
+    """
+    if any(keyword in message for keyword in PLAN_KEYWORDS):
+        return None
+    
+    mentions_calendar = any(keyword in message for keyword in CALENDAR_KEYWORDS)
+    selects_listed_event = (
+        previous_message is not None
+        and CALENDAR_LISTING_MARKER in previous_message
+        and parse_strict_event_selection(message) is not None
+    )
+    if not (mentions_calendar or selects_listed_event):
+        return None
+    
+    wants_delete = any(keyword in message for keyword in DELETE_KEYWORDS)
+    wants_modify = any(keyword in message for keyword in MODIFY_KEYWORDS)
+    
+    if wants_delete and not wants_modify:
+        return "delete"
+    if wants_modify and not wants_delete:
+        return "modify"
+    return None
+
+def parse_confirmation(message: str) -> Optional[bool]:
+    """확인(True)/취소(False) 응답 판별 (판별 불가 시 None)
+    
+    "삭제 취소해줘"가 삭제로 처리되지 않도록 취소 키워드를 먼저 확인합니다.
+    """
+    normalized = message.lower().strip()
+    
+    if any(keyword in normalized for keyword in CANCELLATION_KEYWORDS):
+        return False
+    if any(keyword in normalized for keyword in CONFIRMATION_KEYWORDS):
+        return True
+    return None
+
+def _parse_event_date(value: str) -> Optional[datetime]:
+    """캘린더 이벤트의 date/dateTime 문자열에서 날짜 추출"""
+    try:
+        return datetime.strptime(value[:10], "%Y-%m-%d")
+    except (TypeError, ValueError):
+        return None
+
+def _resolve_date(year: Optional[str], month: str, day: str, today: datetime) -> Optional[datetime]:
+    """연도가 없으면 오늘 이후의 가장 가까운 날짜로 해석"""
+    try:
+        if year:
+            return datetime(int(year), int(month), int(day))
+        resolved = datetime(today.year, int(month), int(day))
+        if resolved.date() < today.date():
+            resolved = datetime(today.year + 1, int(month), int(day))
+        return resolved
+    except ValueError:
+        return None
+
+def _parse_date_edit(message: str, existing_event: Optional[Dict], today: datetime) -> Tuple[bool, Dict]:
+    """메시지의 날짜 변경 내용 추출
+    
+    Returns:
+        Tuple[bool, Dict]: (해석 성공 여부, 날짜 변경 내용). 날짜 언급이 없으면 (True, {})
+    """
+    range_match = DATE_RANGE_REGEX.search(message)
+    if range_match:
+        start_year, start_month, start_day, end_year, end_month, end_day = range_match.groups()
+        start_date = _resolve_date(start_year, start_month, start_day, today)
+        if not start_date:
+            return False, {}
+        end_date = _resolve_date(end_year or str(start_date.year), end_month or start_month, end_day, today)
+        if end_date and end_date < start_date and not end_year:
+            end_date = _resolve_date(str(start_date.year + 1), end_month or start_month, end_day, today)
+        if not end_date or end_date < start_date:
+            return False, {}
+        return True, {"start_date": start_date.strftime("%Y-%m-%d"), "end_date": end_date.strftime("%Y-%m-%d")}
+    
+    single_matches = SINGLE_DATE_REGEX.findall(message)
+    if not single_matches:
+        return True, {}
+    if len(single_matches) > 1:
+        return False, {}
+    
+    start_date = _resolve_date(*single_matches[0], today)
+    if not start_date or not existing_event:
+        return False, {}
+    
+    # 기존 일정 길이를 유지 (종일 이벤트의 end는 다음 날 0시이므로 하루를 뺀다)
+    old_start = _parse_event_date(existing_event.get("start", ""))
+    old_end = _parse_event_date(existing_event.get("end", ""))
+    if not old_start or not old_end:
+        return False, {}
+    duration = max((old_end - old_start).days - 1, 0)
+    end_date = start_date + timedelta(days=duration)
+    return True, {"start_date": start_date.strftime("%Y-%m-%d"), "end_date": end_date.strftime("%Y-%m-%d")}
+
+def parse_modification_request(message: str, existing_event: Dict = None, today: datetime = None) -> Optional[Dict]:
+    """규칙 기반으로 수정 내용 추출
+    
+    날짜("6월 3일로", "6월 10일~13일"), 제목, 장소 변경을 처리하며
+    확실하게 해석할 수 없는 메시지는 None을 반환하여 LLM 분석으로 넘깁니다.
+    """
+    today = today or datetime.now()
+    
+    if AMBIGUOUS_EDIT_REGEX.search(message):
+        return None
+    
+    modifications = {}
+    
+    if title_match := TITLE_EDIT_REGEX.search(message):
+        modifications["summary"] = title_match.group(1).strip()
+    if location_match := LOCATION_EDIT_REGEX.search(message):
+        modifications["location"] = location_match.group(1).strip()
+    
+    date_text = message
+    for match in (title_match, location_match):
+        if match:
+            date_text = date_text.replace(match.group(0), " ")
+    
+    date_ok, date_changes = _parse_date_edit(date_text, existing_event, today)
+    if not date_ok:
+        return None
+    modifications.update(date_changes)
+    
+    return modifications or None
+
 def understand_modification_request(message: str, llm, existing_event: Dict = None) -> Optional[Dict]:
-    """LLM을 사용하여 사용자 메시지에서 수정 내용 추출"""
+    """사용자 메시지에서 수정 내용 추출 (규칙 기반으로 해석할 수 없을 때만 LLM 사용)"""
+    if modifications := parse_modification_request(message, existing_event):
+        return modifications
+    
     current_date = datetime.now()
     
     existing_info = ""
@@ -44,51 +221,24 @@ def understand_modification_request(message: str, llm, existing_event: Dict = No
 - 설명: {existing_event.get('description', '')}
 """
     
-    system_prompt = f"""사용자가 캘린더 일정을 수정하려고 합니다. 사용자의 메시지에서 수정하려는 내용을 분석해주세요.
-
-{existing_info}
-
-현재 날짜: {current_date.strftime('%Y년 %m월 %d일')}
-
-사용자 메시지: "{message}"
-
-다음 중 수정하려는 내용이 있다면 JSON 형태로 추출해주세요:
-
-{{
-    "summary": "새로운 제목 (변경하려는 경우에만)",
-    "start_date": "YYYY-MM-DD (시작일 변경하려는 경우에만)",
-    "end_date": "YYYY-MM-DD (종료일 변경하려는 경우에만)",
-    "location": "새로운 장소 (변경하려는 경우에만)",
-    "description": "새로운 설명 (변경하려는 경우에만)"
-}}
-
-분석 규칙:
-1. 명시적으로 변경하려는 내용만 포함하세요
-2. 날짜는 상대적 표현도 절대 날짜로 변환하세요 (예: "내일" → "2024-12-20")
-3. 변경하지 않는 필드는 포함하지 마세요
-4. 애매한 경우에는 null로 응답하세요
-5. 날짜 범위는 "~", "부터", "까지", "에서" 등을 인식하세요
-
-예시:
-- "6월 10일~13일로 변경" → {{"start_date": "2024-06-10", "end_date": "2024-06-13"}}
-- "제목을 부산여행으로 바꿔" → {{"summary": "부산여행"}}
-- "장소를 서울로 수정" → {{"location": "서울"}}
-- "내일부터 3일간" → {{"start_date": "2024-12-21", "end_date": "2024-12-23"}}
-
-변경 내용이 없거나 분석할 수 없으면 빈 객체 {{}}를 반환하세요."""
+    template = get_prompt("calendar_modification")
+    system_prompt = template.render(
+        existing_info=existing_info,
+        current_date=current_date.strftime('%Y년 %m월 %d일'),
+        message=message
+    )
     
     try:
-        messages = [SystemMessage(content=system_prompt)]
-        response = llm.invoke(messages)
-        
-        result = json.loads(response.content.strip())
+        messages = [HumanMessage(content=system_prompt)]
+        with get_prompt_registry().measure(template):
+            result = invoke_json_schema(route_llm(llm, TASK_EXTRACT), messages, MODIFICATION_SCHEMA, "calendar_modification")
         
         if not result or all(not v for v in result.values()):
             return None
             
         return {k: v for k, v in result.items() if v is not None and v != ""}
         
-    except (json.JSONDecodeError, Exception) as e:
+    except Exception as e:
         print(f"수정 내용 분석 중 오류: {str(e)}")
         return None
 
@@ -0,0 +1,349 @@
+import html
+import io
+import json
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import docx
+
+from ...models.plan import NormalizedPlan, PLAN_FORMAT_JSON, PLAN_FORMAT_TEXT
+from .calendar.parser import extract_travel_info, find_travel_dates, scan_plan_content
+
+EXPORT_CACHE_SIZE = 256
+DEFAULT_ACTIVITY_MINUTES = 60
+ICS_LINE_OCTETS = 75
+
+# JSON 계획의 추가 정보 섹션: (키, 제목, [(항목 키, 라벨)]) - 클라이언트 renderers.JSON_ADDITIONAL_SECTIONS와 같은 구성
+ADDITIONAL_SECTIONS = [
+    ("preparation", "🎒 준비사항", [
+        ("essential_items", "🎁 필수 준비물"), ("reservations_needed", "📞 사전 예약 필요"),
+        ("local_tips", "💡 현지 정보"), ("warnings", "⚠️ 주의사항")
+    ]),
+    ("alternatives", "🌦️ 대체 옵션", [
+        ("rainy_day_options", "☔ 우천시 대체 장소"), ("optional_activities", "✨ 선택적 추가 활동")
+    ])
+]
+
+# 공유 페이지 스타일 (클라이언트 styles.SHARE_PAGE_CSS의 카드 구성, CSP상 외부 리소스 없이 인라인)
+HTML_PAGE_STYLE = """
+:root { --background-color: #ffffff; --secondary-background-color: #f8f9fa; --text-color: #000000; --border-color: #e0e0e0; color-scheme: light dark; }
+@media (prefers-color-scheme: dark) { :root { --background-color: #2d2d2d; --secondary-background-color: #3d3d3d; --text-color: #ffffff; --border-color: #4d4d4d; } }
+body { max-width: 760px; margin: 0 auto; padding: 24px 16px; font-family: sans-serif; line-height: 1.6; background: var(--background-color); color: var(--text-color); }
+.trip-card { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 20px; border-radius: 15px; color: white; margin-bottom: 20px; }
+.day-card { padding: 4px 20px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.2); margin: 20px 0 15px; border: 1px solid var(--border-color); border-left: 4px solid #667eea; }
+.activity-item { background: var(--secondary-background-color); padding: 12px; border-radius: 8px; margin: 8px 0; border: 1px solid var(--border-color); border-left: 3px solid #28a745; }
+"""
+
+# 텍스트 계획의 마크다운 중 HTML로 옮기는 문법 (제목, 목록, 굵게) - 나머지는 이스케이프된 일반 텍스트
+MARKDOWN_HEADING_REGEX = re.compile(r"^(#{1,6})\s+(.*)$")
+MARKDOWN_BULLET_REGEX = re.compile(r"^\s*(?:[-*+•○]|[0-9]+\.)\s+(.*)$")
+MARKDOWN_BOLD_REGEX = re.compile(r"\*\*(.+?)\*\*")
+
+# 문서 블록: ("heading", 레벨, 텍스트) / ("paragraph", 텍스트) / ("bullets", [텍스트]) / ("text", 여러 줄 마크다운)
+Block = Tuple
+
+def _activity_text(activity: Dict) -> str:
+    """활동 한 줄 요약 (시간, 제목, 장소, 설명)"""
+    text = " ".join(part for part in (activity.get("time", ""), activity.get("title", "")) if part)
+    location = " ".join(part for part in (activity.get("location", ""), activity.get("address", "")) if part)
+    if location:
+        text += f" (📍 {location})"
+    if activity.get("description"):
+        text += f" - {activity['description']}"
+    return text
+
+def plan_blocks(plan: NormalizedPlan) -> Iterator[Block]:
+    """정규화된 계획을 형식 공통 문서 블록으로 변환 (마크다운/HTML/DOCX가 같은 구성을 사용)"""
+    # 텍스트 계획은 본문에 제목과 구성이 이미 들어 있음
+    if plan.format == PLAN_FORMAT_TEXT:
+        yield ("text", plan.content)
+        return
+
+    yield ("heading", 1, f"🗺️ {plan.destination or '여행지 미정'} 여행")
+
+    if plan.start_date and plan.end_date:
+        yield ("paragraph", f"📅 여행 기간: {plan.start_date} ~ {plan.end_date}")
+    if plan.summary:
+        yield ("paragraph", f"✨ 여행 컨셉: {plan.summary}")
+
+    yield ("heading", 2, "📅 여행 일정")
+    for day_num, day in enumerate(plan.itinerary, 1):
+        date_display = f"{day.get('date', '')} ({day['day_of_week']})" if day.get("day_of_week") else day.get("date", "")
+        yield ("heading", 3, f"🌅 {day_num}일차 - {date_display}")
+        yield ("bullets", [_activity_text(activity) for activity in day.get("activities", [])])
+
+    if plan.format != PLAN_FORMAT_JSON:
+        return
+    for key, heading, groups in ADDITIONAL_SECTIONS:
+        section = plan.plan_data.get(key) or {}
+        if not any(section.get(group_key) for group_key, _ in groups):
+            continue
+        yield ("heading", 2, heading)
+        for group_key, label in groups:
+            if section.get(group_key):
+                yield ("paragraph", f"{label}:")
+                yield ("bullets", list(section[group_key]))
+
+def iter_markdown(plan: NormalizedPlan) -> Iterator[str]:
+    """마크다운 내보내기 (블록 단위로 생성)"""
+    for block in plan_blocks(plan):
+        kind = block[0]
+        if kind == "heading":
+            yield f"{'#' * block[1]} {block[2]}\n\n"
+        elif kind == "paragraph":
+            yield f"{block[1]}\n\n"
+        elif kind == "bullets":
+            yield "".join(f"- {item}\n" for item in block[1]) + "\n"
+        else:
+            yield f"{block[1].strip()}\n"
+
+def _markdown_inline(text: str) -> str:
+    """한 줄을 이스케이프한 뒤 굵게 표시만 태그로 변환"""
+    return MARKDOWN_BOLD_REGEX.sub(r"<strong>\1</strong>", html.escape(text))
+
+def _markdown_html(content: str) -> Iterator[str]:
+    """텍스트 계획 마크다운을 안전한 HTML로 변환 (원문은 모두 이스케이프, 제목/목록/굵게/문단만 태그로 생성)"""
+    paragraph: List[str] = []
+    in_list = False
+
+    def flush() -> Iterator[str]:
+        nonlocal in_list
+        if paragraph:
+            yield "<p>" + "<br>".join(paragraph) + "</p>\n"
+            paragraph.clear()
+        if in_list:
+            yield "</ul>\n"
+            in_list = False
+
+    for line in content.strip().split("\n"):
+        if heading := MARKDOWN_HEADING_REGEX.match(line.strip()):
+            yield from flush()
+            level = len(heading.group(1))
+            yield f"<h{level}>{_markdown_inline(heading.group(2))}</h{level}>\n"
+        elif bullet := MARKDOWN_BULLET_REGEX.match(line):
+            if paragraph or not in_list:
+                yield from flush()
+                yield "<ul>"
+                in_list = True
+            yield f"<li>{_markdown_inline(bullet.group(1))}</li>"
+        elif line.strip():
+            if in_list:
+                yield from flush()
+            paragraph.append(_markdown_inline(line.strip()))
+        else:
+            yield from flush()
+    yield from flush()
+
+def iter_html(plan: NormalizedPlan) -> Iterator[str]:
+    """외부 리소스 없이 열리는 HTML 문서 내보내기 (블록 단위로 생성, 공유 링크의 정적 페이지로도 사용)
+
+    구조화된 계획은 공유 페이지와 같은 여행 카드/일차 카드/활동 항목으로, 텍스트 계획은 마크다운을 변환해 표시.
+    """
+    title = html.escape(f"{plan.destination} 여행 계획" if plan.destination else "여행 계획")
+    yield (
+        f'<!DOCTYPE html>\n<html lang="ko">\n<head>\n<meta charset="utf-8">\n'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">\n'
+        f'<title>{title}</title>\n<meta property="og:title" content="{title}">\n'
+        f"<style>{HTML_PAGE_STYLE}</style>\n</head>\n<body>\n"
+    )
+    in_trip_card = False
+    in_day = False
+    for block in plan_blocks(plan):
+        kind = block[0]
+        if kind == "heading":
+            if in_trip_card:
+                yield "</div>\n"
+                in_trip_card = False
+            in_day = block[1] == 3
+            if block[1] == 1:
+                yield f'<div class="trip-card">\n<h1>{html.escape(block[2])}</h1>\n'
+                in_trip_card = True
+            elif in_day:
+                yield f'<div class="day-card"><h3>{html.escape(block[2])}</h3></div>\n'
+            else:
+                yield f"<h{block[1]}>{html.escape(block[2])}</h{block[1]}>\n"
+        elif kind == "paragraph":
+            yield f"<p>{html.escape(block[1])}</p>\n"
+        elif kind == "bullets" and in_day:
+            yield "".join(f'<div class="activity-item">{html.escape(item)}</div>\n' for item in block[1])
+        elif kind == "bullets":
+            yield "<ul>" + "".join(f"<li>{html.escape(item)}</li>" for item in block[1]) + "</ul>\n"
+        else:
+            yield '<div class="plan-text">\n'
+            yield from _markdown_html(block[1])
+            yield "</div>\n"
+    if in_trip_card:
+        yield "</div>\n"
+    yield "</body>\n</html>\n"
+
+def iter_json(plan: NormalizedPlan) -> Iterator[str]:
+    """JSON 내보내기 (JSON 계획은 본문, 그 외 형식은 정규화된 계획 전체)"""
+    data = plan.plan_data if plan.format == PLAN_FORMAT_JSON else plan.model_dump()
+    yield json.dumps(data, ensure_ascii=False, indent=2)
+
+def iter_docx(plan: NormalizedPlan) -> Iterator[bytes]:
+    """Word(.docx) 내보내기 (zip 형식이라 문서 전체를 한 번에 생성)"""
+    document = docx.Document()
+    for block in plan_blocks(plan):
+        kind = block[0]
+        if kind == "heading":
+            document.add_heading(block[2], level=block[1])
+        elif kind == "paragraph":
+            document.add_paragraph(block[1])
+        elif kind == "bullets":
+            for item in block[1]:
+                document.add_paragraph(item, style="List Bullet")
+        else:
+            for line in block[1].strip().split("\n"):
+                document.add_paragraph(line)
+
+    buffer = io.BytesIO()
+    document.save(buffer)
+    yield buffer.getvalue()
+
+def _ics_escape(text: str) -> str:
+    """iCalendar TEXT 값 이스케이프"""
+    return text.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\n", "\\n")
+
+def _ics_line(line: str) -> str:
+    """75옥텟 단위로 줄 접기 (UTF-8 문자가 잘리지 않도록 문자 단위로 계산)"""
+    folded, current, size = [], "", 0
+    for char in line:
+        char_size = len(char.encode("utf-8"))
+        if size + char_size > ICS_LINE_OCTETS:
+            folded.append(current)
+            current, size = " ", 1
+        current += char
+        size += char_size
+    folded.append(current)
+    return "\r\n".join(folded) + "\r\n"
+
+def _ics_event(uid: str, summary: str, start: str, end: str, all_day: bool, location: str = "", description: str = "") -> Iterator[str]:
+    """VEVENT 한 개의 줄 목록"""
+    value_type = ";VALUE=DATE" if all_day else ""
+    yield "BEGIN:VEVENT"
+    yield f"UID:{uid}"
+    yield f"DTSTAMP:{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}"
+    yield f"DTSTART{value_type}:{start}"
+    yield f"DTEND{value_type}:{end}"
+    yield f"SUMMARY:{_ics_escape(summary)}"
+    if location:
+        yield f"LOCATION:{_ics_escape(location)}"
+    if description:
+        yield f"DESCRIPTION:{_ics_escape(description)}"
+    yield "END:VEVENT"
+
+def _activity_times(date: str, activity: Dict) -> Optional[Tuple[datetime, datetime]]:
+    """활동의 시작/종료 시각 (HH:MM 시간이 없으면 None, 소요 시간이 숫자가 아니면 기본값)"""
+    try:
+        start = datetime.strptime(f"{date} {activity.get('time', '')}", "%Y-%m-%d %H:%M")
+    except ValueError:
+        return None
+    try:
+        minutes = int(activity.get("duration_minutes") or DEFAULT_ACTIVITY_MINUTES)
+    except (TypeError, ValueError):
+        minutes = DEFAULT_ACTIVITY_MINUTES
+    return start, start + timedelta(minutes=minutes)
+
+def _activity_event(uid: str, date: str, activity: Dict) -> Optional[Iterator[str]]:
+    """활동 VEVENT (시간이 있으면 시각 일정, '오전'처럼 시간이 없으면 그날의 종일 일정, 날짜가 없으면 None)"""
+    try:
+        day = datetime.strptime(date, "%Y-%m-%d")
+    except ValueError:
+        return None
+
+    location = " ".join(part for part in (activity.get("location", ""), activity.get("address", "")) if part)
+    description = activity.get("description", "")
+    times = _activity_times(date, activity)
+    if times is None:
+        title = " ".join(part for part in (activity.get("time", ""), activity.get("title", "")) if part)
+        next_day = day + timedelta(days=1)
+        return _ics_event(uid, title, day.strftime("%Y%m%d"), next_day.strftime("%Y%m%d"), True, location, description)
+    return _ics_event(
+        uid, activity.get("title", ""),
+        times[0].strftime("%Y%m%dT%H%M%S"), times[1].strftime("%Y%m%dT%H%M%S"), False, location, description
+    )
+
+def _trip_dates(plan: NormalizedPlan) -> Optional[Tuple[datetime, datetime]]:
+    """여행 전체 일정의 첫날/마지막 날 (일정 날짜 우선, 텍스트 계획은 본문의 기간/날짜 - 실제 날짜가 없으면 None)"""
+    dates = []
+    for day in plan.itinerary:
+        try:
+            dates.append(datetime.strptime(day.get("date", ""), "%Y-%m-%d"))
+        except ValueError:
+            continue
+    if dates:
+        return min(dates), max(dates)
+    # 상대 날짜(내일 등)는 내보내는 시점에 따라 달라지므로 제외
+    if plan.format == PLAN_FORMAT_TEXT:
+        return find_travel_dates(scan_plan_content(plan.content), include_relative=False)
+    return None
+
+def iter_ics(plan: NormalizedPlan, share_id: str) -> Iterator[str]:
+    """iCalendar(.ics) 내보내기: 여행 전체 종일 일정 + 활동별 일정 (현지 시각 기준 floating time, 구독 피드로도 사용)
+
+    실제 날짜가 없는 계획에는 오늘 날짜로 대신한 여행 전체 일정을 넣지 않음.
+    """
+    raw_plan = {"plan_data": plan.plan_data} if plan.format == PLAN_FORMAT_JSON else {"content": plan.content}
+    travel_info = extract_travel_info(raw_plan)
+
+    yield "".join(_ics_line(line) for line in (
+        "BEGIN:VCALENDAR", "VERSION:2.0", "PRODID:-//Travel Gene//Plan Export//KO",
+        "CALSCALE:GREGORIAN", "METHOD:PUBLISH", f"X-WR-CALNAME:{_ics_escape(travel_info['destination'] + ' 여행')}"
+    ))
+
+    trip_dates = _trip_dates(plan)
+    if trip_dates is not None:
+        trip_end = trip_dates[1] + timedelta(days=1)
+        yield "".join(_ics_line(line) for line in _ics_event(
+            f"{share_id}-trip@travel-gene", travel_info["summary"],
+            trip_dates[0].strftime("%Y%m%d"), trip_end.strftime("%Y%m%d"), True,
+            description=travel_info["description"] if travel_info["description"] != travel_info["summary"] else ""
+        ))
+
+    for day_num, day in enumerate(plan.itinerary, 1):
+        for index, activity in enumerate(day.get("activities", [])):
+            event = _activity_event(f"{share_id}-{day_num}-{index}@travel-gene", day.get("date", ""), activity)
+            if event is not None:
+                yield "".join(_ics_line(line) for line in event)
+
+    yield _ics_line("END:VCALENDAR")
+
+# 형식 → (MIME 타입, 내보내기 함수)
+EXPORT_FORMATS = {
+    "md": ("text/markdown; charset=utf-8", iter_markdown),
+    "html": ("text/html; charset=utf-8", iter_html),
+    "json": ("application/json", iter_json),
+    "docx": ("application/vnd.openxmlformats-officedocument.wordprocessingml.document", iter_docx),
+    "ics": ("text/calendar; charset=utf-8", iter_ics)
+}
+
+_export_cache: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+_export_cache_lock = threading.Lock()
+
+def stream_export(share_id: str, plan: NormalizedPlan, fmt: str) -> Iterator[bytes]:
+    """내보내기 결과를 조각 단위로 반환 (공유 ID가 내용 해시이므로 끝까지 생성된 결과는 ID/형식별로 캐시)"""
+    key = (share_id, fmt)
+    with _export_cache_lock:
+        cached = _export_cache.get(key)
+        if cached is not None:
+            _export_cache.move_to_end(key)
+    if cached is not None:
+        yield cached
+        return
+
+    exporter = EXPORT_FORMATS[fmt][1]
+    chunks: List[bytes] = []
+    output: Iterator[Union[str, bytes]] = exporter(plan, share_id) if fmt == "ics" else exporter(plan)
+    for chunk in output:
+        data = chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+        chunks.append(data)
+        yield data
+
+    with _export_cache_lock:
+        _export_cache[key] = b"".join(chunks)
+        while len(_export_cache) > EXPORT_CACHE_SIZE:
+            _export_cache.popitem(last=False)
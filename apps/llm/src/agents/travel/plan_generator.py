@@ -0,0 +1,177 @@
+import contextvars
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from .plan_schema import TRAVEL_PLAN_SCHEMA
+from .prompts import get_prompt
+from ...config import get_settings
+from ...utils.kakao_map_api import get_kakao_map_api
+from ...utils.prompt_cache import build_prompt
+from ...utils.prompt_registry import get_prompt_registry
+from ...utils.structured_output import invoke_json_schema
+
+PARALLEL_PLAN_MIN_DAYS = 5
+DAY_PLACES_LIMIT = 5
+# 일자별 상세 생성 시도 횟수 (모두 실패하면 병렬 생성을 포기하고 단일 생성으로 대체)
+DAY_DETAIL_ATTEMPTS = 2
+
+SKELETON_SCHEMA_NAME = "travel_plan_skeleton"
+DAY_SCHEMA_NAME = "travel_plan_day"
+
+DAY_SCHEMA = TRAVEL_PLAN_SCHEMA["properties"]["itinerary"]["items"]
+
+SKELETON_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "travel_overview": TRAVEL_PLAN_SCHEMA["properties"]["travel_overview"],
+        "day_themes": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "date": {"type": "string", "description": "YYYY-MM-DD"},
+                    "day_of_week": {"type": "string"},
+                    "theme": {"type": "string", "description": "하루 일정의 주제"},
+                    "area": {"type": "string", "description": "주로 방문할 지역"},
+                    "place_keyword": {"type": "string", "description": "추천 장소 검색 키워드"}
+                },
+                "required": ["date", "day_of_week", "theme", "area", "place_keyword"]
+            }
+        },
+        "preparation": TRAVEL_PLAN_SCHEMA["properties"]["preparation"],
+        "alternatives": TRAVEL_PLAN_SCHEMA["properties"]["alternatives"]
+    },
+    "required": ["travel_overview", "day_themes", "preparation", "alternatives"]
+}
+
+NIGHTS_REGEX = re.compile(r"([0-9]+)\s*박")
+DAYS_REGEX = re.compile(r"([0-9]+)\s*일(?!\s*[후뒤])")
+DATE_REGEX = re.compile(r"([0-9]{4})\s*[-./년]\s*([0-9]{1,2})\s*[-./월]\s*([0-9]{1,2})")
+
+def estimate_trip_days(conversation_state: Dict) -> Optional[int]:
+    """대화 상태의 기간/날짜 정보로 여행 일수 추정"""
+    duration = str(conversation_state.get("duration") or "")
+    travel_dates = str(conversation_state.get("travel_dates") or "")
+
+    if match := NIGHTS_REGEX.search(duration) or NIGHTS_REGEX.search(travel_dates):
+        return int(match.group(1)) + 1
+
+    dates = DATE_REGEX.findall(travel_dates)
+    if len(dates) >= 2:
+        try:
+            start, end = (datetime(*map(int, date)) for date in dates[:2])
+            return (end - start).days + 1
+        except ValueError:
+            pass
+
+    if match := DAYS_REGEX.search(duration):
+        return int(match.group(1))
+
+    return None
+
+def find_day_places(destination: str, day_theme: Dict) -> str:
+    """일자별 테마에 맞는 카카오 추천 장소 정보 문자열 생성"""
+    kakao_api = get_kakao_map_api()
+    keyword = day_theme.get("place_keyword")
+    if not kakao_api or not keyword:
+        return ""
+
+    try:
+        places = kakao_api.search_places_by_keyword(keyword, day_theme.get("area") or destination)
+    except Exception as e:
+        print(f"{keyword} 장소 검색 중 오류 발생: {e}")
+        return ""
+
+    lines = [f"  - {place['name']} ({place['category']}) / {place['address']}" for place in places[:DAY_PLACES_LIMIT]]
+    return "실제 추천 장소:\n" + "\n".join(lines) if lines else ""
+
+def generate_plan_skeleton(llm, messages: List, collected_info: str) -> Optional[Dict]:
+    """여행 개요와 일자별 테마만 담은 계획 골격 생성"""
+    template = get_prompt("plan_skeleton")
+    try:
+        prompt = build_prompt(llm, [template.render()], messages, [collected_info])
+        with get_prompt_registry().measure(template):
+            skeleton = invoke_json_schema(llm, prompt, SKELETON_SCHEMA, SKELETON_SCHEMA_NAME)
+    except Exception as e:
+        print(f"계획 골격 생성 실패: {str(e)}")
+        return None
+
+    if not skeleton or not skeleton.get("day_themes"):
+        return None
+    return skeleton
+
+def generate_day_detail(llm, collected_info: str, overview: Dict, day_theme: Dict) -> Optional[Dict]:
+    """하루 일정의 상세 활동 생성 (DAY_DETAIL_ATTEMPTS번 모두 실패하면 None)"""
+    places_info = find_day_places(overview.get("destination", ""), day_theme)
+
+    day_info = f"""{collected_info}
+여행 개요: {overview.get('summary', '')}
+
+- 날짜: {day_theme.get('date')} ({day_theme.get('day_of_week')})
+- 주제: {day_theme.get('theme')}
+- 방문 지역: {day_theme.get('area')}
+
+{places_info}"""
+
+    template = get_prompt("plan_day_detail")
+    prompt = build_prompt(llm, [template.render()], [], [day_info])
+    day = None
+    for attempt in range(DAY_DETAIL_ATTEMPTS):
+        try:
+            with get_prompt_registry().measure(template):
+                day = invoke_json_schema(llm, prompt, DAY_SCHEMA, DAY_SCHEMA_NAME)
+        except Exception as e:
+            print(f"{day_theme.get('date')} 일정 생성 실패 ({attempt + 1}회): {str(e)}")
+        if day:
+            break
+    if not day:
+        return None
+
+    day["date"] = day_theme.get("date", day.get("date"))
+    day["day_of_week"] = day_theme.get("day_of_week", day.get("day_of_week"))
+    return day
+
+def generate_plan_parallel(
+    llm,
+    messages: List,
+    collected_info: str,
+    on_day: Callable[[int, Dict], None] = lambda day_index, day: None
+) -> Optional[Dict]:
+    """골격 생성 → 일자별 상세 동시 생성 → 병합 순서로 여행 계획 생성 (완성된 일자는 on_day(인덱스, 일자))
+
+    골격이나 하루라도 상세 생성에 실패하면 빈 일자가 든 계획 대신 None을 반환해 단일 생성으로 대체하게 함.
+    """
+    skeleton = generate_plan_skeleton(llm, messages, collected_info)
+    if skeleton is None:
+        return None
+
+    overview = skeleton.get("travel_overview", {})
+    day_themes = skeleton["day_themes"]
+
+    itinerary = []
+    with ThreadPoolExecutor(max_workers=max(1, get_settings().plan_day_concurrency)) as executor:
+        futures = [
+            # 요청 컨텍스트(프롬프트 A/B 배정 키 등)를 작업 스레드에도 전달
+            executor.submit(contextvars.copy_context().run, generate_day_detail, llm, collected_info, overview, day_theme)
+            for day_theme in day_themes
+        ]
+        # 완성 순서와 무관하게 날짜 순서대로 전달
+        for day_index, future in enumerate(futures):
+            day = future.result()
+            if day is None:
+                print(f"{day_index + 1}일차 상세 생성 실패, 단일 생성으로 대체")
+                for pending in futures:
+                    pending.cancel()
+                return None
+            itinerary.append(day)
+            on_day(day_index, day)
+
+    overview["duration_days"] = len(itinerary)
+    return {
+        "travel_overview": overview,
+        "itinerary": itinerary,
+        "preparation": skeleton.get("preparation", {}),
+        "alternatives": skeleton.get("alternatives", {})
+    }
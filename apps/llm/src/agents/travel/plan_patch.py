@@ -0,0 +1,109 @@
+import copy
+from typing import Any, Dict, List
+
+PLAN_PATCH_SCHEMA_NAME = "travel_plan_patch"
+
+PLAN_PATCH_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": "string", "description": "사용자에게 보여줄 변경 내용 요약"},
+        "operations": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "op": {"type": "string", "enum": ["add", "replace", "remove"]},
+                    "path": {"type": "string", "description": "JSON Pointer 경로 (예: /itinerary/1/activities/0)"},
+                    "value": {
+                        "type": ["object", "array", "string", "number", "boolean"],
+                        "description": "add/replace 시 새 값 (일자·활동은 객체, 목록 항목은 문자열 등 경로 위치의 JSON 값)"
+                    }
+                },
+                "required": ["op", "path"]
+            }
+        }
+    },
+    "required": ["summary", "operations"]
+}
+
+PATCHABLE_ROOTS = ("travel_overview", "itinerary", "preparation", "alternatives")
+
+def _parse_pointer(path: str) -> List[str]:
+    """JSON Pointer 문자열을 경로 토큰 목록으로 변환"""
+    if not path.startswith("/"):
+        raise ValueError(f"잘못된 경로: {path}")
+
+    tokens = [token.replace("~1", "/").replace("~0", "~") for token in path[1:].split("/")]
+    if tokens[0] not in PATCHABLE_ROOTS or len(tokens) < 2:
+        raise ValueError(f"수정할 수 없는 경로: {path}")
+    return tokens
+
+def _list_index(container: List, token: str, allow_end: bool = False) -> int:
+    """배열 경로 토큰을 인덱스로 변환 ("-"는 배열 끝)"""
+    if token == "-" and allow_end:
+        return len(container)
+    if not token.isdigit():
+        raise ValueError(f"잘못된 배열 인덱스: {token}")
+
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise ValueError(f"배열 범위를 벗어난 인덱스: {token}")
+    return index
+
+def _apply_operation(plan: Dict, operation: Dict):
+    """단일 patch 연산 적용"""
+    op = operation.get("op")
+    tokens = _parse_pointer(operation.get("path", ""))
+
+    parent: Any = plan
+    for token in tokens[:-1]:
+        if isinstance(parent, list):
+            parent = parent[_list_index(parent, token)]
+        elif isinstance(parent, dict) and token in parent:
+            parent = parent[token]
+        else:
+            raise ValueError(f"존재하지 않는 경로: {operation.get('path')}")
+
+    last = tokens[-1]
+    if op in ("add", "replace") and "value" not in operation:
+        raise ValueError(f"{op} 연산에 value가 없습니다: {operation.get('path')}")
+
+    if isinstance(parent, list):
+        if op == "add":
+            parent.insert(_list_index(parent, last, allow_end=True), operation["value"])
+        elif op == "replace":
+            parent[_list_index(parent, last)] = operation["value"]
+        elif op == "remove":
+            del parent[_list_index(parent, last)]
+        else:
+            raise ValueError(f"지원하지 않는 연산: {op}")
+    elif isinstance(parent, dict):
+        if op == "add":
+            parent[last] = operation["value"]
+        elif op in ("replace", "remove"):
+            if last not in parent:
+                raise ValueError(f"존재하지 않는 경로: {operation.get('path')}")
+            if op == "replace":
+                parent[last] = operation["value"]
+            else:
+                del parent[last]
+        else:
+            raise ValueError(f"지원하지 않는 연산: {op}")
+    else:
+        raise ValueError(f"존재하지 않는 경로: {operation.get('path')}")
+
+def apply_plan_patch(plan: Dict, operations: List[Dict]) -> Dict:
+    """계획 JSON에 patch 연산 목록을 적용한 새 계획 반환 (하나라도 실패하면 ValueError)"""
+    patched = copy.deepcopy(plan)
+    for operation in operations:
+        _apply_operation(patched, operation)
+    return patched
+
+def get_changed_days(operations: List[Dict]) -> List[int]:
+    """patch 연산이 영향을 준 itinerary 일자 인덱스 목록"""
+    changed = set()
+    for operation in operations:
+        tokens = operation.get("path", "").lstrip("/").split("/")
+        if len(tokens) >= 2 and tokens[0] == "itinerary" and tokens[1].isdigit():
+            changed.add(int(tokens[1]))
+    return sorted(changed)
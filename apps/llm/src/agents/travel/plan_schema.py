@@ -0,0 +1,101 @@
+TRAVEL_PLAN_SCHEMA_NAME = "travel_plan"
+
+_STRING_LIST = {"type": "array", "items": {"type": "string"}}
+
+TRAVEL_PLAN_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "travel_overview": {
+            "type": "object",
+            "properties": {
+                "destination": {"type": "string"},
+                "start_date": {"type": "string", "description": "YYYY-MM-DD"},
+                "end_date": {"type": "string", "description": "YYYY-MM-DD"},
+                "duration_days": {"type": "integer"},
+                "summary": {"type": "string"}
+            },
+            "required": ["destination", "start_date", "end_date", "duration_days", "summary"]
+        },
+        "itinerary": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "date": {"type": "string", "description": "YYYY-MM-DD"},
+                    "day_of_week": {"type": "string"},
+                    "activities": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "time": {"type": "string", "description": "HH:MM"},
+                                "title": {"type": "string"},
+                                "location": {"type": "string"},
+                                "address": {"type": "string"},
+                                "description": {"type": "string"},
+                                "category": {"type": "string", "enum": ["식사", "관광", "숙박", "이동", "쇼핑", "휴식"]},
+                                "duration_minutes": {"type": "integer"}
+                            },
+                            "required": ["time", "title", "location", "category"]
+                        }
+                    }
+                },
+                "required": ["date", "day_of_week", "activities"]
+            }
+        },
+        "preparation": {
+            "type": "object",
+            "properties": {
+                "essential_items": _STRING_LIST,
+                "reservations_needed": _STRING_LIST,
+                "local_tips": _STRING_LIST,
+                "warnings": _STRING_LIST
+            }
+        },
+        "alternatives": {
+            "type": "object",
+            "properties": {
+                "rainy_day_options": _STRING_LIST,
+                "optional_activities": _STRING_LIST
+            }
+        }
+    },
+    "required": ["travel_overview", "itinerary", "preparation", "alternatives"]
+}
+
+TRAVEL_PLAN_FORMAT = """{
+  "travel_overview": {
+    "destination": "목적지명",
+    "start_date": "YYYY-MM-DD",
+    "end_date": "YYYY-MM-DD",
+    "duration_days": 숫자,
+    "summary": "여행 개요 설명"
+  },
+  "itinerary": [
+    {
+      "date": "YYYY-MM-DD",
+      "day_of_week": "요일",
+      "activities": [
+        {
+          "time": "HH:MM",
+          "title": "활동명",
+          "location": "장소명",
+          "address": "주소",
+          "description": "활동 설명",
+          "category": "식사|관광|숙박|이동|쇼핑|휴식",
+          "duration_minutes": 예상소요시간(분)
+        }
+      ]
+    }
+  ],
+  "preparation": {
+    "essential_items": ["필수 준비물 목록"],
+    "reservations_needed": ["사전 예약 필요 사항"],
+    "local_tips": ["현지 정보"],
+    "warnings": ["주의사항"]
+  },
+  "alternatives": {
+    "rainy_day_options": ["우천시 대체 장소"],
+    "optional_activities": ["선택적 추가 활동"]
+  }
+}"""
@@ -1,18 +1,32 @@
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
+from langgraph.config import get_stream_writer
 from datetime import datetime
+import json
 from .calendar import (
     register_travel_calendar, 
+    create_calendar_subscription,
     view_travel_calendar, 
     handle_calendar_modification,
-    handle_calendar_deletion
+    handle_calendar_deletion,
+    parse_calendar_command
 )
 
 from .types import ConversationState
 from .utils import select_next_question, create_context_message, analyze_preferences, analyze_user_intent
 from .guardrail import check_content_safety
+from .plan_schema import TRAVEL_PLAN_SCHEMA, TRAVEL_PLAN_SCHEMA_NAME
+from .plan_generator import generate_plan_parallel, estimate_trip_days, PARALLEL_PLAN_MIN_DAYS
+from .prompts import get_prompt
+from .plan_patch import PLAN_PATCH_SCHEMA, PLAN_PATCH_SCHEMA_NAME, apply_plan_patch, get_changed_days
 from ...utils.openai_utils import analyze_conversation_with_json_structure
+from ...utils.llm_router import route_llm, TASK_CHAT, TASK_GENERATE
+from ...utils.prompt_cache import build_prompt
+from ...utils.prompt_registry import get_prompt_registry
+from ...utils.structured_output import stream_json_text, invoke_json_schema, JSONArrayStreamParser
 from ...utils.kakao_map_api import get_kakao_map_api
+from ...utils.llm_failover import invoke_llm
+from ...models.plan import NormalizedPlan, PLAN_FORMAT_JSON, PLAN_FORMAT_TEXT
 
 def check_guardrail(llm, state: Dict) -> Dict:
     """보안 및 안전성 검사"""
@@ -62,6 +76,12 @@ def check_guardrail(llm, state: Dict) -> Dict:
             "current_step": str(ConversationState.UNDERSTAND_REQUEST)
         } 
 
+def invoke_assistant(llm, messages: List, dynamic_prompts: Optional[List[str]] = None):
+    """어시스턴트 시스템 프롬프트로 대화 응답 생성 (호출별 지시문은 state에 넣지 않고 동적 정보로 전달, 프롬프트 버전별 사용량 기록)"""
+    chat_llm = route_llm(llm, TASK_CHAT)
+    template = get_prompt("assistant_system")
+    return get_prompt_registry().invoke(template, chat_llm, build_prompt(chat_llm, [template.render()], messages, dynamic_prompts))
+
 def understand_request(llm, state: Dict) -> Dict:
     """사용자 요청 이해"""
     try:
@@ -95,21 +115,13 @@ def understand_request(llm, state: Dict) -> Dict:
             conversation_state.setdefault("context_keywords", set())
             conversation_state.setdefault("interaction_history", [])
         
-        if not any(isinstance(msg, SystemMessage) for msg in messages):
-            messages.insert(0, SystemMessage(content="""여행 계획을 도와드리는 AI 어시스턴트입니다.
-            자연스러운 대화를 통해 맞춤형 여행 계획을 만들어드리겠습니다.
-            
-            제가 도와드릴 수 있는 것들:
-            1. 여행지 추천
-            2. 일정 계획
-            3. 예산 관리
-            4. 맛집/관광지 추천
-            5. 교통편 안내"""))
-        
         last_messages = messages[-memory_size:] if len(messages) >= 3 else messages
         current_year = datetime.now().year
         
-        analysis_result = analyze_conversation_with_json_structure(llm, last_messages, current_year)
+        # 비동기 경로(/plan)는 이벤트 루프에서 미리 분석한 결과를 전달
+        analysis_result = state.get("conversation_analysis")
+        if analysis_result is None:
+            analysis_result = analyze_conversation_with_json_structure(llm, last_messages, current_year)
         
         try:
             if destination := analysis_result.get("core_info", {}).get("destination"):
@@ -155,10 +167,13 @@ def understand_request(llm, state: Dict) -> Dict:
         except Exception as e:
             print(f"Error processing analysis result: {str(e)}")
         
+        # 요청마다 달라지는 컨텍스트는 대화 뒤에 배치 (build_prompt가 정적 지시문을 앞에 고정, state의 대화에는 추가하지 않음)
+        prompt_messages = messages
+        dynamic_prompts = []
         context_msg = create_context_message(conversation_state)
         if context_msg:
-            messages = [msg for msg in messages if not isinstance(msg, SystemMessage)]
-            messages.insert(0, context_msg)
+            prompt_messages = [msg for msg in messages if not isinstance(msg, SystemMessage)]
+            dynamic_prompts.append(context_msg.content)
         
         if conversation_state["pending_questions"]:
             next_question = select_next_question(
@@ -168,21 +183,10 @@ def understand_request(llm, state: Dict) -> Dict:
             )
             if next_question:
                 if not any(info in next_question.lower() for info in conversation_state["confirmed_info"]):
-                    response_prompt = SystemMessage(content=f"""현재까지 파악된 정보를 바탕으로 자연스럽게 대화를 이어가주세요.
-                    
-                    다음 정보가 필요합니다: {next_question}
-                    
-                    대화 스타일:
-                    1. 친근하고 자연스러운 어조 유지
-                    2. 이전 대화 내용을 참고하여 맥락 유지
-                    3. 열린 질문으로 시작하여 사용자의 선호도를 자세히 파악
-                    4. 적절한 예시나 추천사항 포함
-                    5. 한 번에 너무 많은 것을 물어보지 않기
-                    6. 이미 알고 있는 정보는 다시 물어보지 않기""")
-                    
-                    messages.append(response_prompt)
+                    response_prompt = get_prompt("follow_up_question").render(next_question=next_question)
+                    dynamic_prompts.append(response_prompt)
         
-        response = llm.invoke(messages)
+        response = invoke_assistant(llm, prompt_messages, dynamic_prompts)
         messages.append(response)
         
         return {
@@ -200,6 +204,10 @@ def understand_request(llm, state: Dict) -> Dict:
             "conversation_state": conversation_state if 'conversation_state' in locals() else {}
         }
 
+# 계획 없이 캘린더 등록/계획 수정을 요청해 계획 생성으로 넘어갈 때 생성 프롬프트의 동적 정보로 전달하는 안내
+CALENDAR_PLAN_NOTE = "캘린더에 등록하려면 먼저 여행 계획이 필요합니다. 지금까지 수집된 정보를 바탕으로 여행 계획을 생성한 후 캘린더에 등록하겠습니다."
+REFINE_PLAN_NOTE = "수정할 여행 계획이 아직 없습니다. 먼저 기본 여행 계획을 생성한 후 수정하겠습니다."
+
 def determine_next_step(state: Dict) -> str:
     """다음 대화 단계 결정"""
     try:
@@ -213,7 +221,7 @@ def determine_next_step(state: Dict) -> str:
         has_preferences = bool(conversation_state.get("preferences"))
         
         # plan_data 존재 여부 확인 - JSON 형식과 텍스트 형식 모두 지원
-        has_plan = bool(plan_data.get("content") or plan_data.get("plan_data"))
+        has_plan = NormalizedPlan.from_raw(plan_data) is not None
         
         last_user_message = None
         previous_ai_message = None
@@ -229,6 +237,13 @@ def determine_next_step(state: Dict) -> str:
             content = last_user_message.content
             previous_content = previous_ai_message.content if previous_ai_message else None
             
+            # "캘린더 2번 일정 삭제해줘"나 일정 목록 직후의 "2번 삭제해줘"처럼 규칙으로 확실히 판별되는 캘린더 요청은 LLM 의도 분석을 생략
+            calendar_command = parse_calendar_command(content, previous_content)
+            if calendar_command == "modify":
+                return str(ConversationState.MODIFY_CALENDAR)
+            if calendar_command == "delete":
+                return str(ConversationState.DELETE_CALENDAR)
+            
             intent_analysis = analyze_user_intent(llm, content, has_plan, previous_content)
             
             print(f"Intent analysis: {intent_analysis}")
@@ -247,10 +262,8 @@ def determine_next_step(state: Dict) -> str:
                     if has_plan:
                         return str(ConversationState.REGISTER_CALENDAR)
                     elif has_destination and has_dates and has_preferences:
-                        messages.append(SystemMessage(content="""
-                        캘린더에 등록하려면 먼저 여행 계획이 필요합니다. 
-                        지금까지 수집된 정보를 바탕으로 여행 계획을 생성한 후 캘린더에 등록하겠습니다.
-                        """))
+                        # 라우팅 함수는 state를 갱신할 수 없어 요청 단위 conversation_state에 안내를 남기고 generate_plan이 사용
+                        conversation_state["plan_note"] = CALENDAR_PLAN_NOTE
                         return str(ConversationState.GENERATE_PLAN)
                 
                 if primary_intent == "캘린더 수정 요청":
@@ -267,10 +280,7 @@ def determine_next_step(state: Dict) -> str:
                     if has_plan:
                         return str(ConversationState.REFINE_PLAN)
                     elif has_destination and has_dates and has_preferences:
-                        messages.append(SystemMessage(content="""
-                        수정할 여행 계획이 아직 없습니다. 
-                        먼저 기본 여행 계획을 생성한 후 수정하겠습니다.
-                        """))
+                        conversation_state["plan_note"] = REFINE_PLAN_NOTE
                         return str(ConversationState.GENERATE_PLAN)
                 
                 if primary_intent == "긍정 응답" and is_affirmative and previous_ai_message:
@@ -324,33 +334,11 @@ def ask_destination(llm, state: Dict) -> Dict:
     
     if previous_preferences:
         preferences_str = ", ".join(previous_preferences)
-        destination_prompt = SystemMessage(content=f"""지금까지 파악된 선호도는 다음과 같습니다:
-        {preferences_str}
-        
-        이러한 선호도를 고려하여 구체적인 여행지나 관련 장소를 추천해주세요.
-        이미 특정 지역이 언급되었다면, 그 지역 내에서 적합한 장소들을 추천해주세요.
-        
-        추천 시 고려사항:
-        1. 선호도와 일치하는 장소 우선
-        2. 계절/날씨 고려
-        3. 이동 편의성
-        4. 주변 관광지와의 연계성
-        5. 현지 특색""")
+        destination_prompt = get_prompt("destination_recommendation").render(preferences=preferences_str)
     else:
-        destination_prompt = SystemMessage(content="""어떤 여행을 원하시는지 자연스럽게 물어보세요.
-        예시:
-        1. 특정 여행지를 언급했다면 확인
-        2. 선호하는 여행 스타일이나 원하는 경험 파악
-        3. 여행지 추천이 필요하다면 몇 가지 옵션 제시
-        
-        대화 가이드:
-        1. 열린 질문으로 시작
-        2. 구체적인 예시 포함
-        3. 단계적으로 선호도 파악
-        4. 맥락 유지""")
-    
-    messages.append(destination_prompt)
-    response = llm.invoke(messages)
+        destination_prompt = get_prompt("destination_inquiry").render()
+    
+    response = invoke_assistant(llm, messages, [destination_prompt])
     messages.append(response)
     
     return {
@@ -375,12 +363,8 @@ def collect_details(llm, state: Dict) -> Dict:
         missing_info.append("선호하는 활동")
         
     if missing_info:
-        details_prompt = SystemMessage(content=f"""자연스러운 대화로 다음 정보를 물어보세요:
-        - {', '.join(missing_info)}
-        한 번에 너무 많은 것을 물어보지 말고, 대화를 이어나가듯이 질문해주세요.""")
-        
-        messages.append(details_prompt)
-        response = llm.invoke(messages)
+        details_prompt = get_prompt("details_inquiry").render(missing_info=", ".join(missing_info))
+        response = invoke_assistant(llm, messages, [details_prompt])
         messages.append(response)
     else:
         conversation_state["details_collected"] = True
@@ -392,6 +376,36 @@ def collect_details(llm, state: Dict) -> Dict:
         "conversation_state": conversation_state
     }
 
+def get_plan_stream_writer():
+    """LangGraph custom 스트림 writer 반환 (스트리밍 실행이 아니면 이벤트 무시)"""
+    try:
+        return get_stream_writer()
+    except Exception:
+        return lambda event: None
+
+def stream_plan_generation(llm, messages: List) -> Tuple[Optional[Dict], str]:
+    """구조화 출력 모드로 계획을 생성하며 완성된 일자(itinerary)를 일자 인덱스와 함께 즉시 스트림으로 전달"""
+    write_event = get_plan_stream_writer()
+    parser = JSONArrayStreamParser("itinerary")
+    day_index = 0
+    
+    try:
+        for chunk in stream_json_text(llm, messages, TRAVEL_PLAN_SCHEMA, TRAVEL_PLAN_SCHEMA_NAME):
+            for day in parser.feed(chunk):
+                write_event({"plan_day": day, "day_index": day_index})
+                day_index += 1
+    except Exception as e:
+        print(f"구조화 출력 스트리밍 실패, 일반 호출로 재시도: {str(e)}")
+        parser = JSONArrayStreamParser("itinerary")
+        response = invoke_llm(llm, messages, "plan_generation")
+        parser.feed(response.content)
+    
+    plan_text = parser.text.strip()
+    try:
+        return json.loads(plan_text), plan_text
+    except json.JSONDecodeError:
+        return None, plan_text
+
 def generate_plan(llm, state: Dict) -> Dict:
     """여행 계획 생성"""
     messages = state.get("messages", [])
@@ -405,11 +419,26 @@ def generate_plan(llm, state: Dict) -> Dict:
     - 여행 기간: {conversation_state.get('travel_dates', '미정')}
     - 선호 사항: {preferences}
     """
+    # determine_next_step의 안내는 대화(state)가 아닌 동적 정보로만 전달
+    if plan_note := conversation_state.pop("plan_note", None):
+        collected_info += f"\n{plan_note}\n"
 
+    generate_llm = route_llm(llm, TASK_GENERATE)
+    plan_json = None
+    
+    # 장기 여행은 골격 생성 후 일자별 상세 계획을 동시에 생성 (장소는 일자별 테마로 검색하므로 전체 검색은 생략)
+    if (estimate_trip_days(conversation_state) or 0) >= PARALLEL_PLAN_MIN_DAYS:
+        write_event = get_plan_stream_writer()
+        plan_json = generate_plan_parallel(
+            generate_llm, messages, collected_info,
+            on_day=lambda day_index, day: write_event({"plan_day": day, "day_index": day_index})
+        )
+    
     real_places_info = ""
     places_found = False
+    places_count = 0
     
-    kakao_api = get_kakao_map_api()
+    kakao_api = get_kakao_map_api() if plan_json is None else None
     
     if kakao_api and destination != '미정' and preferences:
         try:
@@ -435,128 +464,38 @@ def generate_plan(llm, state: Dict) -> Dict:
                 
                 if total_places > 0:
                     places_found = True
+                    places_count = sum(len(places) for places in places_by_preference.values())
                     real_places_info += f"💡 총 {total_places}개의 실제 장소 정보를 찾았습니다.\n"
                 
         except Exception as e:
             real_places_info = "\n\n⚠️ 실시간 장소 정보 검색에 일시적인 문제가 발생했습니다. 일반적인 추천 정보를 제공합니다.\n"
 
+    plan_context = collected_info
     if places_found:
-        plan_instruction = f"""{collected_info}
-
-위 정보를 바탕으로 수집된 실제 장소 정보를 활용하여 여행 계획을 생성해주세요:
-
-{real_places_info}
-
-**중요: 응답을 반드시 다음 JSON 형식으로 작성해주세요. 다른 텍스트 없이 JSON만 반환해주세요:**
-
-{{
-  "travel_overview": {{
-    "destination": "목적지명",
-    "start_date": "YYYY-MM-DD",
-    "end_date": "YYYY-MM-DD", 
-    "duration_days": 숫자,
-    "summary": "여행 개요 설명"
-  }},
-  "itinerary": [
-    {{
-      "date": "YYYY-MM-DD",
-      "day_of_week": "요일",
-      "activities": [
-        {{
-          "time": "HH:MM",
-          "title": "활동명",
-          "location": "장소명",
-          "address": "실제 주소",
-          "description": "활동 설명",
-          "category": "식사|관광|숙박|이동|쇼핑|휴식",
-          "duration_minutes": 예상소요시간(분)
-        }}
-      ]
-    }}
-  ],
-  "preparation": {{
-    "essential_items": ["필수 준비물 목록"],
-    "reservations_needed": ["사전 예약 필요 사항"],
-    "local_tips": ["현지 정보"],
-    "warnings": ["주의사항"]
-  }},
-  "alternatives": {{
-    "rainy_day_options": ["우천시 대체 장소"],
-    "optional_activities": ["선택적 추가 활동"]
-  }}
-}}
-
-**참고:** 실제 수집된 장소 정보를 최대한 활용하여 구체적이고 실용적인 계획을 JSON 형식으로 작성해주세요."""
+        plan_context += f"\n위 정보와 수집된 실제 장소 정보를 활용하여 여행 계획을 생성해주세요:\n{real_places_info}"
+    elif real_places_info:
+        plan_context += real_places_info
+    
+    if plan_json is not None:
+        plan_text = json.dumps(plan_json, ensure_ascii=False)
     else:
-        plan_instruction = f"""{collected_info}
-
-위 정보를 바탕으로 여행 계획을 생성해주세요. 부족한 정보는 일반적인 선호도를 반영하여 채워주세요.
-
-**중요: 응답을 반드시 다음 JSON 형식으로 작성해주세요. 다른 텍스트 없이 JSON만 반환해주세요:**
-
-{{
-  "travel_overview": {{
-    "destination": "목적지명",
-    "start_date": "YYYY-MM-DD",
-    "end_date": "YYYY-MM-DD",
-    "duration_days": 숫자,
-    "summary": "여행 개요 설명"
-  }},
-  "itinerary": [
-    {{
-      "date": "YYYY-MM-DD", 
-      "day_of_week": "요일",
-      "activities": [
-        {{
-          "time": "HH:MM",
-          "title": "활동명",
-          "location": "장소명", 
-          "address": "주소",
-          "description": "활동 설명",
-          "category": "식사|관광|숙박|이동|쇼핑|휴식",
-          "duration_minutes": 예상소요시간(분)
-        }}
-      ]
-    }}
-  ],
-  "preparation": {{
-    "essential_items": ["필수 준비물 목록"],
-    "reservations_needed": ["사전 예약 필요 사항"], 
-    "local_tips": ["현지 정보"],
-    "warnings": ["주의사항"]
-  }},
-  "alternatives": {{
-    "rainy_day_options": ["우천시 대체 장소"],
-    "optional_activities": ["선택적 추가 활동"]
-  }}
-}}"""
-
-    messages.append(SystemMessage(content=plan_instruction))
-
-    response = llm.invoke(messages)
-    messages.append(response)
+        template = get_prompt("plan_generation")
+        plan_prompt = build_prompt(generate_llm, [template.render()], messages, [plan_context])
+        with get_prompt_registry().measure(template):
+            plan_json, plan_text = stream_plan_generation(generate_llm, plan_prompt)
     
-    try:
-        import json
-        plan_json = json.loads(response.content.strip())
-        
-        plan_metadata = {
-            "generated_at": "generate_plan",
-            "plan_data": plan_json,
-            "collected_info": collected_info,
-            "kakao_places_used": places_found,
-            "places_count": sum(len(places) for places in places_by_preference.values()) if places_found else 0,
-            "format": "json"
-        }
-    except json.JSONDecodeError as e:
-        plan_metadata = {
-            "generated_at": "generate_plan",
-            "content": response.content,
-            "collected_info": collected_info,
-            "kakao_places_used": places_found,
-            "places_count": sum(len(places) for places in places_by_preference.values()) if places_found else 0,
-            "format": "text"
-        }
+    messages.append(AIMessage(content=plan_text))
+    
+    plan_metadata = {
+        "generated_at": "generate_plan",
+        "collected_info": collected_info,
+        "kakao_places_used": places_found,
+        "places_count": places_count
+    }
+    if plan_json is not None:
+        plan_metadata.update({"plan_data": plan_json, "format": PLAN_FORMAT_JSON})
+    else:
+        plan_metadata.update({"content": plan_text, "format": PLAN_FORMAT_TEXT})
     
     return {
         **state,
@@ -565,6 +504,35 @@ def generate_plan(llm, state: Dict) -> Dict:
         "plan_data": plan_metadata
     }
 
+REFINE_CONTEXT_MESSAGES = 4
+
+def refine_plan_with_patch(llm, messages: List, plan_json: Dict, additional_places_info: str) -> Optional[Dict]:
+    """기존 JSON 계획에 대한 patch만 생성하여 적용 (실패 시 None)"""
+    recent_messages = [msg for msg in messages if not isinstance(msg, SystemMessage)][-REFINE_CONTEXT_MESSAGES:]
+    
+    template = get_prompt("plan_patch")
+    
+    try:
+        patch_prompt = build_prompt(
+            llm, [template.render()], recent_messages,
+            [f"현재 계획:\n{json.dumps(plan_json, ensure_ascii=False)}", additional_places_info]
+        )
+        with get_prompt_registry().measure(template):
+            patch = invoke_json_schema(llm, patch_prompt, PLAN_PATCH_SCHEMA, PLAN_PATCH_SCHEMA_NAME)
+        if not patch or not patch.get("operations"):
+            return None
+        
+        operations = patch["operations"]
+        return {
+            "plan": apply_plan_patch(plan_json, operations),
+            "summary": patch.get("summary", ""),
+            "operations": operations,
+            "changed_days": get_changed_days(operations)
+        }
+    except Exception as e:
+        print(f"계획 patch 적용 실패, 전체 수정으로 대체: {str(e)}")
+        return None
+
 def refine_plan(llm, state: Dict) -> Dict:
     """여행 계획 수정"""
     messages = state.get("messages", [])
@@ -593,34 +561,44 @@ def refine_plan(llm, state: Dict) -> Dict:
             except Exception:
                 pass
 
-    refine_instruction = f"""사용자의 피드백을 반영하여 기존 여행 계획을 수정해주세요.
-
-🔄 **수정 지침:**
-1. 사용자의 구체적인 요청사항을 우선 반영
-2. 기존 계획의 좋은 부분은 유지
-3. 변경된 부분을 명확히 표시
-4. 실현 가능하고 현실적인 대안 제시
-
-{additional_places_info}
-
-📝 **수정된 계획 형식:**
-## 🔄 계획 수정 사항
-- **변경 내용:** [구체적인 변경사항]
-- **변경 이유:** [사용자 요청 반영]
-
-## 📅 수정된 여행 일정
-[수정된 전체 일정 또는 변경된 부분만]
-
-💡 **변경사항 요약:**
-- ✅ 추가된 내용
-- 🔄 수정된 내용  
-- ❌ 제거된 내용
-
-기존 계획을 기반으로 자연스럽게 수정해주세요."""
-
-    messages.append(SystemMessage(content=refine_instruction))
+    # JSON 계획은 변경된 부분만 patch로 받아 로컬에서 적용
+    plan = NormalizedPlan.from_raw(plan_data)
+    if plan and plan.format == PLAN_FORMAT_JSON:
+        patch_result = refine_plan_with_patch(route_llm(llm, TASK_GENERATE), messages, plan.plan_data, additional_places_info)
+        
+        if patch_result:
+            # 변경된 일자만 실제 itinerary 위치와 함께 전달
+            write_event = get_plan_stream_writer()
+            for day_index in patch_result["changed_days"]:
+                if day_index < len(patch_result["plan"].get("itinerary", [])):
+                    write_event({"plan_day": patch_result["plan"]["itinerary"][day_index], "day_index": day_index})
+            
+            changed_days = ", ".join(f"{day_index + 1}일차" for day_index in patch_result["changed_days"])
+            summary_lines = ["## 🔄 계획 수정 사항", f"- **변경 내용:** {patch_result['summary']}"]
+            if changed_days:
+                summary_lines.append(f"- **변경된 일정:** {changed_days}")
+            messages.append(AIMessage(content="\n".join(summary_lines)))
+            
+            return {
+                **state,
+                "messages": messages,
+                "current_step": str(ConversationState.REFINE_PLAN),
+                "plan_data": {
+                    "generated_at": "refine_plan",
+                    "plan_data": patch_result["plan"],
+                    "collected_info": plan.collected_info,
+                    "patch": patch_result["operations"],
+                    "kakao_places_used": used_kakao_before or bool(additional_places_info),
+                    "refinement_enhanced": bool(additional_places_info),
+                    "format": PLAN_FORMAT_JSON
+                }
+            }
 
-    response = llm.invoke(messages)
+    refine_llm = route_llm(llm, TASK_GENERATE)
+    template = get_prompt("refine_plan")
+    response = get_prompt_registry().invoke(
+        template, refine_llm, build_prompt(refine_llm, [template.render()], messages, [additional_places_info])
+    )
     messages.append(response)
     
     refined_metadata = {
@@ -628,7 +606,8 @@ def refine_plan(llm, state: Dict) -> Dict:
         "content": response.content,
         "previous_plan": plan_data.get("content") or plan_data.get("plan_data", ""),
         "kakao_places_used": used_kakao_before or bool(additional_places_info),
-        "refinement_enhanced": bool(additional_places_info)
+        "refinement_enhanced": bool(additional_places_info),
+        "format": PLAN_FORMAT_TEXT
     }
     
     return {
@@ -644,7 +623,7 @@ def register_calendar(llm, state: Dict) -> Dict:
     plan_data = state.get("plan_data", {})
     
     # plan_data 존재 여부 확인 - JSON 형식과 텍스트 형식 모두 지원
-    if not (plan_data.get("content") or plan_data.get("plan_data")):
+    if NormalizedPlan.from_raw(plan_data) is None:
         error_msg = "Google Calendar 등록에 필요한 여행 계획 정보가 없습니다. 먼저 여행 계획을 생성해주세요."
         response = AIMessage(content=error_msg)
         messages.append(response)
@@ -656,6 +635,9 @@ def register_calendar(llm, state: Dict) -> Dict:
         }
     
     calendar_result = register_travel_calendar(plan_data)
+    # Google API 없이 어떤 캘린더 앱에서든 구독할 수 있는 iCalendar 피드 (Google 등록 실패 시 대안)
+    subscription = create_calendar_subscription(plan_data)
+    calendar_result["subscription"] = subscription
     
     if calendar_result["success"]:
         calendar_msg = f"""여행 계획이 Google Calendar에 성공적으로 등록되었습니다.
@@ -671,6 +653,13 @@ def register_calendar(llm, state: Dict) -> Dict:
         
         다시 시도해보시겠어요?"""
     
+    if subscription["success"]:
+        calendar_msg += f"""
+        
+        📅 다른 캘린더 앱(Apple 캘린더, Outlook 등)에서는 아래 주소를 구독하면 활동별 일정이 모두 추가됩니다.
+        - 구독 URL: {subscription['feed_url']}
+        - 바로 구독: {subscription['webcal_url']}"""
+    
     response = AIMessage(content=calendar_msg)
     messages.append(response)
     
@@ -1,9 +1,13 @@
-from typing import List, Dict, Optional
+from datetime import datetime
+from typing import Iterator, List, Dict, Optional
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from langgraph.graph import StateGraph, END
 from langgraph.store.memory import InMemoryStore
 
 from .types import ConversationState, TravelPlannerState
+from ...utils.llm_router import LLMRouter
+from ...models.plan import NormalizedPlan
+from ...utils.openai_utils import analyze_conversation_async
 from .state_handlers import (
     check_guardrail,
     understand_request, 
@@ -23,8 +27,9 @@ class TravelPlannerAgent:
     
     CONVERSATION_MEMORY_SIZE = 10
     
-    def __init__(self, llm):
+    def __init__(self, llm, provider: Optional[str] = None):
         self.llm = llm
+        self.router = LLMRouter(llm, provider)
         self.store = InMemoryStore()
         self.workflow = self._create_workflow()
         self.app = self.workflow.compile(
@@ -36,25 +41,25 @@ class TravelPlannerAgent:
         workflow = StateGraph(TravelPlannerState)
         
         workflow.add_node(str(ConversationState.CHECK_GUARDRAIL), 
-                         lambda state: check_guardrail(self.llm, state))
+                         lambda state: check_guardrail(self.router, state))
         workflow.add_node(str(ConversationState.UNDERSTAND_REQUEST), 
-                         lambda state: understand_request(self.llm, state))
+                         lambda state: understand_request(self.router, state))
         workflow.add_node(str(ConversationState.GENERATE_PLAN), 
-                         lambda state: generate_plan(self.llm, state))
+                         lambda state: generate_plan(self.router, state))
         workflow.add_node(str(ConversationState.REFINE_PLAN), 
-                         lambda state: refine_plan(self.llm, state))
+                         lambda state: refine_plan(self.router, state))
         workflow.add_node(str(ConversationState.ASK_DESTINATION), 
-                         lambda state: ask_destination(self.llm, state))
+                         lambda state: ask_destination(self.router, state))
         workflow.add_node(str(ConversationState.COLLECT_DETAILS), 
-                         lambda state: collect_details(self.llm, state))
+                         lambda state: collect_details(self.router, state))
         workflow.add_node(str(ConversationState.REGISTER_CALENDAR), 
-                         lambda state: register_calendar(self.llm, state))
+                         lambda state: register_calendar(self.router, state))
         workflow.add_node(str(ConversationState.VIEW_CALENDAR), 
-                         lambda state: view_calendar(self.llm, state))
+                         lambda state: view_calendar(self.router, state))
         workflow.add_node(str(ConversationState.MODIFY_CALENDAR), 
-                         lambda state: modify_calendar(self.llm, state))
+                         lambda state: modify_calendar(self.router, state))
         workflow.add_node(str(ConversationState.DELETE_CALENDAR), 
-                         lambda state: delete_calendar(self.llm, state))
+                         lambda state: delete_calendar(self.router, state))
         
         workflow.set_entry_point(str(ConversationState.CHECK_GUARDRAIL))
 
@@ -69,7 +74,7 @@ class TravelPlannerAgent:
 
         workflow.add_conditional_edges(
             str(ConversationState.UNDERSTAND_REQUEST),
-            lambda state: determine_next_step({**state, "llm": self.llm}),
+            lambda state: determine_next_step({**state, "llm": self.router}),
             {
                 str(ConversationState.ASK_DESTINATION): str(ConversationState.ASK_DESTINATION),
                 str(ConversationState.COLLECT_DETAILS): str(ConversationState.COLLECT_DETAILS),
@@ -130,91 +135,129 @@ class TravelPlannerAgent:
         
         return str(ConversationState.END)
 
-    def chat(self, messages: List[dict], user_preferences: Optional[Dict] = None, current_plan: Optional[Dict] = None) -> dict:
-        """Run the travel planner workflow"""
-        try:
-            base_messages = []
-            
-            if user_preferences:
-                preferences_msg = """사용자의 여행 선호도 정보:
-                - 여행 기간: {start} ~ {end}
-                - 여행지: {destination}
-                - 선호 활동: {activities}
-                - 숙소 유형: {accommodation}
-                - 이동수단: {transport}
-                - 특별 요청사항: {special_requests}
-                """.format(
-                    start=user_preferences.get("travel_dates", {}).get("start", "미정"),
-                    end=user_preferences.get("travel_dates", {}).get("end", "미정"),
-                    destination=user_preferences.get("destination", "미정"),
-                    activities=", ".join(user_preferences.get("preferences", {}).get("activities", [])),
-                    accommodation=user_preferences.get("preferences", {}).get("accommodation", "미정"),
-                    transport=user_preferences.get("preferences", {}).get("transport", "미정"),
-                    special_requests=user_preferences.get("preferences", {}).get("special_requests", "없음")
-                )
-                base_messages.append(SystemMessage(content=preferences_msg))
-            
-            for msg in messages:
-                if msg["role"] == "user":
-                    base_messages.append(HumanMessage(content=msg["content"]))
-                elif msg["role"] == "assistant":
-                    base_messages.append(AIMessage(content=msg["content"]))
-            
-            plan_data = {}
-            if current_plan:
-                # JSON 형식 계획 처리
-                if current_plan.get("plan_data"):
-                    plan_data = {
-                        "generated_at": current_plan.get("generated_at", "client"),
-                        "plan_data": current_plan.get("plan_data"),
-                        "collected_info": current_plan.get("collected_info", ""),
-                        "format": "json"
-                    }
-                # 텍스트 형식 계획 처리
-                elif current_plan.get("content"):
-                    plan_data = {
-                        "generated_at": current_plan.get("generated_at", "client"),
-                        "content": current_plan.get("content"),
-                        "collected_info": current_plan.get("collected_info", ""),
-                        "format": "text"
-                    }
+    def _build_messages(self, messages: List[dict], user_preferences: Optional[Dict] = None) -> List:
+        """요청 메시지와 선호도 정보를 LangChain 메시지 목록으로 변환"""
+        base_messages = []
+        
+        if user_preferences:
+            preferences_msg = """사용자의 여행 선호도 정보:
+            - 여행 기간: {start} ~ {end}
+            - 여행지: {destination}
+            - 선호 활동: {activities}
+            - 숙소 유형: {accommodation}
+            - 이동수단: {transport}
+            - 특별 요청사항: {special_requests}
+            """.format(
+                start=user_preferences.get("travel_dates", {}).get("start", "미정"),
+                end=user_preferences.get("travel_dates", {}).get("end", "미정"),
+                destination=user_preferences.get("destination", "미정"),
+                activities=", ".join(user_preferences.get("preferences", {}).get("activities", [])),
+                accommodation=user_preferences.get("preferences", {}).get("accommodation", "미정"),
+                transport=user_preferences.get("preferences", {}).get("transport", "미정"),
+                special_requests=user_preferences.get("preferences", {}).get("special_requests", "없음")
+            )
+            base_messages.append(SystemMessage(content=preferences_msg))
+        
+        for msg in messages:
+            if msg["role"] == "user":
+                base_messages.append(HumanMessage(content=msg["content"]))
+            elif msg["role"] == "assistant":
+                base_messages.append(AIMessage(content=msg["content"]))
+        return base_messages
+
+    async def analyze_conversation(self, messages: List[dict], user_preferences: Optional[Dict] = None) -> Dict:
+        """understand_request와 같은 최근 대화 범위를 비동기로 분석 (결과는 chat_stream의 conversation_analysis로 전달)"""
+        base_messages = self._build_messages(messages, user_preferences)
+        last_messages = base_messages[-self.CONVERSATION_MEMORY_SIZE:] if len(base_messages) >= 3 else base_messages
+        return await analyze_conversation_async(self.router, last_messages, datetime.now().year)
+
+    def _build_initial_state(
+        self,
+        messages: List[dict],
+        user_preferences: Optional[Dict] = None,
+        current_plan: Optional[Dict] = None,
+        conversation_analysis: Optional[Dict] = None
+    ) -> Dict:
+        """요청 데이터로 워크플로우 초기 상태 구성"""
+        base_messages = self._build_messages(messages, user_preferences)
+        
+        # 클라이언트가 보낸 계획은 형식 판별/변환을 한 번만 수행
+        plan = NormalizedPlan.from_raw(current_plan)
+        plan_data = plan.to_state() if plan else {}
+        
+        # conversation_state를 메시지 히스토리와 user_preferences에서 복원
+        conversation_state = {}
+        if user_preferences:
+            # user_preferences에서 기본 정보 추출
+            travel_dates = user_preferences.get("travel_dates", {})
+            if travel_dates.get("start") and travel_dates.get("end"):
+                conversation_state["travel_dates"] = f"{travel_dates['start']} ~ {travel_dates['end']}"
             
-            # conversation_state를 메시지 히스토리와 user_preferences에서 복원
-            conversation_state = {}
-            if user_preferences:
-                # user_preferences에서 기본 정보 추출
-                travel_dates = user_preferences.get("travel_dates", {})
-                if travel_dates.get("start") and travel_dates.get("end"):
-                    conversation_state["travel_dates"] = f"{travel_dates['start']} ~ {travel_dates['end']}"
-                
-                conversation_state["destination"] = user_preferences.get("destination")
-                
-                preferences = user_preferences.get("preferences", {})
-                activities = preferences.get("activities", [])
-                if activities:
-                    conversation_state["preferences"] = activities
+            conversation_state["destination"] = user_preferences.get("destination")
             
-            initial_state = {
-                "messages": base_messages,
-                "current_step": str(ConversationState.CHECK_GUARDRAIL),
-                "plan_data": plan_data,
-                "required_info": {},
-                "conversation_state": conversation_state,
-                "calendar_data": {},
-                "memory_size": self.CONVERSATION_MEMORY_SIZE
-            }
+            preferences = user_preferences.get("preferences", {})
+            activities = preferences.get("activities", [])
+            if activities:
+                conversation_state["preferences"] = activities
+        
+        initial_state = {
+            "messages": base_messages,
+            "current_step": str(ConversationState.CHECK_GUARDRAIL),
+            "plan_data": plan_data,
+            "required_info": {},
+            "conversation_state": conversation_state,
+            "calendar_data": {},
+            "conversation_analysis": conversation_analysis,
+            "memory_size": self.CONVERSATION_MEMORY_SIZE
+        }
+        return initial_state
 
+    def _format_result(self, result: Dict) -> dict:
+        """워크플로우 실행 결과를 API 응답 형식으로 변환"""
+        return {
+            "response": result["messages"][-1].content if result.get("messages") else "죄송합니다. 응답을 생성하는 중 문제가 발생했습니다.",
+            "has_plan": bool(result.get("plan_data")),
+            "plan": result.get("plan_data", {})
+        }
+
+    def chat(self, messages: List[dict], user_preferences: Optional[Dict] = None, current_plan: Optional[Dict] = None) -> dict:
+        """Run the travel planner workflow"""
+        try:
+            initial_state = self._build_initial_state(messages, user_preferences, current_plan)
             result = self.app.invoke(initial_state)
             
-            return {
-                "response": result["messages"][-1].content if result.get("messages") else "죄송합니다. 응답을 생성하는 중 문제가 발생했습니다.",
-                "has_plan": bool(result.get("plan_data")),
-                "plan": result.get("plan_data", {})
-            }
+            return self._format_result(result)
         except Exception as e:
             print(f"Error in chat: {str(e)}")
             return {
                 "response": "죄송합니다. 요청을 처리하는 중 오류가 발생했습니다.",
                 "has_plan": False,
                 "plan": {}
-            } 
\ No newline at end of file
+            }
+
+    def chat_stream(
+        self,
+        messages: List[dict],
+        user_preferences: Optional[Dict] = None,
+        current_plan: Optional[Dict] = None,
+        conversation_analysis: Optional[Dict] = None
+    ) -> Iterator[dict]:
+        """워크플로우를 스트리밍 실행하여 중간 이벤트(plan_day 등)와 최종 결과({"result": ...})를 순서대로 반환"""
+        try:
+            initial_state = self._build_initial_state(messages, user_preferences, current_plan, conversation_analysis)
+            
+            result = initial_state
+            for mode, chunk in self.app.stream(initial_state, stream_mode=["custom", "values"]):
+                if mode == "custom":
+                    yield chunk
+                else:
+                    result = chunk
+            
+            yield {"result": self._format_result(result)}
+        except Exception as e:
+            print(f"Error in chat_stream: {str(e)}")
+            yield {"result": {
+                "response": "죄송합니다. 요청을 처리하는 중 오류가 발생했습니다.",
+                "has_plan": False,
+                "plan": {}
+            }}
@@ -1,4 +1,4 @@
-from typing import TypedDict, List
+from typing import TypedDict, List, Optional
 from langchain_core.messages import BaseMessage
 from enum import Enum, auto
 
@@ -24,4 +24,6 @@ class TravelPlannerState(TypedDict):
     plan_data: dict
     required_info: dict
     conversation_state: dict
-    calendar_data: dict 
\ No newline at end of file
+    calendar_data: dict
+    # 비동기 경로에서 미리 수행한 대화 분석 결과 (없으면 understand_request에서 분석)
+    conversation_analysis: Optional[dict] 
\ No newline at end of file
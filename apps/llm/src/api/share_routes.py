@@ -0,0 +1,112 @@
+import asyncio
+import json
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
+from typing import Dict
+
+from ..agents.travel.plan_export import EXPORT_FORMATS, stream_export
+from ..models.plan import NormalizedPlan
+from ..utils.share_store import get_share_store
+
+class SharePlanRequest(BaseModel):
+    plan: Dict
+
+router = APIRouter(prefix="/share", tags=["share"])
+
+# 공유 계획 요청 본문 최대 크기 (일자별 계획 JSON은 수십 KB 수준이므로 넉넉하게)
+SHARE_PLAN_MAX_BYTES = 512 * 1024
+
+# ID가 내용 해시이므로 같은 ID의 응답은 바뀌지 않음
+SHARE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# 스냅샷은 서버가 만들지만 계획 내용은 사용자 입력이므로 인라인 스타일 외의 스크립트, 외부 리소스, 폼 전송은 모두 차단
+SNAPSHOT_CSP = "default-src 'none'; style-src 'unsafe-inline'; img-src data:; base-uri 'none'; form-action 'none'"
+
+async def read_limited_body(request: Request, max_bytes: int) -> bytes:
+    """요청 본문을 최대 크기까지만 읽기 (넘으면 끝까지 받지 않고 413)"""
+    too_large = HTTPException(status_code=413, detail=f"공유할 여행 계획이 너무 큽니다. (최대 {max_bytes // 1024}KB)")
+    if int(request.headers.get("content-length") or 0) > max_bytes:
+        raise too_large
+
+    body = bytearray()
+    async for chunk in request.stream():
+        body.extend(chunk)
+        if len(body) > max_bytes:
+            raise too_large
+    return bytes(body)
+
+@router.post("")
+async def create_share(request: Request):
+    """여행 계획을 저장하고 공유 ID 반환 (본문 크기 제한)"""
+    body = await read_limited_body(request, SHARE_PLAN_MAX_BYTES)
+    try:
+        share_request = SharePlanRequest.model_validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+    return {"id": get_share_store().save(share_request.plan)}
+
+# /{share_id}보다 먼저 등록해야 "<id>.html"이 ID로 잡히지 않음
+@router.get("/{share_id}.html")
+async def get_share_snapshot(share_id: str, request: Request):
+    """저장된 계획으로 서버가 렌더링한 정적 HTML 페이지 반환 (Streamlit 세션 없이 열람, ID별 캐시, ETag 일치 시 304)"""
+    etag = f'"{share_id}.html"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": SHARE_CACHE_CONTROL,
+        "Content-Security-Policy": SNAPSHOT_CSP,
+        "X-Content-Type-Options": "nosniff"
+    }
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    payload = get_share_store().get_payload(share_id)
+    plan = NormalizedPlan.from_raw(json.loads(payload)) if payload is not None else None
+    if plan is None:
+        raise HTTPException(status_code=404, detail="공유된 여행 계획 페이지를 찾을 수 없습니다.")
+
+    # HTML 내보내기와 같은 렌더러/캐시를 사용 (내용 해시 ID라 한 번 만든 페이지는 바뀌지 않음)
+    snapshot = await asyncio.to_thread(lambda: b"".join(stream_export(share_id, plan, "html")))
+    return Response(content=snapshot, media_type="text/html; charset=utf-8", headers=headers)
+
+@router.get("/{share_id}/export.{fmt}")
+async def export_share(share_id: str, fmt: str, request: Request):
+    """공유 계획을 md/html/json/docx/ics 파일로 내보내기 (스트리밍 응답, ID/형식별 결과 캐시, ETag 일치 시 304)"""
+    if fmt not in EXPORT_FORMATS:
+        raise HTTPException(status_code=404, detail=f"지원하지 않는 내보내기 형식입니다: {fmt}")
+
+    etag = f'"{share_id}.{fmt}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": SHARE_CACHE_CONTROL,
+        "Content-Disposition": f'attachment; filename="travel_plan_{share_id}.{fmt}"',
+        "X-Content-Type-Options": "nosniff"
+    }
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    payload = get_share_store().get_payload(share_id)
+    plan = NormalizedPlan.from_raw(json.loads(payload)) if payload is not None else None
+    if plan is None:
+        raise HTTPException(status_code=404, detail="공유된 여행 계획을 찾을 수 없습니다.")
+
+    # 동기 제너레이터라 Starlette가 스레드풀에서 순회하므로 큰 문서를 만드는 동안 이벤트 루프를 막지 않음
+    return StreamingResponse(stream_export(share_id, plan, fmt), media_type=EXPORT_FORMATS[fmt][0], headers=headers)
+
+@router.get("/{share_id}")
+async def get_share(share_id: str, request: Request):
+    """공유 ID로 저장된 계획 반환 (ETag 일치 시 304)"""
+    etag = f'"{share_id}"'
+    headers = {"ETag": etag, "Cache-Control": SHARE_CACHE_CONTROL}
+
+    # 공유된 계획은 삭제/변경되지 않으므로 클라이언트가 가진 ETag면 조회 없이 304
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    payload = get_share_store().get_payload(share_id)
+    if payload is None:
+        raise HTTPException(status_code=404, detail="공유된 여행 계획을 찾을 수 없습니다.")
+
+    return Response(content=payload, media_type="application/json", headers=headers)
@@ -1,21 +1,31 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from fastapi.responses import StreamingResponse
 from typing import List
 import json
 import asyncio
 from pydantic import BaseModel
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional, Dict
 
 from ..models.travel import ChatMessage
+from ..models.plan import NormalizedPlan
+from ..agents.travel.plan_export import stream_export
 from ..agents.travel.travel_agent import TravelPlannerAgent
-from ..utils.llm import get_llm, get_available_models
+from ..utils.llm import get_pooled_llm, DEFAULT_MODELS, LLM_POOL_SIZE
+from ..utils.model_catalog import get_model_catalog
+from ..utils.usage_metrics import get_prompt_cache_tracker
+from ..utils.prompt_registry import get_prompt_registry, prompt_assignment_key
+from ..utils.rate_limiter import get_rate_limit_stats
+from ..utils.llm_failover import get_failover_stats
+from ..utils.share_store import get_share_store
 
 class TravelPlanRequest(BaseModel):
     messages: List[ChatMessage]
     user_preferences: Optional[Dict] = None
     current_plan: Optional[Dict] = None
     llm_config: Optional[Dict] = None
+    conversation_id: Optional[str] = None
 
 class ModelConfig(BaseModel):
     provider: str
@@ -23,26 +33,55 @@ class ModelConfig(BaseModel):
 
 router = APIRouter(prefix="/travel", tags=["travel"])
 
-current_model_config = {"provider": "openai", "model": "gpt-3.5-turbo-1106"}
+DEFAULT_MODEL_CONFIG = {"provider": "openai", "model": DEFAULT_MODELS["openai"]}
 
-def get_current_agent():
-    """현재 모델 설정을 사용하여 TravelPlannerAgent 인스턴스 반환"""
-    global current_model_config
+# 계획 ID가 내용 해시이므로 피드 내용은 바뀌지 않고, 캘린더 앱의 주기적 갱신은 ETag로 304 처리
+CALENDAR_FEED_CACHE_CONTROL = "public, max-age=86400"
+
+def resolve_model_config(llm_config: Optional[Dict] = None) -> Dict:
+    """요청의 llm_config를 기본 모델 설정과 병합"""
+    if not llm_config or not llm_config.get("provider"):
+        return dict(DEFAULT_MODEL_CONFIG)
     
-    try:
-        llm = get_llm(
-            provider=current_model_config["provider"], 
-            model=current_model_config["model"]
+    provider = llm_config["provider"].lower()
+    return {"provider": provider, "model": llm_config.get("model") or DEFAULT_MODELS.get(provider)}
+
+@lru_cache(maxsize=LLM_POOL_SIZE)
+def get_agent(provider: str, model: str) -> TravelPlannerAgent:
+    """provider+model 별로 미리 생성된 TravelPlannerAgent 반환"""
+    return TravelPlannerAgent(llm=get_pooled_llm(provider=provider, model=model), provider=provider)
+
+def validate_model_config(model_config: Dict, available_models: Dict[str, List[str]]):
+    """provider/model이 카탈로그에 있는지 확인 (없으면 400)"""
+    provider = model_config["provider"]
+    if provider not in available_models:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported provider: {provider}. 사용 가능한 제공업체: {list(available_models.keys())}"
+        )
+    
+    if model_config["model"] not in available_models[provider]:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported model: {model_config['model']} for provider: {provider}"
         )
-        return TravelPlannerAgent(llm=llm)
+
+def get_current_agent(llm_config: Optional[Dict] = None):
+    """요청별 모델 설정을 사용하여 TravelPlannerAgent 인스턴스 반환 (요청이 지정한 모델은 카탈로그로 검증)"""
+    model_config = resolve_model_config(llm_config)
+    available_models = get_model_catalog().get_models()
+    
+    # 임의의 모델 문자열로 에이전트를 만들면 풀의 유효한 에이전트가 밀려나고 오류도 호출 시점에야 드러나므로 미리 거절
+    if model_config != DEFAULT_MODEL_CONFIG:
+        validate_model_config(model_config, available_models)
+    
+    try:
+        return get_agent(model_config["provider"], model_config["model"])
     except ValueError as e:
-        available_models = get_available_models()
         for provider, models in available_models.items():
             if models:
                 try:
-                    llm = get_llm(provider=provider, model=models[0])
-                    current_model_config = {"provider": provider, "model": models[0]}
-                    return TravelPlannerAgent(llm=llm)
+                    return get_agent(provider, models[0])
                 except ValueError:
                     continue
         raise HTTPException(
@@ -53,38 +92,109 @@ def get_current_agent():
 @router.get("/models")
 async def get_models():
     """사용 가능한 모델 목록 반환"""
-    return get_available_models()
+    # 캐시가 비어 있으면 제공업체 API를 기다리므로 이벤트 루프를 막지 않도록 스레드에서 조회
+    return await asyncio.to_thread(get_model_catalog().get_models)
 
 @router.post("/models/config")
 async def set_model_config(config: ModelConfig):
-    """모델 설정 변경"""
-    global current_model_config
-    available_models = get_available_models()
+    """모델 설정 검증 (선택한 설정은 /plan 요청의 llm_config로 전달)"""
+    available_models = await asyncio.to_thread(get_model_catalog().get_models)
+    validate_model_config({"provider": config.provider, "model": config.model}, available_models)
     
-    if config.provider not in available_models:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Unsupported provider: {config.provider}. 사용 가능한 제공업체: {list(available_models.keys())}"
-        )
+    try:
+        get_agent(config.provider, config.model)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    if config.model not in available_models[config.provider]:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Unsupported model: {config.model} for provider: {config.provider}"
-        )
+    return {"provider": config.provider, "model": config.model}
 
 @router.get("/models/config")
 async def get_model_config():
-    """현재 모델 설정 반환"""
-    return current_model_config
+    """기본 모델 설정 반환"""
+    return DEFAULT_MODEL_CONFIG
+
+@router.get("/metrics/prompt-cache")
+async def get_prompt_cache_metrics():
+    """LLM 호출의 프롬프트 캐시 적중 토큰 비율 반환"""
+    return get_prompt_cache_tracker().get_stats()
+
+@router.get("/metrics/prompts")
+async def get_prompt_metrics():
+    """프롬프트 템플릿 버전별 정적 토큰 수, 평균 지연시간, 평균 입력 토큰 반환"""
+    return get_prompt_registry().get_stats()
+
+@router.get("/metrics/rate-limits")
+async def get_rate_limit_metrics():
+    """provider/model 별 동시 실행 한도, 버킷 잔량, 429/대기 통계 반환"""
+    return get_rate_limit_stats()
+
+@router.get("/metrics/failover")
+async def get_failover_metrics():
+    """제공업체별 서킷 브레이커 상태와 헤지/장애 조치 횟수 반환"""
+    return get_failover_stats()
+
+@router.get("/plans/{plan_id}/calendar.ics")
+async def get_plan_calendar_feed(plan_id: str, request: Request):
+    """저장된 여행 계획의 iCalendar 구독 피드 (Google Calendar API 호출 없음, 계획 해시별 캐시, ETag 일치 시 304)"""
+    etag = f'"{plan_id}.ics"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": CALENDAR_FEED_CACHE_CONTROL,
+        "Content-Disposition": f'inline; filename="travel_plan_{plan_id}.ics"'
+    }
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    payload = get_share_store().get_payload(plan_id)
+    plan = NormalizedPlan.from_raw(json.loads(payload)) if payload is not None else None
+    if plan is None:
+        raise HTTPException(status_code=404, detail="여행 계획을 찾을 수 없습니다.")
+
+    # 캘린더 앱은 청크 전송보다 Content-Length가 있는 응답을 잘 처리하므로 한 번에 생성 (공유 내보내기와 같은 캐시 사용)
+    feed = await asyncio.to_thread(lambda: b"".join(stream_export(plan_id, plan, "ics")))
+    return Response(content=feed, media_type="text/calendar; charset=utf-8", headers=headers)
 
-async def stream_response(result: dict):
+def conversation_key(message_dicts: List[Dict]) -> Optional[str]:
+    """conversation_id가 없는 요청의 대화 식별 키 (대화 내내 바뀌지 않는 첫 사용자 메시지)"""
+    first_user_message = next((message for message in message_dicts if message.get("role") == "user"), None)
+    return first_user_message["content"] if first_user_message else None
+
+async def stream_agent_response(agent: TravelPlannerAgent, message_dicts: List[Dict], request: TravelPlanRequest):
+    """에이전트를 스트리밍 실행하며 완성된 일자별 계획을 일자 인덱스와 함께 즉시 전달한 뒤 최종 응답 전송"""
+    yield f"data: {json.dumps({'status': 'start', 'message': '여행 계획 생성을 시작합니다.'})}\n\n"
+    
+    # 같은 대화는 프롬프트 A/B 실험에서 항상 같은 버전을 받도록 배정 키 고정 (to_thread가 컨텍스트를 복사해 에이전트까지 전달)
+    prompt_assignment_key.set(request.conversation_id or conversation_key(message_dicts))
+    
+    # 대화 분석은 작업 스레드를 점유하지 않도록 이벤트 루프에서 비동기 호출
+    conversation_analysis = await agent.analyze_conversation(message_dicts, request.user_preferences)
+    events = agent.chat_stream(
+        message_dicts,
+        user_preferences=request.user_preferences,
+        current_plan=request.current_plan,
+        conversation_analysis=conversation_analysis
+    )
+    
+    result = {}
+    while (event := await asyncio.to_thread(next, events, None)) is not None:
+        if "plan_day" in event:
+            # day_index는 itinerary 안의 실제 위치 (0부터, 계획 수정 시에는 변경된 일자만 전달)
+            yield f"data: {json.dumps({'status': 'plan_day', 'day_index': event.get('day_index'), 'day': event['plan_day']}, ensure_ascii=False)}\n\n"
+        elif "result" in event:
+            result = event["result"]
+    
+    async for chunk in stream_response(result, send_start=False):
+        yield chunk
+
+async def stream_response(result: dict, send_start: bool = True):
     """스트리밍 응답 생성기"""
     response_text = result.get("response", "")
     chunk_size = 50
     
-    yield f"data: {json.dumps({'status': 'start', 'message': '여행 계획 생성을 시작합니다.'})}\n\n"
-    await asyncio.sleep(0.01)
+    if send_start:
+        yield f"data: {json.dumps({'status': 'start', 'message': '여행 계획 생성을 시작합니다.'})}\n\n"
+        await asyncio.sleep(0.01)
     
     progress_states = [
         ("분석", "여행 선호도를 분석하고 있습니다..."),
@@ -147,18 +257,14 @@ async def create_travel_plan(request: TravelPlanRequest):
             }
             message_dicts.insert(0, preferences_msg)
         
-        agent = get_current_agent()
-        
-        result = agent.chat(
-            message_dicts, 
-            user_preferences=request.user_preferences,
-            current_plan=request.current_plan
-        )
+        agent = await asyncio.to_thread(get_current_agent, request.llm_config)
         
         return StreamingResponse(
-            stream_response(result),
+            stream_agent_response(agent, message_dicts, request),
             media_type="text/event-stream"
         )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
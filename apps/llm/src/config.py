@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Optional
 from dotenv import load_dotenv
 import os
 
@@ -11,6 +12,35 @@ class Settings(BaseSettings):
     kakao_api_key: str = os.getenv("KAKAO_API_KEY")
     anthropic_api_key: str = os.getenv("ANTHROPIC_API_KEY")
     
+    # 작업 유형별 모델 지정 ("provider:model" 형식, 미지정 시 기본 라우팅 사용)
+    classify_model: Optional[str] = os.getenv("CLASSIFY_MODEL")
+    extract_model: Optional[str] = os.getenv("EXTRACT_MODEL")
+    chat_model: Optional[str] = os.getenv("CHAT_MODEL")
+    generate_model: Optional[str] = os.getenv("GENERATE_MODEL")
+    
+    # 장기 여행 일자별 상세 계획 동시 생성 수
+    plan_day_concurrency: int = int(os.getenv("PLAN_DAY_CONCURRENCY", "4"))
+    
+    # LLM API 호출 타임아웃(초), 재시도 횟수, 공유 HTTP 연결 풀 크기
+    llm_timeout: float = float(os.getenv("LLM_TIMEOUT", "60"))
+    llm_max_retries: int = int(os.getenv("LLM_MAX_RETRIES", "2"))
+    llm_max_connections: int = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+    
+    # provider/model 별 호출 제한 (분당 요청/토큰 수, 최대 동시 실행 수, 대기열 deadline(초))
+    llm_requests_per_minute: int = int(os.getenv("LLM_RPM", "500"))
+    llm_tokens_per_minute: int = int(os.getenv("LLM_TPM", "200000"))
+    llm_max_concurrency: int = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+    llm_queue_timeout: float = float(os.getenv("LLM_QUEUE_TIMEOUT", "30"))
+    
+    # 공유된 여행 계획 SQLite 파일 경로
+    share_db_path: str = os.getenv("SHARE_DB_PATH", "shares.db")
+    
+    # 사용자에게 안내하는 API 서버 주소 (캘린더 구독 URL 등)
+    public_api_url: str = os.getenv("PUBLIC_API_URL", "http://localhost:8000")
+    
+    # 프롬프트 A/B 실험 버전별 가중치 (JSON, 예: {"plan_generation": {"v1": 0.5, "v2": 0.5}})
+    prompt_experiments: Optional[str] = os.getenv("PROMPT_EXPERIMENTS")
+    
     class Config:
         env_file = ".env"
         env_file_encoding = 'utf-8'
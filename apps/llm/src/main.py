@@ -1,11 +1,20 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .api import travel_routes
+from .api import travel_routes, share_routes
+from .utils.model_catalog import get_model_catalog
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """서버 시작 시 모델 목록 미리 가져오기"""
+    get_model_catalog().warm_up()
+    yield
 
 app = FastAPI(
     title="Travel Gene LLM Service",
     description="LLM Service for Travel Gene application",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -17,6 +26,7 @@ app.add_middleware(
 )
 
 app.include_router(travel_routes.router)
+app.include_router(share_routes.router)
 
 @app.get("/")
 async def root():
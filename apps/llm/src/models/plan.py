@@ -0,0 +1,71 @@
+from typing import Any, Dict, List, Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field
+
+PLAN_FORMAT_JSON = "json"
+PLAN_FORMAT_TEXT = "text"
+PLAN_FORMAT_LEGACY = "legacy"
+
+class NormalizedPlan(BaseModel):
+    """형식(JSON/텍스트/이전 딕셔너리)에 관계없이 한 번만 정규화한 여행 계획 (클라이언트 plan_parser.NormalizedPlan과 같은 형식 구분)"""
+    model_config = ConfigDict(frozen=True)
+
+    format: Literal["json", "text", "legacy"] = Field(..., description="계획 형식")
+    plan_data: Optional[Dict[str, Any]] = Field(None, description="JSON 형식 계획 본문")
+    content: str = Field("", description="텍스트 형식 계획 본문")
+    collected_info: str = Field("", description="계획 생성 시 수집된 여행 정보")
+    generated_at: str = Field("client", description="계획을 만든 단계")
+    destination: Optional[str] = Field(None, description="여행지 (JSON/이전 형식만)")
+    start_date: Optional[str] = Field(None, description="시작일 (JSON/이전 형식만)")
+    end_date: Optional[str] = Field(None, description="종료일 (JSON/이전 형식만)")
+    summary: str = Field("", description="여행 요약")
+    itinerary: List[Dict[str, Any]] = Field(default_factory=list, description="일자별 일정 (JSON/이전 형식만)")
+
+    @classmethod
+    def from_raw(cls, raw: Optional[Dict]) -> Optional["NormalizedPlan"]:
+        """요청/상태의 계획 딕셔너리에서 형식을 판별해 정규화 (계획이 없으면 None)"""
+        if not isinstance(raw, dict):
+            return None
+
+        common = {
+            "collected_info": raw.get("collected_info") or "",
+            "generated_at": raw.get("generated_at") or "client"
+        }
+
+        if isinstance(raw.get("plan_data"), dict):
+            plan_data = raw["plan_data"]
+            overview = plan_data.get("travel_overview") or {}
+            return cls(
+                format=PLAN_FORMAT_JSON,
+                plan_data=plan_data,
+                destination=overview.get("destination"),
+                start_date=overview.get("start_date"),
+                end_date=overview.get("end_date"),
+                summary=overview.get("summary") or "",
+                itinerary=plan_data.get("itinerary") or [],
+                **common
+            )
+
+        if raw.get("content"):
+            return cls(format=PLAN_FORMAT_TEXT, content=raw["content"], **common)
+
+        if raw.get("itinerary") or raw.get("travel_dates") or raw.get("destination"):
+            travel_dates = raw.get("travel_dates") or {}
+            return cls(
+                format=PLAN_FORMAT_LEGACY,
+                destination=raw.get("destination"),
+                start_date=travel_dates.get("start"),
+                end_date=travel_dates.get("end"),
+                itinerary=raw.get("itinerary") or [],
+                **common
+            )
+
+        return None
+
+    def to_state(self) -> Dict:
+        """워크플로우 상태의 plan_data 딕셔너리로 변환 (워크플로우가 다루지 않는 이전 형식은 빈 딕셔너리)"""
+        state = {"generated_at": self.generated_at, "collected_info": self.collected_info, "format": self.format}
+        if self.format == PLAN_FORMAT_JSON:
+            return {**state, "plan_data": self.plan_data}
+        if self.format == PLAN_FORMAT_TEXT:
+            return {**state, "content": self.content}
+        return {}
@@ -1,8 +1,30 @@
 from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
+import anthropic
 import openai
 import requests
+import httpx
+from functools import lru_cache
 from ..config import get_settings
+from .usage_metrics import get_prompt_cache_tracker
+from .rate_limiter import get_rate_limiter
+
+DEFAULT_MODELS = {
+    "openai": "gpt-3.5-turbo-1106",
+    "anthropic": "claude-3-haiku-20240307"
+}
+LLM_POOL_SIZE = 16
+
+@lru_cache(maxsize=1)
+def get_http_clients():
+    """LLM 인스턴스들이 공유하는 (동기, 비동기) httpx 클라이언트 반환 (연결 재사용)"""
+    settings = get_settings()
+    limits = httpx.Limits(
+        max_connections=settings.llm_max_connections,
+        max_keepalive_connections=settings.llm_max_connections
+    )
+    timeout = httpx.Timeout(settings.llm_timeout)
+    return httpx.Client(limits=limits, timeout=timeout), httpx.AsyncClient(limits=limits, timeout=timeout)
 
 def get_llm(provider: str = "openai", model: str = None):
     """Get configured LLM instance based on provider and model"""
@@ -13,28 +35,57 @@ def get_llm(provider: str = "openai", model: str = None):
             raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다. .env 파일에 OPENAI_API_KEY를 추가해주세요.")
         
         if model is None:
-            model = "gpt-3.5-turbo-1106"
+            model = DEFAULT_MODELS["openai"]
         
+        http_client, http_async_client = get_http_clients()
+        rate_limiter = get_rate_limiter("openai", model)
         return ChatOpenAI(
             api_key=settings.openai_api_key,
             model=model,
-            temperature=0.7
+            temperature=0.7,
+            stream_usage=True,
+            timeout=settings.llm_timeout,
+            max_retries=settings.llm_max_retries,
+            http_client=http_client,
+            http_async_client=http_async_client,
+            rate_limiter=rate_limiter,
+            callbacks=[get_prompt_cache_tracker(), rate_limiter]
         )
     elif provider.lower() == "anthropic":
         if not settings.anthropic_api_key:
             raise ValueError("ANTHROPIC_API_KEY가 설정되지 않았습니다. .env 파일에 ANTHROPIC_API_KEY를 추가해주세요.")
         
         if model is None:
-            model = "claude-3-haiku-20240307"
+            model = DEFAULT_MODELS["anthropic"]
         
-        return ChatAnthropic(
+        http_client, http_async_client = get_http_clients()
+        rate_limiter = get_rate_limiter("anthropic", model)
+        llm = ChatAnthropic(
             api_key=settings.anthropic_api_key,
             model=model,
-            temperature=0.7
+            temperature=0.7,
+            timeout=settings.llm_timeout,
+            max_retries=settings.llm_max_retries,
+            rate_limiter=rate_limiter,
+            callbacks=[get_prompt_cache_tracker(), rate_limiter]
         )
+        # ChatAnthropic은 http_client 인자가 없어 지연 생성되는 SDK 클라이언트를 공유 httpx 클라이언트로 미리 생성
+        client_params = {"api_key": settings.anthropic_api_key, "max_retries": settings.llm_max_retries, "timeout": settings.llm_timeout}
+        llm._client = anthropic.Client(**client_params, http_client=http_client)
+        llm._async_client = anthropic.AsyncClient(**client_params, http_client=http_async_client)
+        return llm
     else:
         raise ValueError(f"Unsupported provider: {provider}")
 
+def get_pooled_llm(provider: str = "openai", model: str = None):
+    """provider+model 별로 미리 생성된 LLM 인스턴스 반환"""
+    provider = provider.lower()
+    return _build_pooled_llm(provider, model or DEFAULT_MODELS.get(provider))
+
+@lru_cache(maxsize=LLM_POOL_SIZE)
+def _build_pooled_llm(provider: str, model: str):
+    return get_llm(provider=provider, model=model)
+
 def get_openai_models(api_key: str):
     """OpenAI API에서 사용 가능한 모델 목록 가져오기"""
     try:
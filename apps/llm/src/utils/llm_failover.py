@@ -0,0 +1,297 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+import anthropic
+import httpx
+import openai
+
+from .llm import get_pooled_llm, DEFAULT_MODELS
+from .llm_router import detect_provider, TASK_MODELS
+from .model_catalog import get_model_catalog
+from .prompt_cache import adapt_messages
+from .rate_limiter import LLMQueueTimeout
+
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_OPEN_SECONDS = 30
+HEDGE_MIN_SAMPLES = 20
+HEDGE_PERCENTILE = 0.95
+LATENCY_WINDOW = 200
+HEDGE_WORKERS = 16
+# 일시적 장애로 보는 예외 (연결 오류, 타임아웃) - 그 외에는 상태 코드가 429/5xx일 때만 일시적 장애
+TRANSIENT_ERRORS = (openai.APIConnectionError, anthropic.APIConnectionError, httpx.TransportError, TimeoutError, ConnectionError)
+
+class CircuitBreaker:
+    """제공업체별 서킷 브레이커 (연속 실패 시 일정 시간 차단 후 시험 호출 1회 허용)"""
+
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD, open_seconds: float = CIRCUIT_OPEN_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_started_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """closed(정상) / open(차단) / half_open(시험 호출 가능)"""
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self.opened_at >= self.open_seconds else "open"
+
+    def allow(self) -> bool:
+        """호출 허용 여부 (half-open 상태에서는 시험 호출 하나만 허용)"""
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            # 결과가 기록되지 않은 시험 호출은 차단 시간이 지나면 만료
+            now = time.monotonic()
+            if state == "half_open" and (self._trial_started_at is None or now - self._trial_started_at >= self.open_seconds):
+                self._trial_started_at = now
+                return True
+            return False
+
+    def record_success(self):
+        """성공 시 실패 횟수 초기화 및 차단 해제"""
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_started_at = None
+
+    def record_failure(self):
+        """실패 누적 (임계치 도달 또는 시험 호출 실패 시 차단)"""
+        with self._lock:
+            self.failures += 1
+            self._trial_started_at = None
+            if self.failures >= self.failure_threshold or self.opened_at is not None:
+                self.opened_at = time.monotonic()
+
+class LatencyTracker:
+    """호출 종류별 최근 지연시간으로 헤지 요청 지연 기준(p95) 계산"""
+
+    def __init__(self):
+        self._latencies: Dict[Tuple[str, str], deque] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: Tuple[str, str], latency: float):
+        """(모델, 호출 종류) 별 지연시간 기록"""
+        with self._lock:
+            self._latencies.setdefault(key, deque(maxlen=LATENCY_WINDOW)).append(latency)
+
+    def hedge_delay(self, key: Tuple[str, str]) -> Optional[float]:
+        """p95 지연시간 (표본이 부족하면 None, 헤지하지 않음)"""
+        with self._lock:
+            latencies = sorted(self._latencies.get(key, ()))
+        if len(latencies) < HEDGE_MIN_SAMPLES:
+            return None
+        return latencies[min(len(latencies) - 1, int(len(latencies) * HEDGE_PERCENTILE))]
+
+circuit_breakers = {provider: CircuitBreaker() for provider in DEFAULT_MODELS}
+latency_tracker = LatencyTracker()
+hedge_executor = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="llm-hedge")
+hedge_stats = {"hedged": 0, "hedge_wins": 0, "failovers": 0}
+hedge_stats_lock = threading.Lock()
+
+def _count(key: str):
+    """헤지/장애 조치 횟수 집계"""
+    with hedge_stats_lock:
+        hedge_stats[key] += 1
+
+def get_model_name(llm: Any) -> str:
+    """LLM 인스턴스의 모델명"""
+    return getattr(llm, "model_name", None) or getattr(llm, "model", None) or ""
+
+def _fallback_model(provider: str, model: str) -> Optional[Tuple[str, str]]:
+    """다른 제공업체의 같은 등급 모델 선택 (모델 목록에 없는 제공업체면 None)"""
+    other = next((name for name in DEFAULT_MODELS if name != provider), None)
+    available = get_model_catalog().get_models().get(other)
+    if other is None or available is None:
+        return None
+
+    task = next((task for task, task_model in TASK_MODELS.get(provider, {}).items() if task_model == model), None)
+    candidates = [TASK_MODELS[other].get(task) if task else None, DEFAULT_MODELS[other]]
+    for candidate in candidates:
+        if candidate and (not available or candidate in available):
+            return other, candidate
+    return other, available[0]
+
+def get_fallback_llm(llm: Any) -> Optional[Any]:
+    """장애 조치용 다른 제공업체 LLM 반환 (사용할 수 없으면 None)"""
+    fallback = _fallback_model(detect_provider(llm), get_model_name(llm))
+    if fallback is None:
+        return None
+    try:
+        return get_pooled_llm(provider=fallback[0], model=fallback[1])
+    except ValueError as e:
+        print(f"장애 조치용 모델 생성 실패: {e}")
+        return None
+
+def is_transient_error(error: BaseException) -> bool:
+    """제공업체의 일시적 장애(연결 오류, 타임아웃, 429, 5xx) 여부 (400/인증/컨텍스트 길이/스키마 오류는 False)"""
+    if isinstance(error, TRANSIENT_ERRORS):
+        return True
+    status_code = getattr(error, "status_code", None)
+    return isinstance(status_code, int) and (status_code == 429 or status_code >= 500)
+
+def _should_fail_over(error: BaseException) -> bool:
+    """다른 제공업체로 재시도할 오류인지 (일시적 장애 또는 이 제공업체의 로컬 대기열 시간 초과)"""
+    return isinstance(error, LLMQueueTimeout) or is_transient_error(error)
+
+def _timed_call(call: Callable[[Any, List], Any], llm: Any, messages: List, name: str):
+    """호출 결과에 따라 서킷 브레이커와 지연시간 기록"""
+    provider = detect_provider(llm)
+    started = time.monotonic()
+    try:
+        result = call(llm, adapt_messages(messages, provider))
+    except Exception as e:
+        # 잘못된 요청 같은 호출 자체의 오류로 제공업체 전체가 차단되지 않도록 일시적 장애만 실패로 기록
+        if is_transient_error(e):
+            circuit_breakers[provider].record_failure()
+        raise
+
+    circuit_breakers[provider].record_success()
+    latency_tracker.record((get_model_name(llm), name), time.monotonic() - started)
+    return result
+
+def invoke_with_failover(llm: Any, messages: List, call: Callable[[Any, List], Any], name: str = "invoke"):
+    """LLM 호출 (p95보다 늦어지면 다른 제공업체로 헤지 요청, 일시적 장애/차단 시 자동 장애 조치)
+
+    call(llm, messages)는 대상 LLM에 맞게 변환된 메시지로 호출을 수행. 헤지 요청에서 진 쪽 호출은
+    취소할 수 없으므로 백그라운드에서 끝나도록 두고 먼저 성공한 결과를 반환.
+    """
+    primary_provider = detect_provider(llm)
+    fallback = get_fallback_llm(llm)
+    fallback_allowed = lambda: fallback is not None and circuit_breakers[detect_provider(fallback)].allow()
+
+    # 기본 제공업체가 차단되면 바로 장애 조치 (양쪽 모두 차단된 경우 기본 제공업체로 시도)
+    if not circuit_breakers[primary_provider].allow() and fallback_allowed():
+        _count("failovers")
+        return _timed_call(call, fallback, messages, name)
+
+    delay = latency_tracker.hedge_delay((get_model_name(llm), name)) if fallback is not None else None
+    if delay is None:
+        try:
+            return _timed_call(call, llm, messages, name)
+        except Exception as e:
+            if not _should_fail_over(e) or not fallback_allowed():
+                raise
+            print(f"{primary_provider} 호출 실패, 다른 제공업체로 재시도: {e}")
+            _count("failovers")
+            return _timed_call(call, fallback, messages, name)
+
+    primary = hedge_executor.submit(_timed_call, call, llm, messages, name)
+    done, _ = wait([primary], timeout=delay)
+    if done and (primary.exception() is None or not _should_fail_over(primary.exception())):
+        return primary.result()
+
+    if not fallback_allowed():
+        return primary.result()
+
+    hedged = not done
+    _count("hedged" if hedged else "failovers")
+    pending = {primary, hedge_executor.submit(_timed_call, call, fallback, messages, name)} - done
+    error = primary.exception() if done else None
+    while pending:
+        finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in finished:
+            if future.exception() is None:
+                if hedged and future is not primary:
+                    _count("hedge_wins")
+                return future.result()
+            error = future.exception()
+    raise error
+
+async def _atimed_call(call: Callable[[Any, List], Awaitable[Any]], llm: Any, messages: List, name: str):
+    """_timed_call의 비동기 버전"""
+    provider = detect_provider(llm)
+    started = time.monotonic()
+    try:
+        result = await call(llm, adapt_messages(messages, provider))
+    except Exception as e:
+        if is_transient_error(e):
+            circuit_breakers[provider].record_failure()
+        raise
+
+    circuit_breakers[provider].record_success()
+    latency_tracker.record((get_model_name(llm), name), time.monotonic() - started)
+    return result
+
+async def ainvoke_with_failover(llm: Any, messages: List, call: Callable[[Any, List], Awaitable[Any]], name: str = "invoke"):
+    """비동기 LLM 호출에 서킷 브레이커와 장애 조치 적용 (일시적 장애/차단 시 다른 제공업체로 재시도, 헤지 요청은 하지 않음)
+
+    call(llm, messages)는 대상 LLM에 맞게 변환된 메시지로 호출하는 코루틴 함수. 서킷 상태와 지연시간 기록은
+    동기 호출과 공유.
+    """
+    primary_provider = detect_provider(llm)
+    fallback = get_fallback_llm(llm)
+    fallback_allowed = lambda: fallback is not None and circuit_breakers[detect_provider(fallback)].allow()
+
+    # 기본 제공업체가 차단되면 바로 장애 조치 (양쪽 모두 차단된 경우 기본 제공업체로 시도)
+    if not circuit_breakers[primary_provider].allow() and fallback_allowed():
+        _count("failovers")
+        return await _atimed_call(call, fallback, messages, name)
+
+    try:
+        return await _atimed_call(call, llm, messages, name)
+    except Exception as e:
+        if not _should_fail_over(e) or not fallback_allowed():
+            raise
+        print(f"{primary_provider} 호출 실패, 다른 제공업체로 재시도: {e}")
+        _count("failovers")
+        return await _atimed_call(call, fallback, messages, name)
+
+def stream_with_failover(llm: Any, messages: List, stream: Callable[[Any, List], Iterator], name: str = "stream") -> Iterator:
+    """스트리밍 호출에 서킷 브레이커와 장애 조치 적용 (첫 조각을 받기 전에 일시적 장애/차단이면 다른 제공업체로 스트리밍)
+
+    stream(llm, messages)는 대상 LLM에 맞게 변환된 메시지로 조각을 순서대로 반환. 첫 조각 이후의 실패는
+    이미 전달한 내용과 이어 붙일 수 없으므로 그대로 전파.
+    """
+    fallback = get_fallback_llm(llm)
+    fallback_allowed = lambda: fallback is not None and circuit_breakers[detect_provider(fallback)].allow()
+
+    # 기본 제공업체가 차단되면 바로 장애 조치 (양쪽 모두 차단된 경우 기본 제공업체로 시도)
+    if not circuit_breakers[detect_provider(llm)].allow() and fallback_allowed():
+        _count("failovers")
+        targets = [fallback]
+    else:
+        targets = [llm, fallback] if fallback is not None else [llm]
+
+    for index, target in enumerate(targets):
+        provider = detect_provider(target)
+        started = time.monotonic()
+        received = False
+        try:
+            for chunk in stream(target, adapt_messages(messages, provider)):
+                received = True
+                yield chunk
+        except Exception as e:
+            if is_transient_error(e):
+                circuit_breakers[provider].record_failure()
+            if received or index == len(targets) - 1 or not _should_fail_over(e) or not fallback_allowed():
+                raise
+            print(f"{provider} 스트리밍 실패, 다른 제공업체로 재시도: {e}")
+            _count("failovers")
+            continue
+
+        circuit_breakers[provider].record_success()
+        latency_tracker.record((get_model_name(target), name), time.monotonic() - started)
+        return
+
+def invoke_llm(llm: Any, messages: List, name: str = "invoke"):
+    """일반 LLM 호출에 장애 조치/헤지 적용"""
+    return invoke_with_failover(llm, messages, lambda target_llm, target_messages: target_llm.invoke(target_messages), name)
+
+def get_failover_stats() -> Dict:
+    """제공업체별 서킷 상태와 헤지/장애 조치 횟수 반환"""
+    with hedge_stats_lock:
+        counts = dict(hedge_stats)
+    return {
+        "circuits": {
+            provider: {"state": breaker.state, "failures": breaker.failures}
+            for provider, breaker in circuit_breakers.items()
+        },
+        **counts
+    }
@@ -0,0 +1,63 @@
+from typing import Any, Optional, Tuple
+from ..config import get_settings
+from .llm import get_pooled_llm
+
+TASK_CLASSIFY = "classify"
+TASK_EXTRACT = "extract"
+TASK_CHAT = "chat"
+TASK_GENERATE = "generate"
+
+# 작업 유형별 기본 모델 (None이면 사용자가 선택한 모델 사용)
+TASK_MODELS = {
+    "openai": {
+        TASK_CLASSIFY: "gpt-4o-mini",
+        TASK_EXTRACT: "gpt-4o-mini",
+        TASK_CHAT: None,
+        TASK_GENERATE: None
+    },
+    "anthropic": {
+        TASK_CLASSIFY: "claude-3-haiku-20240307",
+        TASK_EXTRACT: "claude-3-haiku-20240307",
+        TASK_CHAT: None,
+        TASK_GENERATE: None
+    }
+}
+
+def detect_provider(llm: Any) -> str:
+    """LLM 인스턴스의 제공업체 추정"""
+    return "anthropic" if "anthropic" in str(type(llm)).lower() else "openai"
+
+def get_task_model(provider: str, task: str) -> Optional[Tuple[str, str]]:
+    """작업 유형에 지정된 (provider, model) 반환 (환경변수 설정 우선)"""
+    override = getattr(get_settings(), f"{task}_model", None)
+    if override and ":" in override:
+        override_provider, model = override.split(":", 1)
+        return override_provider.strip().lower(), model.strip()
+
+    model = TASK_MODELS.get(provider, {}).get(task)
+    return (provider, model) if model else None
+
+class LLMRouter:
+    """작업 유형(classify, extract, chat, generate)에 따라 모델을 선택하는 라우터"""
+
+    def __init__(self, llm, provider: Optional[str] = None):
+        self.llm = llm
+        self.provider = provider or detect_provider(llm)
+
+    def for_task(self, task: str):
+        """작업 유형에 맞는 LLM 인스턴스 반환 (생성 실패 시 선택된 모델 사용)"""
+        task_model = get_task_model(self.provider, task)
+        if task_model is None:
+            return self.llm
+
+        try:
+            return get_pooled_llm(provider=task_model[0], model=task_model[1])
+        except ValueError as e:
+            print(f"{task} 작업용 모델 생성 실패, 기본 모델 사용: {e}")
+            return self.llm
+
+def route_llm(llm, task: str):
+    """라우터가 전달된 경우 작업 유형에 맞는 모델로 분기"""
+    if isinstance(llm, LLMRouter):
+        return llm.for_task(task)
+    return llm
@@ -0,0 +1,80 @@
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from .llm import get_available_models
+
+MODEL_CATALOG_TTL = 600
+# 조회 실패 후 다시 시도하기까지의 시간 (실패가 요청마다 동기 재조회로 이어지지 않도록)
+MODEL_CATALOG_FAILURE_TTL = 30
+
+class ModelCatalog:
+    """제공업체별 모델 목록 캐시 (만료 시 이전 목록을 반환하고 백그라운드에서 갱신)"""
+
+    def __init__(self, fetcher: Callable[[], Dict[str, List[str]]] = get_available_models, ttl: int = MODEL_CATALOG_TTL):
+        self._fetcher = fetcher
+        self._ttl = ttl
+
+        self._models: Optional[Dict[str, List[str]]] = None
+        self._timestamp = 0.0
+        self._failed_at = 0.0
+        self._lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+
+    def _is_fresh(self) -> bool:
+        """캐시 유효성 검사"""
+        return time.time() - self._timestamp < self._ttl
+
+    def _recently_failed(self) -> bool:
+        """최근 조회 실패 여부 (실패 캐시 유효 시간 안이면 다시 조회하지 않음)"""
+        return time.time() - self._failed_at < MODEL_CATALOG_FAILURE_TTL
+
+    def _refresh(self):
+        """제공업체 API에서 모델 목록을 다시 가져와 캐시 갱신"""
+        try:
+            models = self._fetcher()
+            with self._lock:
+                self._models = models
+                self._timestamp = time.time()
+        except Exception as e:
+            print(f"모델 목록 갱신 실패: {e}")
+            with self._lock:
+                self._failed_at = time.time()
+        finally:
+            with self._lock:
+                self._refresh_thread = None
+
+    def refresh_in_background(self) -> threading.Thread:
+        """갱신 스레드 시작 (이미 갱신 중이면 진행 중인 스레드 반환)"""
+        with self._lock:
+            if self._refresh_thread is None:
+                self._refresh_thread = threading.Thread(target=self._refresh, daemon=True)
+                self._refresh_thread.start()
+            return self._refresh_thread
+
+    def warm_up(self):
+        """서버 시작 시 모델 목록 미리 가져오기"""
+        self.refresh_in_background()
+
+    def get_models(self) -> Dict[str, List[str]]:
+        """캐시된 모델 목록 반환 (최초 조회 시에만 갱신 완료를 기다리므로 async 경로에서는 스레드에서 호출)"""
+        models = self._models
+        if models is None:
+            if self._recently_failed():
+                return {}
+            self.refresh_in_background().join()
+            return self._models or {}
+
+        if not self._is_fresh() and not self._recently_failed():
+            self.refresh_in_background()
+
+        return models
+
+model_catalog = None
+
+def get_model_catalog() -> ModelCatalog:
+    """모델 카탈로그 인스턴스 반환"""
+    global model_catalog
+    if model_catalog is None:
+        model_catalog = ModelCatalog()
+    return model_catalog
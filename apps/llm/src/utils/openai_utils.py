@@ -1,164 +1,65 @@
-import os
 import json
 from typing import Dict, List, Any
-from openai import OpenAI
-from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
+from .llm_router import route_llm, TASK_EXTRACT
+from .prompt_cache import build_prompt
+from .prompt_registry import get_prompt_registry
+from .structured_output import ainvoke_json_schema, invoke_json_schema
 
-_client = None
-
-def get_openai_client():
-    """OpenAI 클라이언트를 가져옵니다."""
-    global _client
-    if _client is None:
-        _client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
-    return _client
-
-def is_openai_model(llm: Any) -> bool:
-    """LLM이 OpenAI 모델인지 확인합니다."""
-    llm_type = str(type(llm)).lower()
-    return "openai" in llm_type or "chatgpt" in llm_type or "gpt" in llm_type
-
-def extract_json_from_response(response: str) -> Dict:
-    """응답에서 JSON 부분을 추출합니다."""
-    try:
-        json_start = response.find('{')
-        json_end = response.rfind('}') + 1
-        
-        if json_start >= 0 and json_end > 0:
-            json_str = response[json_start:json_end]
-            return json.loads(json_str)
-        return {}
-    except:
-        return {}
-
-def request_json_response(
-    messages: List[Dict], 
-    json_schema: Dict,
-    model: str = "gpt-4-1106-preview"
-) -> Dict:
-    """
-    OpenAI의 Structured Outputs 기능을 사용하여 JSON 형식의 응답을 강제합니다.
-    
-    Args:
-        messages: OpenAI 형식의 메시지 리스트
-        json_schema: 응답의 JSON 스키마 (프롬프트에 포함하여 안내)
-        model: 사용할 OpenAI 모델
-        
-    Returns:
-        Dict: JSON 응답
-    """
-    try:
-        has_system_message = False
-        for msg in messages:
-            if msg.get("role") == "system":
-                has_system_message = True
-                msg["content"] = f"{msg['content']}\n\n응답은 반드시 다음 JSON 스키마를 따라야 합니다:\n{json.dumps(json_schema, ensure_ascii=False)}"
-                break
-        
-        if not has_system_message:
-            messages.insert(0, {
-                "role": "system",
-                "content": f"응답은 반드시 다음 JSON 스키마를 따라야 합니다:\n{json.dumps(json_schema, ensure_ascii=False)}"
-            })
-        
-        response = get_openai_client().chat.completions.create(
-            model=model,
-            messages=messages,
-            response_format={"type": "json_object"},
-            temperature=0.1,
-        )
-        
-        content = response.choices[0].message.content
-        return json.loads(content)
-    except Exception as e:
-        return {}
-
-def convert_langchain_messages_to_openai_format(messages: List) -> List[Dict]:
-    """LangChain 메시지 형식을 OpenAI 형식으로 변환합니다."""
-    openai_messages = []
-    
-    for msg in messages:
-        if isinstance(msg, SystemMessage):
-            openai_messages.append({"role": "system", "content": msg.content})
-        elif isinstance(msg, HumanMessage):
-            openai_messages.append({"role": "user", "content": msg.content})
-        elif isinstance(msg, AIMessage):
-            openai_messages.append({"role": "assistant", "content": msg.content})
-    
-    return openai_messages
-
-def analyze_conversation_with_json_structure(
-    llm: Any,
-    messages: List,
-    current_year: int
-) -> Dict:
-    """
-    대화를 분석하고 JSON 구조로 결과를 반환합니다.
-    LLM이 OpenAI 모델인 경우 Structured Outputs 기능을 사용합니다.
-    
-    Args:
-        llm: 언어 모델
-        messages: 분석할 메시지 리스트
-        current_year: 현재 연도
-        
-    Returns:
-        Dict: 분석 결과 (JSON 형식)
-    """
-    json_schema = {
-        "type": "object",
-        "properties": {
-            "core_info": {
-                "type": "object",
-                "properties": {
-                    "destination": {"type": ["string", "null"]},
-                    "dates": {"type": ["string", "null"]},
-                    "duration": {"type": ["integer", "null"]},
-                    "date_validation": {
-                        "type": "object",
-                        "properties": {
-                            "is_valid": {"type": "boolean"},
-                            "original": {"type": "string"},
-                            "corrected": {"type": "string"}
-                        }
-                    },
-                    "preferences": {
-                        "type": "array",
-                        "items": {"type": "string"}
+CONVERSATION_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "core_info": {
+            "type": "object",
+            "properties": {
+                "destination": {"type": ["string", "null"]},
+                "dates": {"type": ["string", "null"]},
+                "duration": {"type": ["integer", "null"]},
+                "date_validation": {
+                    "type": "object",
+                    "properties": {
+                        "is_valid": {"type": "boolean"},
+                        "original": {"type": "string"},
+                        "corrected": {"type": "string"}
                     }
+                },
+                "preferences": {
+                    "type": "array",
+                    "items": {"type": "string"}
                 }
-            },
-            "context": {
-                "type": "object",
-                "properties": {
-                    "current_topic": {"type": "string"},
-                    "related_to_previous": {"type": "boolean"},
-                    "user_interests": {
-                        "type": "array",
-                        "items": {"type": "string"}
-                    }
+            }
+        },
+        "context": {
+            "type": "object",
+            "properties": {
+                "current_topic": {"type": "string"},
+                "related_to_previous": {"type": "boolean"},
+                "user_interests": {
+                    "type": "array",
+                    "items": {"type": "string"}
                 }
-            },
-            "next_steps": {
-                "type": "object",
-                "properties": {
-                    "required_info": {
-                        "type": "array",
-                        "items": {"type": "string"}
-                    },
-                    "suggested_questions": {
-                        "type": "array",
-                        "items": {"type": "string"}
-                    },
-                    "recommendations": {
-                        "type": "array",
-                        "items": {"type": "string"}
-                    }
+            }
+        },
+        "next_steps": {
+            "type": "object",
+            "properties": {
+                "required_info": {
+                    "type": "array",
+                    "items": {"type": "string"}
+                },
+                "suggested_questions": {
+                    "type": "array",
+                    "items": {"type": "string"}
+                },
+                "recommendations": {
+                    "type": "array",
+                    "items": {"type": "string"}
                 }
             }
         }
     }
-    
-    system_prompt = f"""당신은 여행 대화 분석 전문가입니다. 주어진 대화 내용을 분석하여 정확히 아래 JSON 형식으로만 응답해야 합니다.
+}
+
+CONVERSATION_ANALYSIS_PROMPT = get_prompt_registry().register("conversation_analysis", f"""당신은 여행 대화 분석 전문가입니다. 주어진 대화 내용을 분석하여 정확히 아래 JSON 형식으로만 응답해야 합니다.
 
     당신의 임무:
     1. 대화에서 명시적으로 언급된 정보만 추출
@@ -167,39 +68,66 @@ def analyze_conversation_with_json_structure(
     4. 한글이 아닌 정확한 JSON 키 사용
     5. 여행 기간은 구체적인 날짜가 없더라도 "2박 3일"과 같은 형식도 인식
     6. 날짜 처리 시 다음 규칙을 따를 것:
-       - 연도가 없는 경우 현재 연도({current_year}) 사용
+       - 연도가 없는 경우 현재 연도(마지막에 제공) 사용
        - 날짜가 있는 경우 반드시 요일을 확인하고 포함
        - 날짜 형식은 "YYYY년 MM월 DD일 (요일)" 형식으로 통일
        - 다양한 날짜 표현을 이해하고 처리 (예: "이번 주 토요일", "다음 달 초", "크리스마스")
        - 잘못된 날짜나 요일 조합이 있는 경우 올바른 정보로 수정
 
     응답은 반드시 다음 JSON 스키마를 따라야 합니다:
-    {json.dumps(json_schema, ensure_ascii=False)}
+    {json.dumps(CONVERSATION_ANALYSIS_SCHEMA, ensure_ascii=False)}
     
     날짜 처리 예시:
-    1. "다음 주 토요일" -> "{current_year}년 MM월 DD일 (토)"
-    2. "크리스마스" -> "{current_year}년 12월 25일 (수)"
-    3. "6월 7일" -> "{current_year}년 6월 7일 (금)"
+    1. "다음 주 토요일" -> "YYYY년 MM월 DD일 (토)"
+    2. "크리스마스" -> "YYYY년 12월 25일 (수)"
+    3. "6월 7일" -> "YYYY년 6월 7일 (금)"
     
     잘못된 날짜/요일 조합 예시:
-    입력: "{current_year}년 6월 7일 (토)" -> 수정: "{current_year}년 6월 7일 (금)" (실제 요일로 수정)"""
-    
-    analysis_messages = [SystemMessage(content=system_prompt)]
-    analysis_messages.extend(messages)
+    입력: "YYYY년 6월 7일 (토)" -> 수정: "YYYY년 6월 7일 (금)" (실제 요일로 수정)""")
+
+def analyze_conversation_with_json_structure(
+    llm: Any,
+    messages: List,
+    current_year: int
+) -> Dict:
+    """
+    대화를 분석하고 JSON 구조로 결과를 반환합니다.
+    선택된 LLM 제공업체의 네이티브 구조화 출력 모드(OpenAI json_schema 또는 미지원 모델의 json_object, Anthropic 도구 호출)를 사용합니다.
     
-    if is_openai_model(llm):
-        try:
-            openai_messages = convert_langchain_messages_to_openai_format(analysis_messages)
-            
-            return request_json_response(openai_messages, json_schema)
-        except Exception as e:
-            print(f"Error using OpenAI structured output: {str(e)}")
+    Args:
+        llm: 언어 모델
+        messages: 분석할 메시지 리스트
+        current_year: 현재 연도
+        
+    Returns:
+        Dict: 분석 결과 (JSON 형식, 실패 시 빈 딕셔너리)
+    """
+    llm, template, analysis_messages = _build_analysis_request(llm, messages, current_year)
     
     try:
-        response = llm.invoke(analysis_messages)
-        content = response.content
-        
-        return extract_json_from_response(content)
+        with get_prompt_registry().measure(template):
+            result = invoke_json_schema(llm, analysis_messages, CONVERSATION_ANALYSIS_SCHEMA, "conversation_analysis")
+        return result or {}
     except Exception as e:
         print(f"Error in analyze_conversation: {str(e)}")
-        return {} 
\ No newline at end of file
+        return {}
+
+async def analyze_conversation_async(llm: Any, messages: List, current_year: int) -> Dict:
+    """analyze_conversation_with_json_structure의 비동기 버전 (이벤트 루프를 막지 않고 공유 연결 풀 사용)"""
+    llm, template, analysis_messages = _build_analysis_request(llm, messages, current_year)
+    
+    try:
+        with get_prompt_registry().measure(template):
+            result = await ainvoke_json_schema(llm, analysis_messages, CONVERSATION_ANALYSIS_SCHEMA, "conversation_analysis")
+        return result or {}
+    except Exception as e:
+        print(f"Error in analyze_conversation_async: {str(e)}")
+        return {}
+
+def _build_analysis_request(llm: Any, messages: List, current_year: int):
+    """대화 분석용 (LLM, 프롬프트 템플릿, 메시지 목록) 구성 (입력 메시지는 변경하지 않음)"""
+    llm = route_llm(llm, TASK_EXTRACT)
+    template = get_prompt_registry().get("conversation_analysis")
+    # 정적 지시문을 앞에, 연도 등 동적 정보를 마지막에 두어 프롬프트 캐시 적중
+    analysis_messages = build_prompt(llm, [template.render()], messages, [f"현재 연도: {current_year}년"])
+    return llm, template, analysis_messages
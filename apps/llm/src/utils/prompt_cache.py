@@ -0,0 +1,70 @@
+from typing import Any, List, Optional
+from langchain_core.messages import HumanMessage, SystemMessage
+from .llm_router import detect_provider
+
+CACHE_CONTROL = {"type": "ephemeral"}
+
+def _with_cache_control(message):
+    """메시지 마지막 블록에 Anthropic cache_control breakpoint 추가"""
+    content = message.content
+    blocks = [{"type": "text", "text": content}] if isinstance(content, str) else [dict(block) for block in content]
+    if not blocks:
+        return message
+
+    blocks[-1] = {**blocks[-1], "cache_control": CACHE_CONTROL}
+    return message.model_copy(update={"content": blocks})
+
+def build_prompt(llm: Any, static_prompts: List[str], messages: List, dynamic_prompts: Optional[List[str]] = None) -> List:
+    """프롬프트 캐싱을 위해 정적 지시문 → 대화 → 동적 정보 순서로 메시지 구성
+
+    대화 중간의 SystemMessage(선호도, 컨텍스트 등 요청마다 달라지는 내용)는 동적 정보로 옮겨
+    요청 간에 동일한 앞부분이 유지되도록 함. Anthropic은 정적 지시문과 대화 끝에 cache_control을 지정.
+    """
+    conversation = [msg for msg in messages if not isinstance(msg, SystemMessage)]
+    dynamic = [msg.content for msg in messages if isinstance(msg, SystemMessage) and isinstance(msg.content, str)]
+    dynamic.extend(prompt for prompt in (dynamic_prompts or []) if prompt)
+    static_text = "\n\n".join(static_prompts)
+
+    if detect_provider(llm) == "anthropic":
+        prompt = [SystemMessage(content=[{"type": "text", "text": static_text, "cache_control": CACHE_CONTROL}])]
+        if conversation:
+            conversation[-1] = _with_cache_control(conversation[-1])
+        prompt.extend(conversation)
+        # Anthropic은 선두 외의 system 메시지를 허용하지 않으므로 사용자 메시지로 전달
+        if dynamic:
+            prompt.append(HumanMessage(content="\n\n".join(dynamic)))
+        return prompt
+
+    prompt = [SystemMessage(content=static_text)]
+    prompt.extend(conversation)
+    if dynamic:
+        prompt.append(SystemMessage(content="\n\n".join(dynamic)))
+    return prompt
+
+def _text_content(content) -> str:
+    """content 블록 목록을 텍스트로 변환"""
+    if isinstance(content, str):
+        return content
+    return "\n".join(block.get("text", "") if isinstance(block, dict) else str(block) for block in content)
+
+def adapt_messages(messages: List, provider: str) -> List:
+    """다른 제공업체용으로 구성된 프롬프트를 대상 제공업체 형식으로 변환 (장애 조치용)
+
+    Anthropic은 선두 이외의 SystemMessage를 대화 끝 사용자 메시지로 옮기고,
+    OpenAI는 cache_control이 붙은 content 블록을 일반 텍스트로 되돌림.
+    """
+    if provider == "anthropic":
+        leading = messages[:1] if messages and isinstance(messages[0], SystemMessage) else []
+        rest = messages[len(leading):]
+        moved = [_text_content(msg.content) for msg in rest if isinstance(msg, SystemMessage)]
+        if not moved:
+            return messages
+        adapted = leading + [msg for msg in rest if not isinstance(msg, SystemMessage)]
+        adapted.append(HumanMessage(content="\n\n".join(moved)))
+        return adapted
+
+    return [
+        msg if isinstance(msg.content, str) or getattr(msg, "tool_calls", None)
+        else msg.model_copy(update={"content": _text_content(msg.content)})
+        for msg in messages
+    ]
@@ -0,0 +1,179 @@
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+from ..config import get_settings
+from .llm_failover import invoke_llm
+
+PLACEHOLDER_REGEX = re.compile(r"\$\{(\w+)\}")
+# 요청(대화)별 A/B 배정 키 - 라우트에서 설정하면 에이전트 안의 모든 get_prompt 호출이 같은 버전을 받음
+prompt_assignment_key: ContextVar[Optional[str]] = ContextVar("prompt_assignment_key", default=None)
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    """tiktoken 인코딩 로드 (설치되지 않았거나 로드 실패 시 None)"""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+def count_tokens(text: str) -> Optional[int]:
+    """cl100k_base 기준 토큰 수 (tiktoken을 사용할 수 없으면 글자 수로 대신하지 않고 None)"""
+    encoding = _get_encoding()
+    return len(encoding.encode(text)) if encoding else None
+
+class PromptTemplate:
+    """버전이 지정된 프롬프트 템플릿 (${변수} 치환, 정적 부분과 토큰 수는 등록 시 한 번만 계산)"""
+
+    def __init__(self, name: str, version: str, text: str):
+        self.name = name
+        self.version = version
+        self.text = text
+
+        parts = PLACEHOLDER_REGEX.split(text)
+        self._literals = parts[0::2]
+        self.variables = tuple(parts[1::2])
+        self.static_text = "".join(self._literals)
+        self.static_tokens = count_tokens(self.static_text)
+
+    def render(self, **values) -> str:
+        """변수를 치환한 프롬프트 문자열 반환"""
+        if not self.variables:
+            return self.text
+
+        missing = [name for name in self.variables if name not in values]
+        if missing:
+            raise KeyError(f"{self.name}@{self.version} 프롬프트 변수 누락: {missing}")
+
+        rendered = [self._literals[0]]
+        for name, literal in zip(self.variables, self._literals[1:]):
+            rendered.append(str(values[name]))
+            rendered.append(literal)
+        return "".join(rendered)
+
+class PromptRegistry:
+    """프롬프트 템플릿 저장소 (버전 관리, A/B 실험 배정, 버전별 지연시간/토큰 사용량 집계)"""
+
+    def __init__(self):
+        self._templates: Dict[str, Dict[str, PromptTemplate]] = {}
+        self._defaults: Dict[str, str] = {}
+        self._experiments: Dict[str, List[tuple]] = {}
+        self._stats: Dict[tuple, Dict] = {}
+        self._lock = threading.Lock()
+
+        self._load_experiments(get_settings().prompt_experiments)
+
+    def _load_experiments(self, config: Optional[str]):
+        """PROMPT_EXPERIMENTS 환경변수({"이름": {"버전": 가중치}}) 로드"""
+        if not config:
+            return
+        try:
+            for name, weights in json.loads(config).items():
+                self.set_experiment(name, weights)
+        except (json.JSONDecodeError, AttributeError) as e:
+            print(f"프롬프트 실험 설정 파싱 실패: {e}")
+
+    def register(self, name: str, text: str, version: str = "v1", default: bool = True) -> PromptTemplate:
+        """템플릿 등록 (default=True면 실험이 없을 때 사용할 버전으로 지정)"""
+        template = PromptTemplate(name, version, text)
+        self._templates.setdefault(name, {})[version] = template
+        if default or name not in self._defaults:
+            self._defaults[name] = version
+        return template
+
+    def set_experiment(self, name: str, weights: Dict[str, float]):
+        """버전별 가중치로 A/B 실험 설정"""
+        self._experiments[name] = [(version, float(weight)) for version, weight in weights.items() if weight > 0]
+
+    def clear_experiment(self, name: str):
+        """A/B 실험 해제 (기본 버전 사용)"""
+        self._experiments.pop(name, None)
+
+    def get(self, name: str, version: Optional[str] = None, assignment_key: Optional[str] = None) -> PromptTemplate:
+        """템플릿 조회 (실험 중이면 assignment_key(없으면 요청의 prompt_assignment_key) 해시로 고정 배정, 키가 없으면 무작위)"""
+        versions = self._templates[name]
+        if assignment_key is None:
+            assignment_key = prompt_assignment_key.get()
+        if version:
+            return versions[version]
+
+        candidates = [(v, w) for v, w in self._experiments.get(name, []) if v in versions]
+        if candidates:
+            total = sum(weight for _, weight in candidates)
+            if assignment_key is not None:
+                point = (zlib.crc32(f"{name}:{assignment_key}".encode()) % 10000) / 10000 * total
+            else:
+                point = random.random() * total
+
+            for candidate_version, weight in candidates:
+                point -= weight
+                if point < 0:
+                    return versions[candidate_version]
+            return versions[candidates[-1][0]]
+
+        return versions[self._defaults[name]]
+
+    def record(self, template: PromptTemplate, latency: float, input_tokens: Optional[int] = None):
+        """템플릿 버전별 호출 지연시간/입력 토큰 누적"""
+        with self._lock:
+            stats = self._stats.setdefault((template.name, template.version), {
+                "calls": 0, "latency": 0.0, "token_calls": 0, "input_tokens": 0
+            })
+            stats["calls"] += 1
+            stats["latency"] += latency
+            if input_tokens is not None:
+                stats["token_calls"] += 1
+                stats["input_tokens"] += input_tokens
+
+    @contextmanager
+    def measure(self, template: PromptTemplate):
+        """블록 실행 시간을 템플릿 지연시간으로 기록"""
+        start = time.perf_counter()
+        yield
+        self.record(template, time.perf_counter() - start)
+
+    def invoke(self, template: PromptTemplate, llm: Any, messages: List):
+        """LLM 호출(장애 조치 포함) 후 지연시간과 응답 usage의 입력 토큰 수를 기록"""
+        start = time.perf_counter()
+        response = invoke_llm(llm, messages, template.name)
+        usage = getattr(response, "usage_metadata", None) or {}
+        self.record(template, time.perf_counter() - start, usage.get("input_tokens"))
+        return response
+
+    def get_stats(self) -> Dict:
+        """프롬프트/버전별 정적 토큰 수와 평균 지연시간, 평균 입력 토큰 반환"""
+        result = {}
+        with self._lock:
+            for name, versions in self._templates.items():
+                result[name] = {"default": self._defaults[name], "experiment": dict(self._experiments.get(name, [])), "versions": {}}
+                for version, template in versions.items():
+                    stats = self._stats.get((name, version), {})
+                    calls = stats.get("calls", 0)
+                    token_calls = stats.get("token_calls", 0)
+                    result[name]["versions"][version] = {
+                        "static_tokens": template.static_tokens,
+                        "calls": calls,
+                        "avg_latency_ms": round(stats["latency"] / calls * 1000, 1) if calls else None,
+                        "avg_input_tokens": round(stats["input_tokens"] / token_calls, 1) if token_calls else None
+                    }
+        return result
+
+prompt_registry = None
+
+def get_prompt_registry() -> PromptRegistry:
+    """프롬프트 저장소 인스턴스 반환"""
+    global prompt_registry
+    if prompt_registry is None:
+        prompt_registry = PromptRegistry()
+    return prompt_registry
+
+def get_prompt(name: str, version: Optional[str] = None, assignment_key: Optional[str] = None) -> PromptTemplate:
+    """등록된 프롬프트 템플릿 조회"""
+    return get_prompt_registry().get(name, version, assignment_key)
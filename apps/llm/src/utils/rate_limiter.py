@@ -0,0 +1,195 @@
+import asyncio
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.rate_limiters import BaseRateLimiter
+from ..config import get_settings
+
+# 출력 토큰당 지연시간이 평균의 이 배수를 넘으면 느려진 것으로 판단
+SLOW_LATENCY_FACTOR = 2.0
+SLOW_DECREASE = 0.9
+RATE_LIMITED_DECREASE = 0.5
+LATENCY_EWMA_ALPHA = 0.2
+SLOT_POLL_INTERVAL = 0.05
+
+_acquired_at: ContextVar[Optional[float]] = ContextVar("llm_slot_acquired_at", default=None)
+
+class LLMQueueTimeout(TimeoutError):
+    """대기열 deadline 안에 LLM 호출 슬롯을 얻지 못함"""
+
+class AdaptiveRateLimiter(BaseRateLimiter, BaseCallbackHandler):
+    """provider/model 단위 LLM 호출 제한기
+
+    호출 전에는 rate_limiter로서 RPM/TPM 토큰 버킷과 동시 실행 슬롯을 확보하고(deadline까지 대기),
+    호출 후에는 콜백으로 실제 사용 토큰, 429 응답, 지연시간을 받아 동시 실행 한도를 AIMD 방식으로 조정.
+    """
+
+    run_inline = True
+
+    def __init__(self, name: str, requests_per_minute: int, tokens_per_minute: int, max_concurrency: int, queue_timeout: float):
+        self.name = name
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_concurrency = max(1, max_concurrency)
+        self.queue_timeout = queue_timeout
+
+        self.concurrency_limit = float(self.max_concurrency)
+        self._request_budget = float(requests_per_minute)
+        self._token_budget = float(tokens_per_minute)
+        self._refilled_at = time.monotonic()
+        self._in_flight = 0
+        self._latency_per_token: Optional[float] = None
+        self._condition = threading.Condition()
+
+        self.calls = 0
+        self.rate_limited = 0
+        self.queue_timeouts = 0
+        self.total_wait = 0.0
+
+    def _refill(self, now: float):
+        """경과 시간만큼 요청/토큰 버킷 충전"""
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        self._request_budget = min(self.requests_per_minute, self._request_budget + elapsed * self.requests_per_minute / 60)
+        self._token_budget = min(self.tokens_per_minute, self._token_budget + elapsed * self.tokens_per_minute / 60)
+
+    def _try_acquire(self, now: float) -> float:
+        """슬롯 확보 시도 (확보하면 0, 아니면 다시 시도할 때까지 대기할 초)"""
+        self._refill(now)
+        if self._in_flight >= int(self.concurrency_limit):
+            return SLOT_POLL_INTERVAL
+        if self._request_budget < 1:
+            return (1 - self._request_budget) * 60 / self.requests_per_minute
+        # 토큰은 응답 후 실제 사용량으로 차감하므로 초과 사용분(음수)이 충전될 때까지 대기
+        if self._token_budget < 0:
+            return -self._token_budget * 60 / self.tokens_per_minute
+
+        self._request_budget -= 1
+        self._in_flight += 1
+        return 0
+
+    def _on_acquired(self, started: float):
+        """대기 시간 누적 후 지연시간 측정 시작 시각 기록"""
+        self.total_wait += time.monotonic() - started
+        _acquired_at.set(time.monotonic())
+
+    def _on_timeout(self):
+        """대기 시간 초과 집계 후 예외 발생"""
+        self.queue_timeouts += 1
+        raise LLMQueueTimeout(f"{self.name} LLM 호출 대기 시간 초과 ({self.queue_timeout}초)")
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        """호출 슬롯 확보 (blocking이면 deadline까지 대기 후 LLMQueueTimeout)"""
+        started = time.monotonic()
+        deadline = started + self.queue_timeout
+
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                wait = self._try_acquire(now)
+                if wait == 0:
+                    self._on_acquired(started)
+                    return True
+                if not blocking:
+                    return False
+                if now >= deadline:
+                    self._on_timeout()
+                self._condition.wait(min(wait, deadline - now))
+
+    async def aacquire(self, *, blocking: bool = True) -> bool:
+        """acquire의 비동기 버전 (이벤트 루프를 막지 않고 대기)"""
+        started = time.monotonic()
+        deadline = started + self.queue_timeout
+
+        while True:
+            now = time.monotonic()
+            with self._condition:
+                wait = self._try_acquire(now)
+                if wait == 0:
+                    self._on_acquired(started)
+                    return True
+                if not blocking:
+                    return False
+                if now >= deadline:
+                    self._on_timeout()
+            await asyncio.sleep(min(wait, deadline - now))
+
+    def on_llm_end(self, response, **kwargs):
+        """실제 사용 토큰 차감, 슬롯 반환, 출력 토큰당 지연시간으로 동시 실행 한도 조정"""
+        total_tokens, output_tokens = 0, 0
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+                total_tokens += usage.get("total_tokens", 0)
+                output_tokens += usage.get("output_tokens", 0)
+
+        acquired_at = _acquired_at.get()
+        with self._condition:
+            self.calls += 1
+            self._token_budget -= total_tokens
+            self._in_flight = max(0, self._in_flight - 1)
+
+            if acquired_at is not None:
+                latency_per_token = (time.monotonic() - acquired_at) / max(output_tokens, 1)
+                if self._latency_per_token and latency_per_token > self._latency_per_token * SLOW_LATENCY_FACTOR:
+                    self.concurrency_limit = max(1.0, self.concurrency_limit * SLOW_DECREASE)
+                else:
+                    self.concurrency_limit = min(self.max_concurrency, self.concurrency_limit + 1 / self.concurrency_limit)
+                self._latency_per_token = latency_per_token if self._latency_per_token is None else (
+                    self._latency_per_token * (1 - LATENCY_EWMA_ALPHA) + latency_per_token * LATENCY_EWMA_ALPHA
+                )
+            self._condition.notify_all()
+
+    def on_llm_error(self, error: BaseException, **kwargs):
+        """슬롯 반환 (429 응답이면 동시 실행 한도를 절반으로 줄이고 요청 버킷 비움)"""
+        if isinstance(error, LLMQueueTimeout):
+            return
+
+        with self._condition:
+            self._in_flight = max(0, self._in_flight - 1)
+            if getattr(error, "status_code", None) == 429 or "RateLimit" in type(error).__name__:
+                self.rate_limited += 1
+                self.concurrency_limit = max(1.0, self.concurrency_limit * RATE_LIMITED_DECREASE)
+                self._request_budget = min(self._request_budget, 0.0)
+            self._condition.notify_all()
+
+    def get_stats(self) -> Dict:
+        """현재 동시 실행 한도, 버킷 잔량, 누적 호출/429/대기 통계 반환"""
+        with self._condition:
+            self._refill(time.monotonic())
+            return {
+                "concurrency_limit": round(self.concurrency_limit, 2),
+                "in_flight": self._in_flight,
+                "request_budget": round(self._request_budget, 1),
+                "token_budget": round(self._token_budget),
+                "calls": self.calls,
+                "rate_limited": self.rate_limited,
+                "queue_timeouts": self.queue_timeouts,
+                "avg_wait_ms": round(self.total_wait / self.calls * 1000, 1) if self.calls else 0.0
+            }
+
+_rate_limiters: Dict[str, AdaptiveRateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+def get_rate_limiter(provider: str, model: str) -> AdaptiveRateLimiter:
+    """provider/model 별로 공유되는 호출 제한기 반환"""
+    name = f"{provider}:{model}"
+    with _rate_limiters_lock:
+        if name not in _rate_limiters:
+            settings = get_settings()
+            _rate_limiters[name] = AdaptiveRateLimiter(
+                name,
+                requests_per_minute=settings.llm_requests_per_minute,
+                tokens_per_minute=settings.llm_tokens_per_minute,
+                max_concurrency=settings.llm_max_concurrency,
+                queue_timeout=settings.llm_queue_timeout
+            )
+        return _rate_limiters[name]
+
+def get_rate_limit_stats() -> Dict:
+    """모든 호출 제한기의 통계 반환"""
+    with _rate_limiters_lock:
+        limiters = list(_rate_limiters.values())
+    return {limiter.name: limiter.get_stats() for limiter in limiters}
@@ -0,0 +1,90 @@
+import base64
+import hashlib
+import json
+import sqlite3
+import threading
+from typing import Dict, Optional
+from ..config import get_settings
+
+SHARE_ID_LENGTH = 10
+# 다른 계획과 ID가 겹칠 때 늘릴 수 있는 최대 길이 (SHA-256 전체의 패딩 없는 base64 길이)
+SHARE_ID_MAX_LENGTH = 43
+
+# 공유 페이지가 사용하지 않는 계획 메타데이터 (클라이언트 share_codec.PRUNED_PLAN_KEYS와 같아야 같은 계획이 같은 ID를 받음)
+PRUNED_PLAN_KEYS = (
+    "previous_plan", "patch", "generated_at", "format",
+    "kakao_places_used", "places_count", "refinement_enhanced"
+)
+
+def prune_plan(plan):
+    """공유 페이지가 사용하지 않는 메타데이터와 빈 값(None) 제거 (클라이언트 share_codec.prune_plan과 동일)"""
+    if isinstance(plan, dict):
+        return {
+            key: prune_plan(value)
+            for key, value in plan.items()
+            if value is not None and key not in PRUNED_PLAN_KEYS
+        }
+    if isinstance(plan, list):
+        return [prune_plan(item) for item in plan]
+    return plan
+
+class ShareStore:
+    """공유된 여행 계획 저장소 (SQLite, 내용 해시 기반 짧은 ID)"""
+
+    def __init__(self, db_path: str):
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS shared_plans ("
+                "id TEXT PRIMARY KEY, payload TEXT NOT NULL, "
+                "created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+            )
+            # 클라이언트가 올린 HTML 스냅샷을 저장하던 이전 DB 정리 (스냅샷은 이제 서버가 계획에서 직접 생성)
+            columns = {row[1] for row in self._connection.execute("PRAGMA table_info(shared_plans)")}
+            if "snapshot" in columns:
+                try:
+                    self._connection.execute("ALTER TABLE shared_plans DROP COLUMN snapshot")
+                except sqlite3.OperationalError:
+                    # DROP COLUMN을 지원하지 않는 SQLite(3.35 미만)
+                    self._connection.execute("UPDATE shared_plans SET snapshot = NULL")
+
+    @staticmethod
+    def make_id(payload: str, length: int = SHARE_ID_LENGTH) -> str:
+        """정규화된 계획 JSON의 SHA-256 해시로 짧은 ID 생성"""
+        digest = hashlib.sha256(payload.encode("utf-8")).digest()
+        return base64.urlsafe_b64encode(digest).decode("ascii")[:length]
+
+    def save(self, plan: Dict) -> str:
+        """계획 저장 후 ID 반환 (같은 계획은 같은 ID로 한 번만 저장, 다른 계획이 이미 쓰는 ID면 해시를 더 길게 사용)"""
+        payload = json.dumps(plan, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+        with self._lock, self._connection:
+            for length in range(SHARE_ID_LENGTH, SHARE_ID_MAX_LENGTH + 1):
+                share_id = self.make_id(payload, length)
+                self._connection.execute(
+                    "INSERT OR IGNORE INTO shared_plans (id, payload) VALUES (?, ?)",
+                    (share_id, payload)
+                )
+                stored = self._connection.execute(
+                    "SELECT payload FROM shared_plans WHERE id = ?", (share_id,)
+                ).fetchone()
+                if stored[0] == payload:
+                    return share_id
+        raise ValueError("공유 ID가 다른 계획과 충돌합니다.")
+
+    def get_payload(self, share_id: str) -> Optional[str]:
+        """저장된 계획 JSON 문자열 반환 (없으면 None)"""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT payload FROM shared_plans WHERE id = ?", (share_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+share_store = None
+
+def get_share_store() -> ShareStore:
+    """공유 저장소 인스턴스 반환"""
+    global share_store
+    if share_store is None:
+        share_store = ShareStore(get_settings().share_db_path)
+    return share_store
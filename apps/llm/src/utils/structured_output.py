@@ -0,0 +1,265 @@
+import json
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableLambda
+from .llm_router import detect_provider
+from .llm_failover import ainvoke_with_failover, invoke_with_failover, stream_with_failover
+
+# 스키마 검증 실패 시 수정 요청 횟수 (실패한 호출이 반복되지 않도록 1회로 제한)
+STRUCTURED_REPAIR_ATTEMPTS = 1
+REPAIR_RESPONSE_LIMIT = 2000
+
+REPAIR_PROMPT = """이전 응답이 요구된 JSON 스키마와 맞지 않습니다.
+
+이전 응답:
+{response}
+
+오류:
+{errors}
+
+오류를 수정하여 스키마에 맞는 JSON만 다시 반환해주세요."""
+
+# OpenAI response_format json_schema를 지원하는 모델 (그 외 gpt-3.5-turbo, gpt-4, gpt-4-turbo 등은 json_object만 지원)
+JSON_SCHEMA_MODEL_PREFIXES = ("gpt-4o", "chatgpt-4o", "gpt-4.1", "gpt-4.5", "gpt-5", "o1", "o3", "o4")
+JSON_SCHEMA_UNSUPPORTED_MODELS = ("gpt-4o-2024-05-13",)
+
+JSON_OBJECT_PROMPT = """응답은 다른 텍스트 없이 다음 JSON 스키마를 따르는 JSON 객체만 반환해주세요.
+
+{schema}"""
+
+JSON_SCHEMA_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+    "null": type(None)
+}
+
+def supports_json_schema(llm: Any) -> bool:
+    """OpenAI 모델의 response_format json_schema 지원 여부"""
+    model = getattr(llm, "model_name", None) or getattr(llm, "model", None) or ""
+    return model.startswith(JSON_SCHEMA_MODEL_PREFIXES) and model not in JSON_SCHEMA_UNSUPPORTED_MODELS
+
+def bind_json_schema(llm: Any, schema: Dict, name: str):
+    """제공업체별 네이티브 구조화 출력 모드로 LLM 바인딩
+
+    json_schema를 지원하지 않는 OpenAI 모델(기본 모델 gpt-3.5-turbo 등)은 400 오류 대신
+    json_object 모드와 프롬프트 끝의 스키마 지시문으로 호출.
+
+    Returns:
+        (runnable, mode): mode는 "content"(응답 본문이 JSON) 또는 "tool"(도구 인자가 JSON)
+    """
+    if detect_provider(llm) == "anthropic":
+        tool = {
+            "name": name,
+            "description": "응답을 지정된 JSON 스키마에 맞춰 반환합니다.",
+            "input_schema": schema
+        }
+        return llm.bind_tools([tool], tool_choice={"type": "tool", "name": name}), "tool"
+
+    if not supports_json_schema(llm):
+        schema_prompt = SystemMessage(content=JSON_OBJECT_PROMPT.format(schema=json.dumps(schema, ensure_ascii=False)))
+        add_schema_prompt = RunnableLambda(lambda messages: [*messages, schema_prompt])
+        return add_schema_prompt | llm.bind(response_format={"type": "json_object"}), "content"
+
+    return llm.bind(response_format={
+        "type": "json_schema",
+        "json_schema": {"name": name, "schema": schema}
+    }), "content"
+
+def stream_json_text(llm: Any, messages: List, schema: Dict, name: str) -> Iterator[str]:
+    """구조화 출력 모드로 호출하여 JSON 텍스트 조각을 순서대로 반환 (첫 조각 전 장애 시 다른 제공업체의 네이티브 모드로 장애 조치)"""
+    stream = lambda target_llm, target_messages: _stream_json_chunks(target_llm, target_messages, schema, name)
+    yield from stream_with_failover(llm, messages, stream, name)
+
+def _stream_json_chunks(llm: Any, messages: List, schema: Dict, name: str) -> Iterator[str]:
+    """대상 LLM의 구조화 출력 모드로 스트리밍하여 JSON 텍스트 조각 반환"""
+    runnable, mode = bind_json_schema(llm, schema, name)
+
+    for chunk in runnable.stream(messages):
+        if mode == "tool":
+            for tool_chunk in getattr(chunk, "tool_call_chunks", None) or []:
+                if tool_chunk.get("args"):
+                    yield tool_chunk["args"]
+        elif isinstance(chunk.content, str):
+            if chunk.content:
+                yield chunk.content
+        else:
+            for block in chunk.content:
+                if isinstance(block, dict) and block.get("text"):
+                    yield block["text"]
+
+def validate_json(data: Any, schema: Dict, path: str = "$") -> List[str]:
+    """JSON 스키마(type/enum/required/properties/items) 검증 후 오류 목록 반환"""
+    expected = schema.get("type")
+    if expected:
+        types = expected if isinstance(expected, list) else [expected]
+        if not any(_matches_type(data, type_name) for type_name in types):
+            return [f"{path}: {'|'.join(types)} 타입이어야 합니다"]
+
+    errors = []
+    if "enum" in schema and data not in schema["enum"]:
+        errors.append(f"{path}: {schema['enum']} 중 하나여야 합니다")
+
+    if isinstance(data, dict):
+        for key in schema.get("required", []):
+            if key not in data:
+                errors.append(f"{path}.{key}: 필수 항목이 없습니다")
+        for key, property_schema in schema.get("properties", {}).items():
+            if key in data:
+                errors.extend(validate_json(data[key], property_schema, f"{path}.{key}"))
+    elif isinstance(data, list) and "items" in schema:
+        for index, item in enumerate(data):
+            errors.extend(validate_json(item, schema["items"], f"{path}[{index}]"))
+
+    return errors
+
+def _matches_type(value: Any, type_name: str) -> bool:
+    """JSON 스키마 타입 일치 여부 (bool은 숫자로 취급하지 않음)"""
+    if type_name in ("integer", "number") and isinstance(value, bool):
+        return False
+    return isinstance(value, JSON_SCHEMA_TYPES.get(type_name, object))
+
+def _parse_structured_response(response: Any, mode: str) -> Tuple[Optional[Any], str]:
+    """구조화 출력 응답에서 (JSON 값, 원문 텍스트) 추출 (파싱 실패 시 값은 None)"""
+    if mode == "tool":
+        tool_calls = getattr(response, "tool_calls", None) or []
+        if not tool_calls:
+            return None, str(response.content)
+        return tool_calls[0]["args"], json.dumps(tool_calls[0]["args"], ensure_ascii=False)
+
+    text = response.content if isinstance(response.content, str) else "".join(
+        block.get("text", "") for block in response.content if isinstance(block, dict)
+    )
+    try:
+        return json.loads(text.strip()), text
+    except json.JSONDecodeError:
+        return None, text
+
+def invoke_json_schema(
+    llm: Any,
+    messages: List,
+    schema: Dict,
+    name: str,
+    max_repairs: int = STRUCTURED_REPAIR_ATTEMPTS
+) -> Optional[Dict]:
+    """구조화 출력 모드로 호출하여 스키마 검증된 JSON 반환
+
+    파싱/검증에 실패하면 오류 내용을 알려 최대 max_repairs번 수정 응답을 요청하고,
+    그래도 실패하면 None 반환.
+    """
+    def call(target_llm: Any, target_messages: List):
+        runnable, mode = bind_json_schema(target_llm, schema, name)
+        return runnable.invoke(target_messages), mode
+
+    attempt_messages = list(messages)
+
+    for attempt in range(max_repairs + 1):
+        # 제공업체 장애/지연 시 다른 제공업체의 네이티브 모드로 재시도하므로 응답별 mode로 파싱
+        response, mode = invoke_with_failover(llm, attempt_messages, call, name)
+        data, errors, attempt_messages = _check_attempt(response, mode, messages, schema, name, attempt)
+        if not errors:
+            return data
+
+    return None
+
+async def ainvoke_json_schema(
+    llm: Any,
+    messages: List,
+    schema: Dict,
+    name: str,
+    max_repairs: int = STRUCTURED_REPAIR_ATTEMPTS
+) -> Optional[Dict]:
+    """invoke_json_schema의 비동기 버전 (공유 비동기 HTTP 클라이언트로 호출, 장애 조치 적용)"""
+    async def call(target_llm: Any, target_messages: List):
+        runnable, mode = bind_json_schema(target_llm, schema, name)
+        return await runnable.ainvoke(target_messages), mode
+
+    attempt_messages = list(messages)
+
+    for attempt in range(max_repairs + 1):
+        response, mode = await ainvoke_with_failover(llm, attempt_messages, call, name)
+        data, errors, attempt_messages = _check_attempt(response, mode, messages, schema, name, attempt)
+        if not errors:
+            return data
+
+    return None
+
+def _check_attempt(response: Any, mode: str, messages: List, schema: Dict, name: str, attempt: int):
+    """응답 검증 후 (JSON 값, 오류 목록, 다음 시도 메시지) 반환 (원본 메시지 목록은 변경하지 않음)"""
+    data, text = _parse_structured_response(response, mode)
+    errors = ["JSON 형식이 아닙니다"] if data is None else validate_json(data, schema)
+    if not errors:
+        return data, errors, messages
+
+    print(f"{name} 구조화 출력 검증 실패 ({attempt + 1}회): {errors[:3]}")
+    repair_message = HumanMessage(content=REPAIR_PROMPT.format(
+        response=text[:REPAIR_RESPONSE_LIMIT], errors="\n".join(f"- {error}" for error in errors[:10])
+    ))
+    return data, errors, [*messages, repair_message]
+
+class JSONArrayStreamParser:
+    """스트리밍 JSON에서 최상위 키 배열의 원소가 완성될 때마다 반환하는 증분 파서"""
+
+    def __init__(self, array_key: str):
+        self.array_key = array_key
+        self.text = ""
+
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = -1
+        self._last_string: Optional[str] = None
+        self._current_key: Optional[str] = None
+        self._in_array = False
+        self._item_start = -1
+
+    def feed(self, chunk: str) -> List[Any]:
+        """텍스트 조각을 추가하고 새로 완성된 배열 원소 목록 반환"""
+        self.text += chunk
+        text = self.text
+        completed = []
+
+        for i in range(self._pos, len(text)):
+            char = text[i]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_string = text[self._string_start + 1:i]
+                continue
+
+            if char == '"':
+                self._in_string = True
+                self._string_start = i
+            elif char == ":" and self._depth == 1:
+                self._current_key = self._last_string
+            elif char in "{[":
+                if self._in_array and self._depth == 2 and self._item_start < 0:
+                    self._item_start = i
+                if char == "[" and self._depth == 1 and self._current_key == self.array_key:
+                    self._in_array = True
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._in_array and self._depth == 2 and self._item_start >= 0:
+                    try:
+                        completed.append(json.loads(text[self._item_start:i + 1]))
+                    except json.JSONDecodeError as e:
+                        print(f"배열 원소 파싱 실패: {e}")
+                    self._item_start = -1
+                elif self._in_array and self._depth == 1:
+                    self._in_array = False
+            elif char == "," and self._depth == 1:
+                self._current_key = None
+
+        self._pos = len(text)
+        return completed
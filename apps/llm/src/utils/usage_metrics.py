@@ -0,0 +1,52 @@
+import threading
+from typing import Dict
+from langchain_core.callbacks import BaseCallbackHandler
+
+class PromptCacheTracker(BaseCallbackHandler):
+    """LLM 응답의 usage 정보로 프롬프트 캐시 적중률 집계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.input_tokens = 0
+        self.cached_tokens = 0
+        self.cache_write_tokens = 0
+
+    def on_llm_end(self, response, **kwargs):
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if not usage:
+                    continue
+
+                details = usage.get("input_token_details") or {}
+                self.record(
+                    usage.get("input_tokens", 0),
+                    details.get("cache_read", 0) or 0,
+                    details.get("cache_creation", 0) or 0
+                )
+
+    def record(self, input_tokens: int, cached_tokens: int, cache_write_tokens: int = 0):
+        """LLM 호출 1회의 입력/캐시 토큰 수 누적"""
+        with self._lock:
+            self.calls += 1
+            self.input_tokens += input_tokens
+            self.cached_tokens += cached_tokens
+            self.cache_write_tokens += cache_write_tokens
+
+    def get_stats(self) -> Dict:
+        """누적 입력 토큰 대비 캐시 적중 토큰 비율 반환"""
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "input_tokens": self.input_tokens,
+                "cached_tokens": self.cached_tokens,
+                "cache_write_tokens": self.cache_write_tokens,
+                "cached_ratio": round(self.cached_tokens / self.input_tokens, 4) if self.input_tokens else 0.0
+            }
+
+prompt_cache_tracker = PromptCacheTracker()
+
+def get_prompt_cache_tracker() -> PromptCacheTracker:
+    """프롬프트 캐시 집계기 반환"""
+    return prompt_cache_tracker